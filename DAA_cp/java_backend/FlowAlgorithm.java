@@ -1,9 +1,31 @@
 import java.util.*;
+import java.util.concurrent.Callable;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.atomic.AtomicIntegerArray;
 
 public class FlowAlgorithm {
 
     private int vertexCount;
-    private List<List<Edge>> graph;
+    private List<ArrayList<Edge>> graph;
+
+    // Forward edges in insertion order, so flows can be reported per input edge
+    private List<Edge> edges = new ArrayList<>();
+
+    // Augmenting paths recorded by the solvers while tracing is on, else null
+    private List<int[]> augmentingPaths;
+    private List<Integer> tracedPath = new ArrayList<>();
+
+    // Counters for the running solve while stats are requested, else null
+    private SolveStats stats;
+
+    // All-pairs min-cut tree, built on first use and dropped whenever an edge changes
+    private GomoryHuTree gomoryHuTree;
+
+    // Worker threads used when "Parallel Dinic" is picked by name
+    private int parallelism = Runtime.getRuntime().availableProcessors();
 
     // Constructor accepting the number of vertices
     public FlowAlgorithm(int vertexCount) {
@@ -14,10 +36,29 @@ public class FlowAlgorithm {
         }
     }
 
-    // Edge class to store capacity, flow, and reverse edge
+    // Copy constructor: same vertices, edges, edge ids and costs, with all flows at zero
+    public FlowAlgorithm(FlowAlgorithm other) {
+        this(other.vertexCount);
+        addEdges(other.edgeTriples());
+        copyCosts(other);
+    }
+
+    // Give the first edges the costs of other's edges with the same ids
+    private void copyCosts(FlowAlgorithm other) {
+        for (int i = 0; i < other.edges.size(); i++) {
+            edges.get(i).cost = other.edges.get(i).cost;
+            edges.get(i).reverse.cost = other.edges.get(i).reverse.cost;
+        }
+    }
+
+    // Edge class to store capacity, flow, cost, and reverse edge
     static class Edge {
         int to, flow, capacity;
+        double cost;
         Edge reverse;
+        // Index of this edge's flow while a parallel solve keeps flows in an
+        // atomic array: 2 * id for a forward edge, 2 * id + 1 for its reverse
+        int slot;
 
         public Edge(int to, int capacity) {
             this.to = to;
@@ -26,93 +67,557 @@ public class FlowAlgorithm {
         }
     }
 
-    // Add an edge to the graph (along with reverse edge)
-    public void addEdge(int u, int v, int capacity) {
+    // Add an edge to the graph (along with reverse edge) and return its edge id
+    public int addEdge(int u, int v, int capacity) {
         Edge forwardEdge = new Edge(v, capacity);
         Edge backwardEdge = new Edge(u, 0);  
         forwardEdge.reverse = backwardEdge;
         backwardEdge.reverse = forwardEdge;
+        forwardEdge.slot = 2 * edges.size();
+        backwardEdge.slot = 2 * edges.size() + 1;
         graph.get(u).add(forwardEdge);
         graph.get(v).add(backwardEdge);
+        edges.add(forwardEdge);
+        gomoryHuTree = null;
+        return edges.size() - 1;
+    }
+
+    // Add a whole edge list of packed (u, v, capacity) triples in one pass
+    public void addEdges(int[] triples) {
+        if (triples.length % 3 != 0) {
+            throw new IllegalArgumentException("Edge payload must hold (u, v, capacity) triples");
+        }
+
+        // Size every adjacency list up front so the bulk insert never regrows them
+        int[] degree = new int[vertexCount];
+        for (int i = 0; i < triples.length; i += 3) {
+            degree[triples[i]]++;
+            degree[triples[i + 1]]++;
+        }
+        for (int u = 0; u < vertexCount; u++) {
+            graph.get(u).ensureCapacity(graph.get(u).size() + degree[u]);
+        }
+
+        for (int i = 0; i < triples.length; i += 3) {
+            addEdge(triples[i], triples[i + 1], triples[i + 2]);
+        }
+    }
+
+    // Per-edge costs (e.g. link latency) for "Min-Cost Max-Flow", in edge id
+    // order. A reverse edge costs the negative of its forward edge, so pushing
+    // flow back refunds it. Edges without a cost are free.
+    public void setEdgeCosts(double[] costs) {
+        if (costs.length != edges.size()) {
+            throw new IllegalArgumentException("Need one cost per edge");
+        }
+        for (int i = 0; i < costs.length; i++) {
+            if (!(costs[i] >= 0) || Double.isInfinite(costs[i])) {
+                throw new IllegalArgumentException("Edge costs must be finite and non-negative");
+            }
+            Edge edge = edges.get(i);
+            edge.cost = costs[i];
+            edge.reverse.cost = -costs[i];
+        }
+    }
+
+    // Current edges as packed (u, v, capacity) triples, in edge id order
+    int[] edgeTriples() {
+        int[] triples = new int[edges.size() * 3];
+        for (int i = 0; i < edges.size(); i++) {
+            Edge edge = edges.get(i);
+            triples[3 * i] = edge.reverse.to;
+            triples[3 * i + 1] = edge.to;
+            triples[3 * i + 2] = edge.capacity;
+        }
+        return triples;
     }
 
-  
+    // Clear the flow on every edge so the graph can be solved again without
+    // rebuilding its adjacency lists
+    public void resetFlows() {
+        for (Edge edge : edges) {
+            edge.flow = 0;
+            edge.reverse.flow = 0;
+        }
+    }
 
+    // Dinic scratch buffers, allocated once per solve and reused by every phase
     private int[] level;
+    private int[] queue;
+    private int[] start;
+    private Edge[] pathEdges;
 
-    // BFS to build level graph
+    // BFS to build level graph, using a primitive int queue instead of boxed Integers.
+    // Each vertex is enqueued at most once per phase, so the buffer never wraps.
     private boolean bfsDinic(int source, int sink) {
-        level = new int[vertexCount];
         Arrays.fill(level, -1);
         level[source] = 0;
 
-        Queue<Integer> queue = new LinkedList<>();
-        queue.add(source);
+        int head = 0, tail = 0;
+        queue[tail++] = source;
 
-        while (!queue.isEmpty()) {
-            int u = queue.poll();
+        while (head < tail) {
+            int u = queue[head++];
+            if (stats != null) {
+                stats.edgesScanned += graph.get(u).size();
+            }
             for (Edge edge : graph.get(u)) {
                 if (level[edge.to] < 0 && edge.flow < edge.capacity) {
                     level[edge.to] = level[u] + 1;
-                    queue.add(edge.to);
+                    queue[tail++] = edge.to;
                 }
             }
         }
         return level[sink] != -1;
     }
 
-    // DFS for finding augmenting path
-    private int dfsDinic(int u, int flow, int sink, int[] start) {
-        if (u == sink) {
-            return flow;
-        }
+    // Iterative DFS pushing flow along level-graph paths until the phase is blocked.
+    // The current path lives on the explicit pathEdges stack, so path length is
+    // bounded by vertexCount rather than by the thread's call stack.
+    private int blockingFlow(int source, int sink, int phase) {
+        int pushed = 0;
+        int depth = 0;
+        int u = source;
+
+        while (true) {
+            if (u == sink) {
+                int bottleneck = Integer.MAX_VALUE;
+                for (int i = 0; i < depth; i++) {
+                    bottleneck = Math.min(bottleneck, pathEdges[i].capacity - pathEdges[i].flow);
+                }
 
-        for (; start[u] < graph.get(u).size(); start[u]++) {
-            Edge edge = graph.get(u).get(start[u]);
-            if (level[edge.to] == level[u] + 1 && edge.flow < edge.capacity) {
-                int currentFlow = Math.min(flow, edge.capacity - edge.flow);
-                int tempFlow = dfsDinic(edge.to, currentFlow, sink, start);
-                if (tempFlow > 0) {
-                    edge.flow += tempFlow;
-                    edge.reverse.flow -= tempFlow;
-                    return tempFlow;
+                int saturated = -1;
+                for (int i = 0; i < depth; i++) {
+                    Edge edge = pathEdges[i];
+                    edge.flow += bottleneck;
+                    edge.reverse.flow -= bottleneck;
+                    if (saturated < 0 && edge.flow == edge.capacity) {
+                        saturated = i;
+                    }
+                }
+                pushed += bottleneck;
+                if (stats != null) {
+                    stats.augmentingPaths++;
                 }
+
+                if (augmentingPaths != null) {
+                    tracedPath.add(source);
+                    for (int i = 0; i < depth; i++) {
+                        tracedPath.add(pathEdges[i].to);
+                    }
+                    recordPath(phase, bottleneck, tracedPath);
+                    tracedPath.clear();
+                }
+
+                // Resume from the tail of the first saturated edge
+                depth = saturated;
+                u = depth == 0 ? source : pathEdges[depth - 1].to;
+                continue;
+            }
+
+            List<Edge> edges = graph.get(u);
+            boolean advanced = false;
+            int scanVertex = u;
+            int scanFrom = start[u];
+            for (; start[u] < edges.size(); start[u]++) {
+                Edge edge = edges.get(start[u]);
+                if (level[edge.to] == level[u] + 1 && edge.flow < edge.capacity) {
+                    pathEdges[depth++] = edge;
+                    u = edge.to;
+                    advanced = true;
+                    break;
+                }
+            }
+            if (stats != null) {
+                stats.edgesScanned += start[scanVertex] - scanFrom + (advanced ? 1 : 0);
+            }
+
+            if (!advanced) {
+                if (depth == 0) {
+                    return pushed;
+                }
+                // Dead end: retreat and skip the edge that led here
+                if (stats != null) {
+                    stats.deadEnds++;
+                }
+                u = pathEdges[--depth].reverse.to;
+                start[u]++;
             }
         }
-        return 0;
     }
 
     // Dinic's max flow method
     public int dinicMaxFlow(int source, int sink) {
+        if (source == sink) {
+            return 0;
+        }
+
+        level = new int[vertexCount];
+        queue = new int[vertexCount];
+        start = new int[vertexCount];
+        pathEdges = new Edge[vertexCount];
+
         int maxFlow = 0;
+        int phase = 0;
+        long phaseStarted = stats != null ? System.nanoTime() : 0;
         while (bfsDinic(source, sink)) {
-            int[] start = new int[vertexCount];
-            int flow;
-            while ((flow = dfsDinic(source, Integer.MAX_VALUE, sink, start)) > 0) {
-                maxFlow += flow;
+            Arrays.fill(start, 0);
+            maxFlow += blockingFlow(source, sink, phase++);
+            if (stats != null) {
+                stats.phaseDone(phaseStarted);
+                phaseStarted = System.nanoTime();
             }
         }
         return maxFlow;
     }
 
-    
-    // BFS for finding augmenting paths
-    private boolean bfsEdmondsKarp(int[] parent, int source, int sink) {
+    // Frontiers smaller than this are expanded by a single task
+    private static final int BFS_CHUNK = 1024;
+
+    // Worker threads shared by every parallel solve in the JVM. Idle threads are
+    // picked up by the next solve instead of each solve starting its own pool,
+    // and they are daemons so they never keep the gateway alive.
+    private static final ExecutorService WORKER_POOL = Executors.newCachedThreadPool(runnable -> {
+        Thread thread = new Thread(runnable, "parallel-dinic");
+        thread.setDaemon(true);
+        return thread;
+    });
+
+    // Parallel Dinic state, allocated once per solve: flows indexed by
+    // Edge.slot, the BFS claims that become the level graph, and dead ends
+    private AtomicIntegerArray parallelFlows;
+    private AtomicIntegerArray claimed;
+    private AtomicIntegerArray dead;
+
+    // Parallel Dinic: the level graph comes from a level-synchronous BFS whose
+    // frontier is split across the pool, and each blocking flow is found by
+    // `threads` workers searching the level graph at once. Flows live in an
+    // AtomicIntegerArray for the solve, and a worker commits a path by claiming
+    // room on each of its edges with compare-and-set, so no lock is taken and
+    // workers only contend on the edges they share. A worker can see an edge as
+    // full while another worker's claim on it is being undone, and then give up
+    // on a vertex that still reaches the sink. That only ends the phase early;
+    // the next BFS finds whatever is left. The max flow matches dinicMaxFlow,
+    // though paths may be found in a different order.
+    public int parallelDinicMaxFlow(int source, int sink, int threads) {
+        if (threads <= 1) {
+            return dinicMaxFlow(source, sink);
+        }
+        if (source == sink) {
+            return 0;
+        }
+
+        parallelFlows = new AtomicIntegerArray(2 * edges.size());
+        for (Edge edge : edges) {
+            parallelFlows.set(edge.slot, edge.flow);
+            parallelFlows.set(edge.reverse.slot, edge.reverse.flow);
+        }
+        claimed = new AtomicIntegerArray(vertexCount);
+        dead = new AtomicIntegerArray(vertexCount);
+        level = new int[vertexCount];
+        BlockingFlowWorker[] workers = new BlockingFlowWorker[threads];
+        for (int w = 0; w < threads; w++) {
+            workers[w] = new BlockingFlowWorker(w, threads);
+        }
+
+        try {
+            int maxFlow = 0;
+            int phase = 0;
+            long phaseStarted = stats != null ? System.nanoTime() : 0;
+            while (parallelBfs(source, sink)) {
+                maxFlow += parallelBlockingFlow(workers, source, sink, phase++);
+                if (stats != null) {
+                    stats.phaseDone(phaseStarted);
+                    phaseStarted = System.nanoTime();
+                }
+            }
+            return maxFlow;
+        } finally {
+            for (Edge edge : edges) {
+                edge.flow = parallelFlows.get(edge.slot);
+                edge.reverse.flow = parallelFlows.get(edge.reverse.slot);
+            }
+            parallelFlows = null;
+            claimed = null;
+            dead = null;
+        }
+    }
+
+    // Level-synchronous BFS: every frontier chunk is expanded by its own task,
+    // and a compare-and-set on the level decides which task claims a vertex.
+    // Stops at the sink's level, since nothing past it is on a shortest path.
+    private boolean parallelBfs(int source, int sink) {
+        for (int v = 0; v < vertexCount; v++) {
+            claimed.set(v, -1);
+        }
+        claimed.set(source, 0);
+
+        int[] frontier = {source};
+        int depth = 0;
+        while (frontier.length > 0 && claimed.get(sink) < 0) {
+            final int[] current = frontier;
+            final int nextLevel = ++depth;
+            if (stats != null) {
+                for (int u : current) {
+                    stats.edgesScanned += graph.get(u).size();
+                }
+            }
+
+            List<Callable<int[]>> tasks = new ArrayList<>();
+            for (int from = 0; from < current.length; from += BFS_CHUNK) {
+                final int chunkStart = from;
+                final int chunkEnd = Math.min(current.length, from + BFS_CHUNK);
+                tasks.add(() -> expandFrontier(current, chunkStart, chunkEnd, nextLevel));
+            }
+            List<int[]> parts = tasks.size() == 1
+                    ? Collections.singletonList(expandFrontier(current, 0, current.length, nextLevel))
+                    : runAll(WORKER_POOL, tasks);
+
+            int size = 0;
+            for (int[] part : parts) {
+                size += part.length;
+            }
+            frontier = new int[size];
+            size = 0;
+            for (int[] part : parts) {
+                System.arraycopy(part, 0, frontier, size, part.length);
+                size += part.length;
+            }
+        }
+
+        for (int v = 0; v < vertexCount; v++) {
+            level[v] = claimed.get(v);
+        }
+        return level[sink] != -1;
+    }
+
+    // Vertices first reached from frontier[from .. to) at the given level
+    private int[] expandFrontier(int[] frontier, int from, int to, int nextLevel) {
+        int[] found = new int[16];
+        int count = 0;
+        for (int i = from; i < to; i++) {
+            for (Edge edge : graph.get(frontier[i])) {
+                if (parallelFlows.get(edge.slot) < edge.capacity && claimed.get(edge.to) < 0
+                        && claimed.compareAndSet(edge.to, -1, nextLevel)) {
+                    if (count == found.length) {
+                        found = Arrays.copyOf(found, 2 * count);
+                    }
+                    found[count++] = edge.to;
+                }
+            }
+        }
+        return Arrays.copyOf(found, count);
+    }
+
+    // Blocking flow of one phase, found by every worker searching at once.
+    // Counters and traced paths are merged in worker order once all are done.
+    private int parallelBlockingFlow(BlockingFlowWorker[] workers, final int source,
+                                     final int sink, final int phase) {
+        for (int v = 0; v < vertexCount; v++) {
+            dead.set(v, 0);
+        }
+        List<Callable<Integer>> tasks = new ArrayList<>();
+        for (BlockingFlowWorker worker : workers) {
+            tasks.add(() -> worker.run(source, sink, phase));
+        }
+
+        int pushed = 0;
+        for (int flow : runAll(WORKER_POOL, tasks)) {
+            pushed += flow;
+        }
+        if (pushed == 0) {
+            // Undone claims made every worker give up before any path got
+            // through; the first worker redoes the phase alone
+            for (int v = 0; v < vertexCount; v++) {
+                dead.set(v, 0);
+            }
+            pushed = workers[0].run(source, sink, phase);
+        }
+
+        for (BlockingFlowWorker worker : workers) {
+            if (stats != null) {
+                stats.augmentingPaths += worker.augmentations;
+                stats.edgesScanned += worker.edgesScanned;
+                stats.deadEnds += worker.deadEnds;
+            }
+            if (augmentingPaths != null) {
+                augmentingPaths.addAll(worker.paths);
+            }
+        }
+        return pushed;
+    }
+
+    // One worker's share of a parallel blocking flow. It keeps its own current
+    // edge pointers and starts each adjacency list at a different offset, so the
+    // workers fan out over the level graph instead of chasing the same paths.
+    // A vertex whose list is exhausted is marked dead for every worker. Its
+    // buffers live for the whole solve and are reset at the start of each phase.
+    private class BlockingFlowWorker {
+        final int worker;
+        final int workers;
+        final int[] scanned = new int[vertexCount];
+        final Edge[] path = new Edge[vertexCount];
+        final int[] taken = new int[vertexCount];
+        final List<int[]> paths = new ArrayList<>();
+        long augmentations;
+        long edgesScanned;
+        long deadEnds;
+
+        BlockingFlowWorker(int worker, int workers) {
+            this.worker = worker;
+            this.workers = workers;
+        }
+
+        int run(int source, int sink, int phase) {
+            Arrays.fill(scanned, 0);
+            paths.clear();
+            augmentations = 0;
+            edgesScanned = 0;
+            deadEnds = 0;
+            int pushed = 0;
+            int depth = 0;
+            int u = source;
+
+            while (true) {
+                if (u == sink) {
+                    int bottleneck = claimPath(depth);
+                    // Zero means another worker filled part of this path first
+                    if (bottleneck > 0) {
+                        pushed += bottleneck;
+                        augmentations++;
+                        if (augmentingPaths != null) {
+                            int[] record = new int[depth + 3];
+                            record[0] = phase;
+                            record[1] = bottleneck;
+                            record[2] = source;
+                            for (int i = 0; i < depth; i++) {
+                                record[i + 3] = path[i].to;
+                            }
+                            paths.add(record);
+                        }
+                    }
+
+                    // Resume from the tail of the first edge left without room
+                    int saturated = 0;
+                    while (saturated < depth - 1
+                            && parallelFlows.get(path[saturated].slot) < path[saturated].capacity) {
+                        saturated++;
+                    }
+                    depth = saturated;
+                    u = depth == 0 ? source : path[depth - 1].to;
+                    continue;
+                }
+
+                List<Edge> edges = graph.get(u);
+                int size = edges.size();
+                int offset = (int) ((long) worker * size / workers);
+                boolean advanced = false;
+                for (; scanned[u] < size; scanned[u]++) {
+                    int index = scanned[u] + offset;
+                    Edge edge = edges.get(index < size ? index : index - size);
+                    edgesScanned++;
+                    if (level[edge.to] == level[u] + 1 && dead.get(edge.to) == 0
+                            && parallelFlows.get(edge.slot) < edge.capacity) {
+                        path[depth++] = edge;
+                        u = edge.to;
+                        advanced = true;
+                        break;
+                    }
+                }
+
+                if (!advanced) {
+                    dead.set(u, 1);
+                    if (depth == 0) {
+                        return pushed;
+                    }
+                    // Dead end: retreat and skip the edge that led here
+                    deadEnds++;
+                    u = path[--depth].reverse.to;
+                    scanned[u]++;
+                }
+            }
+        }
+
+        // Claim the same amount on every edge of path[0 .. depth) with
+        // compare-and-set and return it. The amount is the smallest room seen so
+        // far, so it only shrinks; edges claimed before it shrank hand the
+        // difference back at the end. An edge with no room left undoes every
+        // claim and the path carries nothing.
+        private int claimPath(int depth) {
+            int amount = Integer.MAX_VALUE;
+            for (int i = 0; i < depth; i++) {
+                Edge edge = path[i];
+                while (true) {
+                    int flow = parallelFlows.get(edge.slot);
+                    if (flow >= edge.capacity) {
+                        for (int j = 0; j < i; j++) {
+                            parallelFlows.addAndGet(path[j].slot, -taken[j]);
+                        }
+                        return 0;
+                    }
+                    int take = Math.min(amount, edge.capacity - flow);
+                    if (parallelFlows.compareAndSet(edge.slot, flow, flow + take)) {
+                        taken[i] = take;
+                        amount = take;
+                        break;
+                    }
+                }
+            }
+            for (int i = 0; i < depth; i++) {
+                if (taken[i] > amount) {
+                    parallelFlows.addAndGet(path[i].slot, amount - taken[i]);
+                }
+                parallelFlows.addAndGet(path[i].reverse.slot, -amount);
+            }
+            return amount;
+        }
+    }
+
+    // Run every task on the pool and wait for all of them, rethrowing the first failure
+    private static <T> List<T> runAll(ExecutorService pool, List<Callable<T>> tasks) {
+        try {
+            List<T> results = new ArrayList<>(tasks.size());
+            for (Future<T> future : pool.invokeAll(tasks)) {
+                results.add(future.get());
+            }
+            return results;
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new IllegalStateException("Parallel solve interrupted", e);
+        } catch (ExecutionException e) {
+            if (e.getCause() instanceof RuntimeException) {
+                throw (RuntimeException) e.getCause();
+            }
+            throw new IllegalStateException(e.getCause());
+        }
+    }
+
+    // Thread count for "Parallel Dinic"; defaults to one per available core
+    public void setParallelism(int threads) {
+        parallelism = Math.max(1, threads);
+    }
+
+    // BFS for finding augmenting paths. parentEdge[v] is the residual edge
+    // used to reach v, so the path can be walked without rescanning adjacency.
+    private boolean bfsEdmondsKarp(Edge[] parentEdge, int source, int sink) {
         boolean[] visited = new boolean[vertexCount];
         Arrays.fill(visited, false);
 
         Queue<Integer> queue = new LinkedList<>();
         queue.add(source);
         visited[source] = true;
-        parent[source] = -1;
+        parentEdge[source] = null;
 
         while (!queue.isEmpty()) {
             int u = queue.poll();
 
             for (Edge edge : graph.get(u)) {
+                if (stats != null) {
+                    stats.edgesScanned++;
+                }
                 if (!visited[edge.to] && edge.capacity > edge.flow) {
                     queue.add(edge.to);
-                    parent[edge.to] = u;
+                    parentEdge[edge.to] = edge;
                     visited[edge.to] = true;
 
                     if (edge.to == sink) {
@@ -127,35 +632,663 @@ public class FlowAlgorithm {
     // Edmonds-Karp max flow method
     public int edmondsKarpMaxFlow(int source, int sink) {
         int maxFlow = 0;
-        int[] parent = new int[vertexCount];
+        Edge[] parentEdge = new Edge[vertexCount];
 
-        while (bfsEdmondsKarp(parent, source, sink)) {
+        // Every BFS that finds a path is one phase with a single augmentation
+        long phaseStarted = stats != null ? System.nanoTime() : 0;
+        while (bfsEdmondsKarp(parentEdge, source, sink)) {
             int pathFlow = Integer.MAX_VALUE;
 
-           
-            for (int v = sink; v != source; v = parent[v]) {
-                int u = parent[v];
-                for (Edge edge : graph.get(u)) {
-                    if (edge.to == v && edge.capacity > edge.flow) {
-                        pathFlow = Math.min(pathFlow, edge.capacity - edge.flow);
+            // The tail of parentEdge[v] is the head of its reverse edge
+            for (int v = sink; v != source; v = parentEdge[v].reverse.to) {
+                Edge edge = parentEdge[v];
+                pathFlow = Math.min(pathFlow, edge.capacity - edge.flow);
+            }
+
+            for (int v = sink; v != source; v = parentEdge[v].reverse.to) {
+                Edge edge = parentEdge[v];
+                edge.flow += pathFlow;
+                edge.reverse.flow -= pathFlow;
+            }
+
+            if (augmentingPaths != null) {
+                for (int v = sink; v != source; v = parentEdge[v].reverse.to) {
+                    tracedPath.add(v);
+                }
+                tracedPath.add(source);
+                Collections.reverse(tracedPath);
+                recordPath(augmentingPaths.size(), pathFlow, tracedPath);
+                tracedPath.clear();
+            }
+
+            maxFlow += pathFlow;
+            if (stats != null) {
+                stats.augmentingPaths++;
+                stats.phaseDone(phaseStarted);
+                phaseStarted = System.nanoTime();
+            }
+        }
+
+        return maxFlow;
+    }
+
+    // Dijkstra over residual edges with reduced costs cost + potential[u] - potential[v].
+    // Entries are {distance, vertex}; stale ones are skipped when popped.
+    private boolean dijkstraMinCost(double[] potential, double[] dist, Edge[] parentEdge, int source, int sink) {
+        Arrays.fill(dist, Double.POSITIVE_INFINITY);
+        dist[source] = 0;
+        parentEdge[source] = null;
+
+        PriorityQueue<double[]> heap = new PriorityQueue<>((a, b) -> Double.compare(a[0], b[0]));
+        heap.add(new double[]{0, source});
+        while (!heap.isEmpty()) {
+            double[] entry = heap.poll();
+            int u = (int) entry[1];
+            if (entry[0] > dist[u]) {
+                continue;
+            }
+
+            for (Edge edge : graph.get(u)) {
+                if (stats != null) {
+                    stats.edgesScanned++;
+                }
+                if (edge.capacity > edge.flow) {
+                    // Rounding can leave a reduced cost a hair below zero
+                    double reduced = Math.max(0, edge.cost + potential[u] - potential[edge.to]);
+                    if (dist[u] + reduced < dist[edge.to]) {
+                        dist[edge.to] = dist[u] + reduced;
+                        parentEdge[edge.to] = edge;
+                        heap.add(new double[]{dist[edge.to], edge.to});
                     }
                 }
             }
+        }
+        return dist[sink] < Double.POSITIVE_INFINITY;
+    }
+
+    // Min-cost max flow by successive shortest paths: every phase augments along
+    // the cheapest residual source-sink path. Costs start non-negative, so zero
+    // potentials are valid at first, and adding each phase's distances keeps
+    // every reduced cost non-negative for the next Dijkstra.
+    public int minCostMaxFlow(int source, int sink) {
+        if (source == sink) {
+            return 0;
+        }
+
+        double[] potential = new double[vertexCount];
+        double[] dist = new double[vertexCount];
+        Edge[] parentEdge = new Edge[vertexCount];
+        int maxFlow = 0;
+
+        long phaseStarted = stats != null ? System.nanoTime() : 0;
+        while (dijkstraMinCost(potential, dist, parentEdge, source, sink)) {
+            for (int v = 0; v < vertexCount; v++) {
+                if (dist[v] < Double.POSITIVE_INFINITY) {
+                    potential[v] += dist[v];
+                }
+            }
+
+            int pathFlow = Integer.MAX_VALUE;
+            for (int v = sink; v != source; v = parentEdge[v].reverse.to) {
+                Edge edge = parentEdge[v];
+                pathFlow = Math.min(pathFlow, edge.capacity - edge.flow);
+            }
+
+            for (int v = sink; v != source; v = parentEdge[v].reverse.to) {
+                Edge edge = parentEdge[v];
+                edge.flow += pathFlow;
+                edge.reverse.flow -= pathFlow;
+            }
+
+            if (augmentingPaths != null) {
+                for (int v = sink; v != source; v = parentEdge[v].reverse.to) {
+                    tracedPath.add(v);
+                }
+                tracedPath.add(source);
+                Collections.reverse(tracedPath);
+                recordPath(augmentingPaths.size(), pathFlow, tracedPath);
+                tracedPath.clear();
+            }
+
+            maxFlow += pathFlow;
+            if (stats != null) {
+                stats.augmentingPaths++;
+                stats.phaseDone(phaseStarted);
+                phaseStarted = System.nanoTime();
+            }
+        }
+        return maxFlow;
+    }
+
+    // Push-relabel state: heights, excess, current arc and active-vertex buckets by height
+    private int[] height;
+    private long[] excess;
+    private int[] heightCount;
+    private int[] bucketHead;
+    private int[] bucketNext;
+    private boolean[] active;
+    private int highest;
+    private long relabelWork;
 
-           
-            for (int v = sink; v != source; v = parent[v]) {
-                int u = parent[v];
+    // Exact heights from a reverse residual BFS: distance to the sink, or n plus
+    // the distance back to the source for vertices that can no longer reach the sink
+    private void globalRelabel(int source, int sink) {
+        int n = vertexCount;
+        Arrays.fill(height, 2 * n);
+        height[sink] = 0;
+        height[source] = n;
+
+        // The source BFS only labels vertices the sink BFS could not reach
+        int[] roots = {sink, source};
+        for (int root : roots) {
+            int head = 0, tail = 0;
+            queue[tail++] = root;
+            while (head < tail) {
+                int u = queue[head++];
                 for (Edge edge : graph.get(u)) {
-                    if (edge.to == v) {
-                        edge.flow += pathFlow;
-                        edge.reverse.flow -= pathFlow;
+                    Edge back = edge.reverse;
+                    if (height[edge.to] == 2 * n && back.flow < back.capacity) {
+                        height[edge.to] = height[u] + 1;
+                        queue[tail++] = edge.to;
                     }
                 }
             }
+        }
 
-            maxFlow += pathFlow;
+        Arrays.fill(heightCount, 0);
+        for (int v = 0; v < n; v++) {
+            heightCount[height[v]]++;
+        }
+        Arrays.fill(bucketHead, -1);
+        Arrays.fill(active, false);
+        Arrays.fill(start, 0);
+        highest = -1;
+        for (int v = 0; v < n; v++) {
+            activate(v, source, sink);
+        }
+        relabelWork = 0;
+    }
+
+    private void activate(int v, int source, int sink) {
+        if (excess[v] > 0 && !active[v] && v != source && v != sink && height[v] < 2 * vertexCount) {
+            active[v] = true;
+            bucketNext[v] = bucketHead[height[v]];
+            bucketHead[height[v]] = v;
+            highest = Math.max(highest, height[v]);
         }
+    }
 
-        return maxFlow;
+    // Gap heuristic: nothing is left at height h, so every vertex between h
+    // and n is cut off from the sink and can be lifted straight above n.
+    // Queued vertices keep their old bucket and are requeued when popped.
+    private void gap(int h) {
+        int n = vertexCount;
+        for (int v = 0; v < n; v++) {
+            if (height[v] > h && height[v] < n) {
+                heightCount[height[v]]--;
+                height[v] = n + 1;
+                heightCount[n + 1]++;
+                start[v] = 0;
+            }
+        }
+    }
+
+    private void relabel(int v) {
+        int oldHeight = height[v];
+        int newHeight = 2 * vertexCount;
+        List<Edge> edges = graph.get(v);
+        for (Edge edge : edges) {
+            if (edge.flow < edge.capacity) {
+                newHeight = Math.min(newHeight, height[edge.to] + 1);
+            }
+        }
+        relabelWork += edges.size() + 12;
+        if (stats != null) {
+            stats.relabels++;
+            stats.edgesScanned += edges.size();
+        }
+
+        heightCount[oldHeight]--;
+        height[v] = newHeight;
+        heightCount[newHeight]++;
+        start[v] = 0;
+        if (heightCount[oldHeight] == 0 && oldHeight < vertexCount) {
+            gap(oldHeight);
+        }
+    }
+
+    // Push excess out of v along admissible edges, relabeling when none are left
+    private void discharge(int v, int source, int sink) {
+        List<Edge> edges = graph.get(v);
+        while (excess[v] > 0 && height[v] < 2 * vertexCount) {
+            if (start[v] == edges.size()) {
+                relabel(v);
+                continue;
+            }
+            Edge edge = edges.get(start[v]);
+            if (stats != null) {
+                stats.edgesScanned++;
+            }
+            if (edge.flow < edge.capacity && height[v] == height[edge.to] + 1) {
+                if (stats != null) {
+                    stats.pushes++;
+                }
+                int amount = (int) Math.min(excess[v], edge.capacity - edge.flow);
+                edge.flow += amount;
+                edge.reverse.flow -= amount;
+                excess[v] -= amount;
+                excess[edge.to] += amount;
+                activate(edge.to, source, sink);
+            } else {
+                start[v]++;
+            }
+        }
+    }
+
+    // Highest-label push-relabel max flow method with gap and global relabeling
+    public int pushRelabelMaxFlow(int source, int sink) {
+        if (source == sink) {
+            return 0;
+        }
+
+        int n = vertexCount;
+        height = new int[n];
+        excess = new long[n];
+        heightCount = new int[2 * n + 1];
+        bucketHead = new int[2 * n];
+        bucketNext = new int[n];
+        active = new boolean[n];
+        queue = new int[n];
+        start = new int[n];
+
+        for (Edge edge : graph.get(source)) {
+            int amount = edge.capacity - edge.flow;
+            if (amount > 0) {
+                edge.flow += amount;
+                edge.reverse.flow -= amount;
+                excess[edge.to] += amount;
+                excess[source] -= amount;
+            }
+        }
+        // Label after the source edges are saturated so every vertex holding
+        // excess already has a residual route back to the source
+        globalRelabel(source, sink);
+
+        // With stats on, each stretch between global relabels counts as a phase
+        long phaseStarted = stats != null ? System.nanoTime() : 0;
+        long relabelPeriod = 6L * n + edges.size();
+        while (highest >= 0) {
+            int v = bucketHead[highest];
+            if (v < 0) {
+                highest--;
+                continue;
+            }
+            bucketHead[highest] = bucketNext[v];
+            active[v] = false;
+            if (height[v] != highest) {
+                // Lifted by a gap while queued; requeue at its new height
+                activate(v, source, sink);
+                continue;
+            }
+
+            discharge(v, source, sink);
+            activate(v, source, sink);
+            if (relabelWork > relabelPeriod) {
+                globalRelabel(source, sink);
+                if (stats != null) {
+                    stats.phaseDone(phaseStarted);
+                    phaseStarted = System.nanoTime();
+                }
+            }
+        }
+        if (stats != null) {
+            stats.phaseDone(phaseStarted);
+        }
+
+        return (int) excess[sink];
+    }
+
+    // Store one augmenting path as {phase, bottleneck, v0, v1, ..., vk}
+    private void recordPath(int phase, int bottleneck, List<Integer> path) {
+        int[] record = new int[path.size() + 2];
+        record[0] = phase;
+        record[1] = bottleneck;
+        for (int i = 0; i < path.size(); i++) {
+            record[i + 2] = path.get(i);
+        }
+        augmentingPaths.add(record);
+    }
+
+    // Net flow currently leaving the source
+    public int currentFlow(int source) {
+        int flow = 0;
+        for (Edge edge : graph.get(source)) {
+            flow += edge.flow;
+        }
+        return flow;
+    }
+
+    // Repair scratch buffers, allocated on first use and kept between updates.
+    // A vertex counts as visited when its mark equals the current stamp, so a
+    // search only touches the vertices it reaches instead of clearing arrays.
+    private int[] repairMark;
+    private int repairStamp;
+    private int[] repairQueue;
+    private Edge[] repairParent;
+    private Edge[] repairPath;
+
+    // BFS over residual edges from one vertex until it reaches another, leaving
+    // the edge used to reach each vertex in repairParent
+    private boolean repairSearch(int from, int to) {
+        if (from == to) {
+            return true;
+        }
+        if (repairMark == null) {
+            repairMark = new int[vertexCount];
+            repairQueue = new int[vertexCount];
+            repairParent = new Edge[vertexCount];
+            repairPath = new Edge[vertexCount];
+        }
+        if (++repairStamp == 0) {
+            Arrays.fill(repairMark, 0);
+            repairStamp = 1;
+        }
+        int head = 0, tail = 0;
+        repairQueue[tail++] = from;
+        repairMark[from] = repairStamp;
+        while (head < tail) {
+            int u = repairQueue[head++];
+            for (Edge edge : graph.get(u)) {
+                if (repairMark[edge.to] != repairStamp && edge.flow < edge.capacity) {
+                    repairMark[edge.to] = repairStamp;
+                    repairParent[edge.to] = edge;
+                    if (edge.to == to) {
+                        return true;
+                    }
+                    repairQueue[tail++] = edge.to;
+                }
+            }
+        }
+        return false;
+    }
+
+    // Copy the path repairSearch found into repairPath from offset on, in
+    // order from `from` to `to`, and return the offset just past it
+    private int collectRepairPath(int from, int to, int offset) {
+        int end = offset;
+        for (int v = to; v != from; v = repairParent[v].reverse.to) {
+            repairPath[end++] = repairParent[v];
+        }
+        for (int i = offset, j = end - 1; i < j; i++, j--) {
+            Edge edge = repairPath[i];
+            repairPath[i] = repairPath[j];
+            repairPath[j] = edge;
+        }
+        return end;
+    }
+
+    // Push up to limit units along repairPath[0 .. length) and return the amount pushed
+    private int pushRepairPath(int length, int limit) {
+        int pathFlow = limit;
+        for (int i = 0; i < length; i++) {
+            pathFlow = Math.min(pathFlow, repairPath[i].capacity - repairPath[i].flow);
+        }
+        for (int i = 0; i < length; i++) {
+            repairPath[i].flow += pathFlow;
+            repairPath[i].reverse.flow -= pathFlow;
+        }
+        return pathFlow;
+    }
+
+    // Push up to limit units from one vertex to another through the residual graph
+    private int augmentBetween(int from, int to, int limit) {
+        int moved = 0;
+        while (moved < limit && repairSearch(from, to)) {
+            moved += pushRepairPath(collectRepairPath(from, to, 0), limit - moved);
+        }
+        return moved;
+    }
+
+    // Change one edge's capacity on an already-solved graph and repair the flow
+    // instead of re-solving from zero. Returns the new max flow value.
+    //
+    // Only residual paths through the changed edge are searched. Before the
+    // change no source-sink residual path existed, so on an increase any new
+    // one has to use the extra room on u -> v: if the edge was not saturated,
+    // or the source cannot reach u or v cannot reach the sink, the flow is
+    // already maximum. On a decrease the cancelled excess is rerouted from u to
+    // v, and whatever cannot be is returned to the source and pulled back from
+    // the sink; the vertices u still reaches then hold the source but not the
+    // sink, so that flow is maximum too.
+    public int updateCapacity(int edgeId, int capacity, int source, int sink) {
+        if (edgeId < 0 || edgeId >= edges.size()) {
+            throw new IllegalArgumentException("No edge with id " + edgeId);
+        }
+        if (capacity < 0) {
+            throw new IllegalArgumentException("Capacity must be non-negative, got " + capacity);
+        }
+        Edge edge = edges.get(edgeId);
+        int u = edge.reverse.to;
+        int v = edge.to;
+        boolean saturated = edge.flow == edge.capacity;
+        int overflow = edge.flow - capacity;
+        edge.capacity = capacity;
+        gomoryHuTree = null;
+
+        if (overflow > 0) {
+            // Cancel the excess: u is left with a surplus and v with a deficit
+            edge.flow = capacity;
+            edge.reverse.flow = -capacity;
+
+            // First try to reroute it around the edge, then send what is left
+            // back to the source and pull the matching amount back from the sink
+            int remaining = overflow - augmentBetween(u, v, overflow);
+            if (remaining > 0 && u != source && u != sink) {
+                augmentBetween(u, source, remaining);
+            }
+            if (remaining > 0 && v != source && v != sink) {
+                augmentBetween(sink, v, remaining);
+            }
+        } else if (saturated && edge.flow < capacity && u != v && u != sink && v != source) {
+            // Augment along source -> u, the edge, v -> sink while the edge has
+            // room. The source side stays within the old cut and the sink side
+            // outside it, so the two halves never share a vertex.
+            while (edge.flow < edge.capacity && repairSearch(source, u)) {
+                int length = collectRepairPath(source, u, 0);
+                repairPath[length++] = edge;
+                if (!repairSearch(v, sink)) {
+                    break;
+                }
+                pushRepairPath(collectRepairPath(v, sink, length), Integer.MAX_VALUE);
+            }
+        }
+        return currentFlow(source);
+    }
+
+    // Add an edge to an already-solved graph and augment along it. Returns the
+    // new max flow value.
+    public int addEdgeIncremental(int u, int v, int capacity, int source, int sink) {
+        if (u < 0 || u >= vertexCount || v < 0 || v >= vertexCount) {
+            throw new IllegalArgumentException("Edge " + u + " -> " + v + " is outside 0 to " + (vertexCount - 1));
+        }
+        if (capacity < 0) {
+            throw new IllegalArgumentException("Capacity must be non-negative, got " + capacity);
+        }
+        // A zero-capacity edge is saturated, so raising it takes the increase path
+        return updateCapacity(addEdge(u, v, 0), capacity, source, sink);
+    }
+
+    // Remove an edge from an already-solved graph; it stays in place with zero
+    // capacity so the ids of the other edges do not shift
+    public int removeEdge(int edgeId, int source, int sink) {
+        return updateCapacity(edgeId, 0, source, sink);
+    }
+
+    // Gomory-Hu (Gusfield) tree of this graph's links, cached until an edge changes
+    public GomoryHuTree getGomoryHuTree() {
+        if (gomoryHuTree == null) {
+            gomoryHuTree = GomoryHuTree.build(this, vertexCount);
+        }
+        return gomoryHuTree;
+    }
+
+    // Min cut between two routers from the cached tree, without a new solve
+    public int minCutBetween(int u, int v) {
+        return getGomoryHuTree().minCut(u, v);
+    }
+
+    // Current flow on every edge, in the order the edges were added
+    public int[] getEdgeFlows() {
+        int[] flows = new int[edges.size()];
+        for (int i = 0; i < flows.length; i++) {
+            flows[i] = edges.get(i).flow;
+        }
+        return flows;
+    }
+
+    // Vertices still reachable from the source in the residual graph (source side of the min cut)
+    public int[] minCutSourceSide(int source) {
+        boolean[] visited = new boolean[vertexCount];
+        int[] queue = new int[vertexCount];
+        int head = 0, tail = 0;
+        queue[tail++] = source;
+        visited[source] = true;
+
+        while (head < tail) {
+            int u = queue[head++];
+            for (Edge edge : graph.get(u)) {
+                if (!visited[edge.to] && edge.flow < edge.capacity) {
+                    visited[edge.to] = true;
+                    queue[tail++] = edge.to;
+                }
+            }
+        }
+
+        int[] sourceSide = Arrays.copyOf(queue, tail);
+        Arrays.sort(sourceSide);
+        return sourceSide;
+    }
+
+    // Run the named algorithm on the current residual graph
+    public int maxFlow(String algorithm, int source, int sink) {
+        switch (algorithm) {
+            case "Dinic":
+                return dinicMaxFlow(source, sink);
+            case "Edmonds-Karp":
+                return edmondsKarpMaxFlow(source, sink);
+            case "Push-Relabel":
+                return pushRelabelMaxFlow(source, sink);
+            case "Parallel Dinic":
+                return parallelDinicMaxFlow(source, sink, parallelism);
+            case "Min-Cost Max-Flow":
+                return minCostMaxFlow(source, sink);
+            default:
+                throw new IllegalArgumentException("Unknown algorithm: " + algorithm);
+        }
+    }
+
+    // Max flow for every (sources[i], sinks[i]) pair, leaving this graph's own
+    // flow untouched. The pairs are dealt round-robin to up to `threads`
+    // workers; each worker solves on its own copy of the graph and only
+    // resets flows between pairs instead of rebuilding the adjacency lists.
+    public int[] maxFlowBatch(final String algorithm, final int[] sources, final int[] sinks, int threads) {
+        if (sources.length != sinks.length) {
+            throw new IllegalArgumentException("Need one sink per source");
+        }
+
+        final int[] flows = new int[sources.length];
+        final int workers = Math.max(1, Math.min(threads, sources.length));
+        ExecutorService pool = Executors.newFixedThreadPool(workers);
+        try {
+            List<Callable<Void>> tasks = new ArrayList<>();
+            for (int w = 0; w < workers; w++) {
+                final FlowAlgorithm copy = new FlowAlgorithm(this);
+                final int first = w;
+                tasks.add(() -> {
+                    for (int i = first; i < sources.length; i += workers) {
+                        copy.resetFlows();
+                        flows[i] = copy.maxFlow(algorithm, sources[i], sinks[i]);
+                    }
+                    return null;
+                });
+            }
+            runAll(pool, tasks);
+        } finally {
+            pool.shutdownNow();
+        }
+        return flows;
+    }
+
+    // Max flow from a set of sources to a set of sinks. A copy of the graph
+    // gets a super-source feeding every source and a super-sink fed by every
+    // sink, so this graph's own flow is left untouched. The original edges
+    // keep their costs and the super edges are free. Edge flows cover the
+    // original edges only, and the min cut and traced paths list original
+    // vertices only.
+    public FlowResult solveMulti(String algorithm, int[] sources, int[] sinks, boolean trace) {
+        int superSource = vertexCount;
+        int superSink = vertexCount + 1;
+        FlowAlgorithm augmented = new FlowAlgorithm(vertexCount + 2);
+        augmented.addEdges(edgeTriples());
+        augmented.copyCosts(this);
+
+        // A terminal can never carry more than its own links do, so that
+        // bounds the super edges without risking int overflow
+        for (int source : sources) {
+            augmented.addEdge(superSource, source, linkCapacity(source, true));
+        }
+        for (int sink : sinks) {
+            augmented.addEdge(sink, superSink, linkCapacity(sink, false));
+        }
+
+        FlowResult result = augmented.solve(algorithm, superSource, superSink, trace);
+        int[] edgeFlows = Arrays.copyOf(result.getEdgeFlows(), edges.size());
+        int[] minCut = Arrays.stream(result.getMinCut()).filter(v -> v < vertexCount).toArray();
+        // Every path runs superSource, ..., superSink; keep phase, bottleneck
+        // and the vertices in between
+        List<int[]> paths = new ArrayList<>();
+        for (int[] record : result.getAugmentingPaths()) {
+            int[] stripped = new int[record.length - 2];
+            stripped[0] = record[0];
+            stripped[1] = record[1];
+            System.arraycopy(record, 3, stripped, 2, record.length - 4);
+            paths.add(stripped);
+        }
+        return new FlowResult(result.getMaxFlow(), edgeFlows, minCut, paths);
+    }
+
+    // Total capacity leaving (outgoing) or entering a vertex, capped at Integer.MAX_VALUE
+    private int linkCapacity(int vertex, boolean outgoing) {
+        long total = 0;
+        for (Edge edge : graph.get(vertex)) {
+            total += outgoing ? edge.capacity : edge.reverse.capacity;
+        }
+        return (int) Math.min(total, Integer.MAX_VALUE);
+    }
+
+    // Run the named algorithm and collect per-edge flows, the min cut and,
+    // when trace is set, every augmenting path with its phase
+    public FlowResult solve(String algorithm, int source, int sink, boolean trace) {
+        return solve(algorithm, source, sink, trace, false);
+    }
+
+    // Same as solve, and with collectStats set also counts phases, paths,
+    // scanned edges, dead ends, pushes and relabels and times every phase
+    public FlowResult solve(String algorithm, int source, int sink, boolean trace, boolean collectStats) {
+        augmentingPaths = trace ? new ArrayList<int[]>() : null;
+        stats = collectStats ? new SolveStats() : null;
+        try {
+            long started = System.nanoTime();
+            int maxFlow = maxFlow(algorithm, source, sink);
+            if (stats != null) {
+                stats.solveNanos = System.nanoTime() - started;
+            }
+            List<int[]> paths = trace ? augmentingPaths : Collections.<int[]>emptyList();
+            return new FlowResult(maxFlow, getEdgeFlows(), minCutSourceSide(source), paths, stats);
+        } finally {
+            augmentingPaths = null;
+            stats = null;
+            tracedPath.clear();
+        }
     }
 }
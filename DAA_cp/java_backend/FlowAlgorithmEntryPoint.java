@@ -1,9 +1,24 @@
 import py4j.GatewayServer;
 
+import java.nio.ByteBuffer;
+import java.nio.DoubleBuffer;
+import java.nio.IntBuffer;
+import java.nio.LongBuffer;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.atomic.AtomicInteger;
+
 public class FlowAlgorithmEntryPoint {
 
     private FlowAlgorithm flowAlgorithm;
 
+    // Session-scoped graphs, addressed by id so concurrent clients never share state
+    private final Map<Integer, FlowAlgorithm> graphs = new ConcurrentHashMap<>();
+    private final AtomicInteger nextGraphId = new AtomicInteger(1);
+
+    // Session graphs with 64-bit capacities; they share the id sequence above
+    private final Map<Integer, LongFlowAlgorithm> longGraphs = new ConcurrentHashMap<>();
+
     // Constructor to initialize FlowAlgorithm with vertex count
     public FlowAlgorithmEntryPoint(int vertexCount) {
         flowAlgorithm = new FlowAlgorithm(vertexCount);
@@ -19,6 +34,18 @@ public class FlowAlgorithmEntryPoint {
         flowAlgorithm.addEdge(u, v, capacity);
     }
 
+    // Method to add a whole edge list in a single call. The payload holds
+    // big-endian int32 (u, v, capacity) triples, as packed by pack_edges.
+    public void addEdgesPacked(byte[] payload) {
+        flowAlgorithm.addEdges(unpackTriples(payload));
+    }
+
+    // Method to reset the graph and bulk-load its edges in one round-trip
+    public void loadGraph(int vertexCount, byte[] payload) {
+        resetGraph(vertexCount);
+        addEdgesPacked(payload);
+    }
+
     // Method to run Dinic's algorithm
     public int dinicMaxFlow(int source, int sink) {
         return flowAlgorithm.dinicMaxFlow(source, sink);
@@ -29,6 +56,264 @@ public class FlowAlgorithmEntryPoint {
         return flowAlgorithm.edmondsKarpMaxFlow(source, sink);
     }
 
+    // Method to run the push-relabel algorithm
+    public int pushRelabelMaxFlow(int source, int sink) {
+        return flowAlgorithm.pushRelabelMaxFlow(source, sink);
+    }
+
+    // Method to run Dinic's algorithm with a parallel BFS and blocking flow on `threads` workers
+    public int parallelDinicMaxFlow(int source, int sink, int threads) {
+        return flowAlgorithm.parallelDinicMaxFlow(source, sink, threads);
+    }
+
+    // Method to solve and return flows, min cut and optional path trace as one payload
+    public byte[] solve(String algorithm, int source, int sink, boolean trace) {
+        return flowAlgorithm.solve(algorithm, source, sink, trace).toBytes();
+    }
+
+    // Method to create an empty session graph and return its id
+    public int createGraph(int vertexCount) {
+        int graphId = nextGraphId.getAndIncrement();
+        graphs.put(graphId, new FlowAlgorithm(vertexCount));
+        return graphId;
+    }
+
+    // Method to create a session graph and bulk-load its edges in one round-trip
+    public int createGraph(int vertexCount, byte[] payload) {
+        FlowAlgorithm graph = new FlowAlgorithm(vertexCount);
+        graph.addEdges(unpackTriples(payload));
+        int graphId = nextGraphId.getAndIncrement();
+        graphs.put(graphId, graph);
+        return graphId;
+    }
+
+    // Method to create a session graph with 64-bit capacities. The payload holds
+    // big-endian int64 (u, v, capacity) triples, as packed by pack_edges_long.
+    public int createGraphLong(int vertexCount, byte[] payload) {
+        LongFlowAlgorithm graph = new LongFlowAlgorithm(vertexCount, unpackLongs(payload));
+        int graphId = nextGraphId.getAndIncrement();
+        longGraphs.put(graphId, graph);
+        return graphId;
+    }
+
+    // Method to solve a 64-bit session graph; the reply is a LongFlowResult payload
+    public byte[] solveLong(int graphId, String algorithm, int source, int sink, boolean trace,
+                            boolean collectStats) {
+        LongFlowAlgorithm graph = longGraphs.get(graphId);
+        if (graph == null) {
+            throw new IllegalArgumentException("Unknown graph id: " + graphId);
+        }
+        synchronized (graph) {
+            return graph.solve(algorithm, source, sink, trace, collectStats).toBytes();
+        }
+    }
+
+    // Method to set the per-edge costs of a session graph (int or 64-bit) for
+    // "Min-Cost Max-Flow". The payload holds one big-endian float64 per edge,
+    // in edge order, as packed by pack_costs.
+    public void setEdgeCosts(int graphId, byte[] payload) {
+        double[] costs = unpackDoubles(payload);
+        LongFlowAlgorithm longGraph = longGraphs.get(graphId);
+        if (longGraph != null) {
+            synchronized (longGraph) {
+                longGraph.setEdgeCosts(costs);
+            }
+            return;
+        }
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            graph.setEdgeCosts(costs);
+        }
+    }
+
+    // Method to add an edge to a session graph and return its edge id
+    public int addEdge(int graphId, int u, int v, int capacity) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.addEdge(u, v, capacity);
+        }
+    }
+
+    // Method to add packed edges to a session graph
+    public void addEdgesPacked(int graphId, byte[] payload) {
+        int[] triples = unpackTriples(payload);
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            graph.addEdges(triples);
+        }
+    }
+
+    // Method to run Dinic's algorithm on a session graph
+    public int dinicMaxFlow(int graphId, int source, int sink) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.dinicMaxFlow(source, sink);
+        }
+    }
+
+    // Method to run Edmonds-Karp algorithm on a session graph
+    public int edmondsKarpMaxFlow(int graphId, int source, int sink) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.edmondsKarpMaxFlow(source, sink);
+        }
+    }
+
+    // Method to run the push-relabel algorithm on a session graph
+    public int pushRelabelMaxFlow(int graphId, int source, int sink) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.pushRelabelMaxFlow(source, sink);
+        }
+    }
+
+    // Method to run parallel Dinic on a session graph with `threads` workers
+    public int parallelDinicMaxFlow(int graphId, int source, int sink, int threads) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.parallelDinicMaxFlow(source, sink, threads);
+        }
+    }
+
+    // Method to set how many workers a session graph's "Parallel Dinic" solves use
+    public void setParallelism(int graphId, int threads) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            graph.setParallelism(threads);
+        }
+    }
+
+    // Method to solve a session graph and return its packed FlowResult
+    public byte[] solve(int graphId, String algorithm, int source, int sink, boolean trace) {
+        return solve(graphId, algorithm, source, sink, trace, false);
+    }
+
+    // Method to solve a session graph, optionally collecting solve stats into the payload
+    public byte[] solve(int graphId, String algorithm, int source, int sink, boolean trace,
+                        boolean collectStats) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.solve(algorithm, source, sink, trace, collectStats).toBytes();
+        }
+    }
+
+    // Method to solve many (source, sink) pairs on a session graph across a thread
+    // pool. The payload holds big-endian int32 (source, sink) pairs; the reply
+    // holds one big-endian int32 max flow per pair.
+    public byte[] maxFlowBatch(int graphId, String algorithm, byte[] pairs, int threads) {
+        int[] words = unpackInts(pairs);
+        int[] sources = new int[words.length / 2];
+        int[] sinks = new int[words.length / 2];
+        for (int i = 0; i < sources.length; i++) {
+            sources[i] = words[2 * i];
+            sinks[i] = words[2 * i + 1];
+        }
+
+        // Workers copy the graph up front, so the lock is only held while copying
+        FlowAlgorithm graph = getGraph(graphId);
+        FlowAlgorithm snapshot;
+        synchronized (graph) {
+            snapshot = new FlowAlgorithm(graph);
+        }
+        return packInts(snapshot.maxFlowBatch(algorithm, sources, sinks, threads));
+    }
+
+    // Method to solve from a set of sources to a set of sinks (packed big-endian
+    // int32 vertex ids) through a super-source and super-sink
+    public byte[] solveMulti(int graphId, String algorithm, byte[] sources, byte[] sinks, boolean trace) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.solveMulti(algorithm, unpackInts(sources), unpackInts(sinks), trace).toBytes();
+        }
+    }
+
+    // Method to get a session graph's Gomory-Hu tree as [vertexCount, parent..., weight...]
+    // big-endian int32 words. The tree is built once and cached with the graph.
+    public byte[] gomoryHuTree(int graphId) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.getGomoryHuTree().toBytes();
+        }
+    }
+
+    // Method to query the min cut between two routers of a session graph
+    public int minCutBetween(int graphId, int u, int v) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.minCutBetween(u, v);
+        }
+    }
+
+    // Method to change one edge's capacity on a solved session graph and repair its flow
+    public int updateCapacity(int graphId, int edgeId, int capacity, int source, int sink) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.updateCapacity(edgeId, capacity, source, sink);
+        }
+    }
+
+    // Method to add an edge to a solved session graph and augment along it
+    public int addEdgeIncremental(int graphId, int u, int v, int capacity, int source, int sink) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.addEdgeIncremental(u, v, capacity, source, sink);
+        }
+    }
+
+    // Method to remove an edge from a solved session graph and repair its flow
+    public int removeEdge(int graphId, int edgeId, int source, int sink) {
+        FlowAlgorithm graph = getGraph(graphId);
+        synchronized (graph) {
+            return graph.removeEdge(edgeId, source, sink);
+        }
+    }
+
+    // Method to release a session graph once the client is done with it
+    public void freeGraph(int graphId) {
+        graphs.remove(graphId);
+        longGraphs.remove(graphId);
+    }
+
+    private FlowAlgorithm getGraph(int graphId) {
+        FlowAlgorithm graph = graphs.get(graphId);
+        if (graph == null) {
+            throw new IllegalArgumentException("Unknown graph id: " + graphId);
+        }
+        return graph;
+    }
+
+    private static int[] unpackTriples(byte[] payload) {
+        // FlowAlgorithm.addEdges checks that the payload splits into triples
+        return unpackInts(payload);
+    }
+
+    private static int[] unpackInts(byte[] payload) {
+        IntBuffer buffer = ByteBuffer.wrap(payload).asIntBuffer();
+        int[] values = new int[buffer.remaining()];
+        buffer.get(values);
+        return values;
+    }
+
+    private static long[] unpackLongs(byte[] payload) {
+        LongBuffer buffer = ByteBuffer.wrap(payload).asLongBuffer();
+        long[] values = new long[buffer.remaining()];
+        buffer.get(values);
+        return values;
+    }
+
+    private static double[] unpackDoubles(byte[] payload) {
+        DoubleBuffer buffer = ByteBuffer.wrap(payload).asDoubleBuffer();
+        double[] values = new double[buffer.remaining()];
+        buffer.get(values);
+        return values;
+    }
+
+    private static byte[] packInts(int[] values) {
+        ByteBuffer buffer = ByteBuffer.allocate(values.length * 4);
+        buffer.asIntBuffer().put(values);
+        return buffer.array();
+    }
+
     // Main method to start the Py4J Gateway server
     public static void main(String[] args) {
         FlowAlgorithmEntryPoint entryPoint = new FlowAlgorithmEntryPoint(0);
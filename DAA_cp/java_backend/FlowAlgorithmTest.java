@@ -0,0 +1,147 @@
+import java.util.*;
+
+// Self-checking tests for FlowAlgorithm on random graphs. Exits non-zero on
+// the first failure.
+//
+// Usage: java FlowAlgorithmTest [trials]
+public class FlowAlgorithmTest {
+
+    // Random multigraph with self-loops, parallel links and edges touching the
+    // source (0) and sink (vertexCount - 1), as packed (u, v, capacity) triples
+    static int[] randomGraph(Random random, int vertexCount, int edgeCount) {
+        int[] triples = new int[edgeCount * 3];
+        for (int i = 0; i < triples.length; i += 3) {
+            triples[i] = random.nextInt(vertexCount);
+            triples[i + 1] = random.nextInt(vertexCount);
+            triples[i + 2] = random.nextInt(11);
+        }
+        return triples;
+    }
+
+    static FlowAlgorithm build(int vertexCount, int[] triples) {
+        FlowAlgorithm graph = new FlowAlgorithm(vertexCount);
+        graph.addEdges(triples);
+        return graph;
+    }
+
+    static void check(boolean condition, String message) {
+        if (!condition) {
+            throw new AssertionError(message);
+        }
+    }
+
+    // Every edge within its capacity and flow conserved at every inner vertex
+    static void checkFeasible(FlowAlgorithm graph, int vertexCount, int source, int sink, String context) {
+        int[] triples = graph.edgeTriples();
+        int[] flows = graph.getEdgeFlows();
+        long[] net = new long[vertexCount];
+        for (int i = 0; i < flows.length; i++) {
+            check(flows[i] >= 0 && flows[i] <= triples[3 * i + 2], context + ": edge " + i + " carries "
+                    + flows[i] + " over capacity " + triples[3 * i + 2]);
+            net[triples[3 * i]] -= flows[i];
+            net[triples[3 * i + 1]] += flows[i];
+        }
+        for (int v = 0; v < vertexCount; v++) {
+            check(v == source || v == sink || net[v] == 0, context + ": flow not conserved at " + v);
+        }
+    }
+
+    // updateCapacity, addEdgeIncremental and removeEdge against a fresh
+    // dinicMaxFlow on a graph rebuilt from the current capacities
+    static void testIncremental(Random random, int trials) {
+        for (int trial = 0; trial < trials; trial++) {
+            int vertexCount = 2 + random.nextInt(10);
+            int source = 0;
+            int sink = vertexCount - 1;
+            FlowAlgorithm graph = build(vertexCount, randomGraph(random, vertexCount, random.nextInt(30)));
+            graph.dinicMaxFlow(source, sink);
+
+            for (int step = 0; step < 20; step++) {
+                int edgeCount = graph.edgeTriples().length / 3;
+                int choice = random.nextInt(3);
+                String operation;
+                int flow;
+                if (choice == 0 && edgeCount > 0) {
+                    int edgeId = random.nextInt(edgeCount);
+                    int capacity = random.nextInt(16);
+                    operation = "updateCapacity(" + edgeId + ", " + capacity + ")";
+                    flow = graph.updateCapacity(edgeId, capacity, source, sink);
+                } else if (choice == 1 || edgeCount == 0) {
+                    int u = random.nextInt(vertexCount);
+                    int v = random.nextInt(vertexCount);
+                    int capacity = random.nextInt(11);
+                    operation = "addEdgeIncremental(" + u + ", " + v + ", " + capacity + ")";
+                    flow = graph.addEdgeIncremental(u, v, capacity, source, sink);
+                } else {
+                    int edgeId = random.nextInt(edgeCount);
+                    operation = "removeEdge(" + edgeId + ")";
+                    flow = graph.removeEdge(edgeId, source, sink);
+                }
+
+                String context = "trial " + trial + " step " + step + " " + operation;
+                int expected = new FlowAlgorithm(graph).dinicMaxFlow(source, sink);
+                check(flow == expected, context + ": got " + flow + ", fresh solve gives " + expected);
+                checkFeasible(graph, vertexCount, source, sink, context);
+            }
+        }
+    }
+
+    // Invalid updates are rejected before anything changes
+    static void testIncrementalRejects() {
+        FlowAlgorithm graph = build(3, new int[]{0, 1, 5, 1, 2, 5});
+        graph.dinicMaxFlow(0, 2);
+        int[][] calls = {{-1, 3}, {2, 3}, {0, -1}};
+        for (int[] call : calls) {
+            try {
+                graph.updateCapacity(call[0], call[1], 0, 2);
+                check(false, "updateCapacity(" + call[0] + ", " + call[1] + ") was accepted");
+            } catch (IllegalArgumentException expected) {
+                // rejected as it should be
+            }
+        }
+        try {
+            graph.addEdgeIncremental(0, 3, 1, 0, 2);
+            check(false, "addEdgeIncremental to a missing router was accepted");
+        } catch (IllegalArgumentException expected) {
+            // rejected as it should be
+        }
+        check(Arrays.equals(graph.edgeTriples(), new int[]{0, 1, 5, 1, 2, 5}), "a rejected call changed the edges");
+        check(graph.currentFlow(0) == 5, "a rejected call changed the flow");
+    }
+
+    // Parallel Dinic against dinicMaxFlow across thread counts, repeated so
+    // different interleavings get a chance to disagree. The last graphs have
+    // frontiers wider than one BFS chunk.
+    static void testParallelDinic(Random random, int trials) {
+        int[] threadCounts = {2, 3, 4, 8};
+        for (int trial = 0; trial < trials; trial++) {
+            boolean wide = trial >= trials - 3;
+            int vertexCount = wide ? 3000 + random.nextInt(2000) : 2 + random.nextInt(200);
+            int edgeCount = wide ? 8 * vertexCount : random.nextInt(6 * vertexCount + 1);
+            int[] triples = randomGraph(random, vertexCount, edgeCount);
+            int source = 0;
+            int sink = vertexCount - 1;
+            int expected = build(vertexCount, triples).dinicMaxFlow(source, sink);
+
+            for (int threads : threadCounts) {
+                for (int repeat = 0; repeat < 3; repeat++) {
+                    String context = "trial " + trial + " on " + threads + " threads, run " + repeat;
+                    FlowAlgorithm graph = build(vertexCount, triples);
+                    int flow = graph.parallelDinicMaxFlow(source, sink, threads);
+                    check(flow == expected, context + ": got " + flow + ", dinicMaxFlow gives " + expected);
+                    check(graph.currentFlow(source) == expected, context + ": edge flows do not add up to " + expected);
+                    checkFeasible(graph, vertexCount, source, sink, context);
+                }
+            }
+        }
+    }
+
+    public static void main(String[] args) {
+        int trials = args.length > 0 ? Integer.parseInt(args[0]) : 500;
+        Random random = new Random(42);
+        testIncremental(random, trials);
+        testIncrementalRejects();
+        testParallelDinic(random, Math.max(3, trials / 10));
+        System.out.println("FlowAlgorithmTest: all checks passed");
+    }
+}
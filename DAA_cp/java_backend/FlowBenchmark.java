@@ -0,0 +1,277 @@
+import java.util.*;
+
+// Timing harness for the FlowAlgorithm engines on generated graphs.
+//
+// Usage: java FlowBenchmark [vertexCount ...]
+public class FlowBenchmark {
+
+    private static final int REPEATS = 3;
+
+    // {hubs, spokes, feeders} for hubChainGraph
+    private static final int[][] HUB_CHAINS = {{50, 20, 0}, {50, 20, 500}, {50, 20, 2000}, {100, 20, 2000}};
+
+    // Complete directed graph with random capacities: every router links to
+    // every other one, so each vertex has degree V - 1
+    static int[] denseGraph(int vertexCount, long seed) {
+        Random random = new Random(seed);
+        int[] triples = new int[vertexCount * (vertexCount - 1) * 3];
+        int i = 0;
+        for (int u = 0; u < vertexCount; u++) {
+            for (int v = 0; v < vertexCount; v++) {
+                if (u != v) {
+                    triples[i++] = u;
+                    triples[i++] = v;
+                    triples[i++] = 1 + random.nextInt(100);
+                }
+            }
+        }
+        return triples;
+    }
+
+    // Chain of core routers: between consecutive hubs, spokes routers each
+    // carry one hub -> spoke -> hub route, so every augmenting path runs through
+    // all hubs. Each hub also has feeders incoming-only customer links, which
+    // give it high degree without adding anything BFS can reach. The rescanning
+    // Edmonds-Karp walks each hub's whole adjacency list twice per path.
+    // Vertices: hubs first (source 0, sink hubs - 1), then spokes, then feeders.
+    static int[] hubChainGraph(int hubs, int spokes, int feeders, long seed) {
+        Random random = new Random(seed);
+        int[] triples = new int[((hubs - 1) * spokes * 2 + hubs * feeders) * 3];
+        int i = 0;
+        int next = hubs;
+        for (int hub = 0; hub + 1 < hubs; hub++) {
+            for (int s = 0; s < spokes; s++, next++) {
+                triples[i++] = hub;
+                triples[i++] = next;
+                triples[i++] = 1 + random.nextInt(100);
+                triples[i++] = next;
+                triples[i++] = hub + 1;
+                triples[i++] = 1 + random.nextInt(100);
+            }
+        }
+        for (int hub = 0; hub < hubs; hub++) {
+            for (int f = 0; f < feeders; f++, next++) {
+                triples[i++] = next;
+                triples[i++] = hub;
+                triples[i++] = 1 + random.nextInt(100);
+            }
+        }
+        return triples;
+    }
+
+    static int hubChainVertexCount(int hubs, int spokes, int feeders) {
+        return hubs + (hubs - 1) * spokes + hubs * feeders;
+    }
+
+    // Edmonds-Karp as it was before parent edges were recorded: the path is
+    // rebuilt from parent vertices by scanning each vertex's adjacency list
+    static class ScanningEdmondsKarp {
+        private final List<List<FlowAlgorithm.Edge>> graph = new ArrayList<>();
+
+        ScanningEdmondsKarp(int vertexCount, int[] triples) {
+            for (int i = 0; i < vertexCount; i++) {
+                graph.add(new ArrayList<FlowAlgorithm.Edge>());
+            }
+            for (int i = 0; i < triples.length; i += 3) {
+                FlowAlgorithm.Edge forwardEdge = new FlowAlgorithm.Edge(triples[i + 1], triples[i + 2]);
+                FlowAlgorithm.Edge backwardEdge = new FlowAlgorithm.Edge(triples[i], 0);
+                forwardEdge.reverse = backwardEdge;
+                backwardEdge.reverse = forwardEdge;
+                graph.get(triples[i]).add(forwardEdge);
+                graph.get(triples[i + 1]).add(backwardEdge);
+            }
+        }
+
+        int maxFlow(int source, int sink) {
+            int maxFlow = 0;
+            int[] parent = new int[graph.size()];
+            while (bfs(parent, source, sink)) {
+                int pathFlow = Integer.MAX_VALUE;
+                for (int v = sink; v != source; v = parent[v]) {
+                    for (FlowAlgorithm.Edge edge : graph.get(parent[v])) {
+                        if (edge.to == v && edge.capacity > edge.flow) {
+                            pathFlow = Math.min(pathFlow, edge.capacity - edge.flow);
+                        }
+                    }
+                }
+                for (int v = sink; v != source; v = parent[v]) {
+                    for (FlowAlgorithm.Edge edge : graph.get(parent[v])) {
+                        if (edge.to == v) {
+                            edge.flow += pathFlow;
+                            edge.reverse.flow -= pathFlow;
+                        }
+                    }
+                }
+                maxFlow += pathFlow;
+            }
+            return maxFlow;
+        }
+
+        private boolean bfs(int[] parent, int source, int sink) {
+            boolean[] visited = new boolean[graph.size()];
+            Queue<Integer> queue = new LinkedList<>();
+            queue.add(source);
+            visited[source] = true;
+            while (!queue.isEmpty()) {
+                int u = queue.poll();
+                for (FlowAlgorithm.Edge edge : graph.get(u)) {
+                    if (!visited[edge.to] && edge.capacity > edge.flow) {
+                        queue.add(edge.to);
+                        parent[edge.to] = u;
+                        visited[edge.to] = true;
+                        if (edge.to == sink) {
+                            return true;
+                        }
+                    }
+                }
+            }
+            return false;
+        }
+    }
+
+    // Best-of-REPEATS wall time in milliseconds, building a fresh graph each run
+    static double timeEdmondsKarp(int vertexCount, int[] triples, int source, int sink, boolean scanning,
+                                  int[] flowOut) {
+        long best = Long.MAX_VALUE;
+        for (int run = 0; run < REPEATS; run++) {
+            int flow;
+            long started;
+            if (scanning) {
+                ScanningEdmondsKarp solver = new ScanningEdmondsKarp(vertexCount, triples);
+                started = System.nanoTime();
+                flow = solver.maxFlow(source, sink);
+            } else {
+                FlowAlgorithm solver = new FlowAlgorithm(vertexCount);
+                solver.addEdges(triples);
+                started = System.nanoTime();
+                flow = solver.edmondsKarpMaxFlow(source, sink);
+            }
+            best = Math.min(best, System.nanoTime() - started);
+            flowOut[0] = flow;
+        }
+        return best / 1e6;
+    }
+
+    // Best-of-REPEATS wall time in milliseconds for one of FlowAlgorithm's engines
+    static double timeAlgorithm(int vertexCount, int[] triples, String algorithm, int[] flowOut) {
+        long best = Long.MAX_VALUE;
+        for (int run = 0; run < REPEATS; run++) {
+            FlowAlgorithm solver = new FlowAlgorithm(vertexCount);
+            solver.addEdges(triples);
+            long started = System.nanoTime();
+            switch (algorithm) {
+                case "Dinic":
+                    flowOut[0] = solver.dinicMaxFlow(0, vertexCount - 1);
+                    break;
+                case "Edmonds-Karp":
+                    flowOut[0] = solver.edmondsKarpMaxFlow(0, vertexCount - 1);
+                    break;
+                case "Push-Relabel":
+                    flowOut[0] = solver.pushRelabelMaxFlow(0, vertexCount - 1);
+                    break;
+                case "Parallel Dinic":
+                    flowOut[0] = solver.parallelDinicMaxFlow(0, vertexCount - 1,
+                            Runtime.getRuntime().availableProcessors());
+                    break;
+                default:
+                    throw new IllegalArgumentException("Unknown algorithm: " + algorithm);
+            }
+            best = Math.min(best, System.nanoTime() - started);
+        }
+        return best / 1e6;
+    }
+
+    // Best-of-REPEATS wall time in milliseconds for LongFlowAlgorithm, with every
+    // capacity multiplied by scale so the values no longer fit in an int
+    static double timeLongAlgorithm(int vertexCount, int[] triples, long scale, String algorithm,
+                                    long[] flowOut) {
+        long[] wide = new long[triples.length];
+        for (int i = 0; i < triples.length; i += 3) {
+            wide[i] = triples[i];
+            wide[i + 1] = triples[i + 1];
+            wide[i + 2] = triples[i + 2] * scale;
+        }
+        long best = Long.MAX_VALUE;
+        for (int run = 0; run < REPEATS; run++) {
+            LongFlowAlgorithm solver = new LongFlowAlgorithm(vertexCount, wide);
+            long started = System.nanoTime();
+            flowOut[0] = solver.maxFlow(algorithm, 0, vertexCount - 1);
+            best = Math.min(best, System.nanoTime() - started);
+        }
+        return best / 1e6;
+    }
+
+    public static void main(String[] args) {
+        int[] sizes = {100, 200, 400};
+        if (args.length > 0) {
+            sizes = new int[args.length];
+            for (int i = 0; i < args.length; i++) {
+                sizes[i] = Integer.parseInt(args[i]);
+            }
+        }
+
+        System.out.println("Edmonds-Karp on hub chains (best of " + REPEATS + ")");
+        System.out.printf("%23s %8s %8s %14s %14s %8s%n",
+                "hubs x spokes x feeders", "V", "E", "rescan (ms)", "parent (ms)", "speedup");
+        for (int[] chain : HUB_CHAINS) {
+            int vertexCount = hubChainVertexCount(chain[0], chain[1], chain[2]);
+            int[] triples = hubChainGraph(chain[0], chain[1], chain[2], 42L);
+            int sink = chain[0] - 1;
+            int[] scanningFlow = new int[1];
+            int[] parentFlow = new int[1];
+            double scanningMs = timeEdmondsKarp(vertexCount, triples, 0, sink, true, scanningFlow);
+            double parentMs = timeEdmondsKarp(vertexCount, triples, 0, sink, false, parentFlow);
+            if (scanningFlow[0] != parentFlow[0]) {
+                throw new IllegalStateException("Max flow mismatch: " + scanningFlow[0] + " vs " + parentFlow[0]);
+            }
+            System.out.printf("%23s %8d %8d %14.2f %14.2f %7.2fx%n",
+                    chain[0] + " x " + chain[1] + " x " + chain[2], vertexCount, triples.length / 3,
+                    scanningMs, parentMs, scanningMs / parentMs);
+        }
+
+        String[] algorithms = {"Dinic", "Edmonds-Karp", "Push-Relabel", "Parallel Dinic"};
+        System.out.println();
+        System.out.println("All engines on complete digraphs (best of " + REPEATS + ", ms)");
+        System.out.printf("%8s %10s", "V", "E");
+        for (String algorithm : algorithms) {
+            System.out.printf(" %14s", algorithm);
+        }
+        System.out.println();
+        for (int vertexCount : sizes) {
+            int[] triples = denseGraph(vertexCount, 42L);
+            System.out.printf("%8d %10d", vertexCount, triples.length / 3);
+            int expected = -1;
+            for (String algorithm : algorithms) {
+                int[] flow = new int[1];
+                double ms = timeAlgorithm(vertexCount, triples, algorithm, flow);
+                if (expected >= 0 && flow[0] != expected) {
+                    throw new IllegalStateException(algorithm + " max flow " + flow[0] + " != " + expected);
+                }
+                expected = flow[0];
+                System.out.printf(" %14.2f", ms);
+            }
+            System.out.println();
+        }
+
+        // Capacities in bits per second: 1..100 Gbps links
+        String[] longAlgorithms = {"Dinic", "Edmonds-Karp", "Push-Relabel"};
+        long scale = 1_000_000_000L;
+        System.out.println();
+        System.out.println("int vs 64-bit capacities on complete digraphs (best of " + REPEATS + ", ms)");
+        System.out.printf("%8s %14s %10s %10s%n", "V", "algorithm", "int", "long");
+        for (int vertexCount : sizes) {
+            int[] triples = denseGraph(vertexCount, 42L);
+            for (String algorithm : longAlgorithms) {
+                int[] flow = new int[1];
+                long[] longFlow = new long[1];
+                double intMs = timeAlgorithm(vertexCount, triples, algorithm, flow);
+                double longMs = timeLongAlgorithm(vertexCount, triples, scale, algorithm, longFlow);
+                if (longFlow[0] != flow[0] * scale) {
+                    throw new IllegalStateException(algorithm + " 64-bit max flow " + longFlow[0]
+                            + " != " + flow[0] + " * " + scale);
+                }
+                System.out.printf("%8d %14s %10.2f %10.2f%n", vertexCount, algorithm, intMs, longMs);
+            }
+        }
+    }
+}
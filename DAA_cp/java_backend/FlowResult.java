@@ -0,0 +1,88 @@
+import java.nio.ByteBuffer;
+import java.util.List;
+
+// Outcome of a single solve: max flow, per-edge flows, min cut and optional path trace
+public class FlowResult {
+
+    private final int maxFlow;
+    private final int[] edgeFlows;
+    private final int[] minCut;
+    private final List<int[]> augmentingPaths;
+    private final SolveStats stats;
+
+    public FlowResult(int maxFlow, int[] edgeFlows, int[] minCut, List<int[]> augmentingPaths) {
+        this(maxFlow, edgeFlows, minCut, augmentingPaths, null);
+    }
+
+    public FlowResult(int maxFlow, int[] edgeFlows, int[] minCut, List<int[]> augmentingPaths,
+                      SolveStats stats) {
+        this.maxFlow = maxFlow;
+        this.edgeFlows = edgeFlows;
+        this.minCut = minCut;
+        this.augmentingPaths = augmentingPaths;
+        this.stats = stats;
+    }
+
+    public int getMaxFlow() {
+        return maxFlow;
+    }
+
+    public int[] getEdgeFlows() {
+        return edgeFlows;
+    }
+
+    public int[] getMinCut() {
+        return minCut;
+    }
+
+    public List<int[]> getAugmentingPaths() {
+        return augmentingPaths;
+    }
+
+    public SolveStats getStats() {
+        return stats;
+    }
+
+    // Pack everything into one big-endian int32 payload:
+    // [maxFlow, edgeCount, cutSize, pathCount, edgeFlows..., minCut...,
+    //  then per path: phase, bottleneck, length, vertices...]
+    // When stats were collected the payload continues with statCount and then
+    // statCount big-endian int64 words from SolveStats.toLongs.
+    public byte[] toBytes() {
+        int words = 4 + edgeFlows.length + minCut.length;
+        for (int[] path : augmentingPaths) {
+            words += path.length + 1;
+        }
+        long[] statWords = stats != null ? stats.toLongs() : null;
+        if (statWords != null) {
+            words += 1 + 2 * statWords.length;
+        }
+
+        ByteBuffer buffer = ByteBuffer.allocate(words * 4);
+        buffer.putInt(maxFlow);
+        buffer.putInt(edgeFlows.length);
+        buffer.putInt(minCut.length);
+        buffer.putInt(augmentingPaths.size());
+        for (int flow : edgeFlows) {
+            buffer.putInt(flow);
+        }
+        for (int vertex : minCut) {
+            buffer.putInt(vertex);
+        }
+        for (int[] path : augmentingPaths) {
+            buffer.putInt(path[0]);
+            buffer.putInt(path[1]);
+            buffer.putInt(path.length - 2);
+            for (int i = 2; i < path.length; i++) {
+                buffer.putInt(path[i]);
+            }
+        }
+        if (statWords != null) {
+            buffer.putInt(statWords.length);
+            for (long word : statWords) {
+                buffer.putLong(word);
+            }
+        }
+        return buffer.array();
+    }
+}
@@ -0,0 +1,122 @@
+import java.nio.ByteBuffer;
+import java.util.Arrays;
+
+// Gomory-Hu tree built with Gusfield's algorithm: V - 1 Dinic solves give the
+// min cut between every pair of routers, and the subtree under any tree edge
+// is the router set that cut separates. Links are treated as undirected (a cut
+// has to sever the link whichever way traffic runs); directed cuts have no such tree.
+public class GomoryHuTree {
+
+    // Tree edge i -- parent[i] carries the min cut value between i and its
+    // parent; vertex 0 is the root and has parent -1
+    private final int[] parent;
+    private final int[] weight;
+    private final int[] depth;
+
+    GomoryHuTree(int[] parent, int[] weight) {
+        this.parent = parent;
+        this.weight = weight;
+        depth = new int[parent.length];
+
+        // Parents can have larger ids than their children, so depths come
+        // from a BFS down the tree rather than a pass in id order
+        int n = parent.length;
+        int[] childHead = new int[n];
+        int[] childNext = new int[n];
+        Arrays.fill(childHead, -1);
+        for (int v = 1; v < n; v++) {
+            childNext[v] = childHead[parent[v]];
+            childHead[parent[v]] = v;
+        }
+        int[] queue = new int[n];
+        int head = 0, tail = 0;
+        if (n > 0) {
+            queue[tail++] = 0;
+        }
+        while (head < tail) {
+            int u = queue[head++];
+            for (int v = childHead[u]; v >= 0; v = childNext[v]) {
+                depth[v] = depth[u] + 1;
+                queue[tail++] = v;
+            }
+        }
+    }
+
+    // Build the tree with one Dinic solve per non-root vertex on an undirected copy
+    static GomoryHuTree build(FlowAlgorithm graph, int vertexCount) {
+        int[] triples = graph.edgeTriples();
+        int[] both = new int[triples.length * 2];
+        for (int i = 0; i < triples.length; i += 3) {
+            both[2 * i] = triples[i];
+            both[2 * i + 1] = triples[i + 1];
+            both[2 * i + 2] = triples[i + 2];
+            both[2 * i + 3] = triples[i + 1];
+            both[2 * i + 4] = triples[i];
+            both[2 * i + 5] = triples[i + 2];
+        }
+        FlowAlgorithm undirected = new FlowAlgorithm(vertexCount);
+        undirected.addEdges(both);
+
+        int[] parent = new int[vertexCount];
+        int[] weight = new int[vertexCount];
+        boolean[] sourceSide = new boolean[vertexCount];
+        for (int s = 1; s < vertexCount; s++) {
+            int t = parent[s];
+            undirected.resetFlows();
+            int cut = undirected.dinicMaxFlow(s, t);
+            weight[s] = cut;
+
+            Arrays.fill(sourceSide, false);
+            for (int v : undirected.minCutSourceSide(s)) {
+                sourceSide[v] = true;
+            }
+            for (int v = 0; v < vertexCount; v++) {
+                if (v != s && sourceSide[v] && parent[v] == t) {
+                    parent[v] = s;
+                }
+            }
+            // If t's parent landed on s's side, s takes t's place in the tree
+            if (sourceSide[parent[t]]) {
+                parent[s] = parent[t];
+                parent[t] = s;
+                weight[s] = weight[t];
+                weight[t] = cut;
+            }
+        }
+        if (vertexCount > 0) {
+            parent[0] = -1;
+        }
+        return new GomoryHuTree(parent, weight);
+    }
+
+    // Min cut between two routers: the lightest tree edge on the path between them, O(V)
+    public int minCut(int u, int v) {
+        if (u == v) {
+            throw new IllegalArgumentException("Min cut needs two different routers");
+        }
+        int cut = Integer.MAX_VALUE;
+        while (u != v) {
+            if (depth[u] >= depth[v]) {
+                cut = Math.min(cut, weight[u]);
+                u = parent[u];
+            } else {
+                cut = Math.min(cut, weight[v]);
+                v = parent[v];
+            }
+        }
+        return cut;
+    }
+
+    // Pack as big-endian int32: [vertexCount, parent..., weight...]
+    public byte[] toBytes() {
+        ByteBuffer buffer = ByteBuffer.allocate((1 + 2 * parent.length) * 4);
+        buffer.putInt(parent.length);
+        for (int p : parent) {
+            buffer.putInt(p);
+        }
+        for (int w : weight) {
+            buffer.putInt(w);
+        }
+        return buffer.array();
+    }
+}
@@ -0,0 +1,606 @@
+import java.util.*;
+
+// 64-bit capacity counterpart of FlowAlgorithm, for links measured in bits per
+// second where a single 100 Gbps link already overflows an int. The graph is
+// built once into primitive CSR arrays (no Edge objects, nothing boxed), and
+// FlowAlgorithm keeps its int path untouched for small capacities.
+public class LongFlowAlgorithm {
+
+    private final int vertexCount;
+    private final int edgeCount;
+
+    // Arcs leaving u are offsets[u] .. offsets[u + 1] - 1. Every input edge is a
+    // forward arc plus a zero-capacity reverse arc, and reverse[] pairs them up.
+    private final int[] offsets;
+    private final int[] target;
+    private final int[] reverse;
+    private final long[] capacity;
+    private final long[] residual;
+
+    // Forward arc of every input edge, so flows can be reported per input edge
+    private final int[] edgeArc;
+
+    // Per-arc costs for "Min-Cost Max-Flow"; reverse arcs hold the negated cost
+    private final double[] cost;
+
+    // Augmenting paths recorded by the solvers while tracing is on, else null
+    private List<long[]> augmentingPaths;
+
+    // Counters for the running solve while stats are requested, else null
+    private SolveStats stats;
+
+    // Scratch buffers shared by the solvers
+    private final int[] queue;
+    private final int[] start;
+    private final int[] pathArcs;
+
+    // Constructor accepting the number of vertices and packed (u, v, capacity) triples
+    public LongFlowAlgorithm(int vertexCount, long[] triples) {
+        if (triples.length % 3 != 0) {
+            throw new IllegalArgumentException("Edge payload must hold (u, v, capacity) triples");
+        }
+        this.vertexCount = vertexCount;
+        this.edgeCount = triples.length / 3;
+
+        offsets = new int[vertexCount + 1];
+        for (int i = 0; i < triples.length; i += 3) {
+            offsets[(int) triples[i] + 1]++;
+            offsets[(int) triples[i + 1] + 1]++;
+        }
+        for (int u = 0; u < vertexCount; u++) {
+            offsets[u + 1] += offsets[u];
+        }
+
+        // Filling in input order keeps every adjacency list in insertion order,
+        // the order FlowAlgorithm scans its ArrayList<Edge> lists in
+        int[] next = Arrays.copyOf(offsets, vertexCount);
+        target = new int[2 * edgeCount];
+        reverse = new int[2 * edgeCount];
+        capacity = new long[2 * edgeCount];
+        residual = new long[2 * edgeCount];
+        cost = new double[2 * edgeCount];
+        edgeArc = new int[edgeCount];
+        for (int i = 0; i < edgeCount; i++) {
+            int u = (int) triples[3 * i];
+            int v = (int) triples[3 * i + 1];
+            long linkCapacity = triples[3 * i + 2];
+            if (linkCapacity < 0) {
+                throw new IllegalArgumentException("Capacities must be non-negative");
+            }
+            int forward = next[u]++;
+            int backward = next[v]++;
+            target[forward] = v;
+            target[backward] = u;
+            reverse[forward] = backward;
+            reverse[backward] = forward;
+            capacity[forward] = linkCapacity;
+            residual[forward] = linkCapacity;
+            edgeArc[i] = forward;
+        }
+
+        queue = new int[vertexCount];
+        start = new int[vertexCount];
+        pathArcs = new int[vertexCount];
+    }
+
+    // Per-edge costs in input order, as in FlowAlgorithm.setEdgeCosts
+    public void setEdgeCosts(double[] costs) {
+        if (costs.length != edgeCount) {
+            throw new IllegalArgumentException("Need one cost per edge");
+        }
+        for (int i = 0; i < edgeCount; i++) {
+            if (!(costs[i] >= 0) || Double.isInfinite(costs[i])) {
+                throw new IllegalArgumentException("Edge costs must be finite and non-negative");
+            }
+            cost[edgeArc[i]] = costs[i];
+            cost[reverse[edgeArc[i]]] = -costs[i];
+        }
+    }
+
+    // Clear the flow on every edge so the graph can be solved again
+    public void resetFlows() {
+        System.arraycopy(capacity, 0, residual, 0, residual.length);
+    }
+
+    // Push the bottleneck along the first `length` arcs of pathArcs and return it
+    private long augment(int source, int length, int phase) {
+        long bottleneck = Long.MAX_VALUE;
+        for (int i = 0; i < length; i++) {
+            bottleneck = Math.min(bottleneck, residual[pathArcs[i]]);
+        }
+        for (int i = 0; i < length; i++) {
+            residual[pathArcs[i]] -= bottleneck;
+            residual[reverse[pathArcs[i]]] += bottleneck;
+        }
+        if (stats != null) {
+            stats.augmentingPaths++;
+        }
+        if (augmentingPaths != null) {
+            // Stored as {phase, bottleneck, v0, v1, ..., vk}
+            long[] record = new long[length + 3];
+            record[0] = phase;
+            record[1] = bottleneck;
+            record[2] = source;
+            for (int i = 0; i < length; i++) {
+                record[i + 3] = target[pathArcs[i]];
+            }
+            augmentingPaths.add(record);
+        }
+        return bottleneck;
+    }
+
+    // BFS to build the level graph
+    private boolean bfsDinic(int[] level, int source, int sink) {
+        Arrays.fill(level, -1);
+        level[source] = 0;
+
+        int head = 0, tail = 0;
+        queue[tail++] = source;
+        while (head < tail) {
+            int u = queue[head++];
+            if (stats != null) {
+                stats.edgesScanned += offsets[u + 1] - offsets[u];
+            }
+            for (int arc = offsets[u]; arc < offsets[u + 1]; arc++) {
+                int v = target[arc];
+                if (level[v] < 0 && residual[arc] > 0) {
+                    level[v] = level[u] + 1;
+                    queue[tail++] = v;
+                }
+            }
+        }
+        return level[sink] != -1;
+    }
+
+    // Iterative DFS pushing flow along level-graph paths until the phase is blocked
+    private long blockingFlow(int[] level, int source, int sink, int phase) {
+        long pushed = 0;
+        int depth = 0;
+        int u = source;
+
+        while (true) {
+            if (u == sink) {
+                pushed += augment(source, depth, phase);
+
+                // Resume from the tail of the first saturated arc
+                int saturated = 0;
+                while (residual[pathArcs[saturated]] > 0) {
+                    saturated++;
+                }
+                depth = saturated;
+                u = depth == 0 ? source : target[pathArcs[depth - 1]];
+                continue;
+            }
+
+            int end = offsets[u + 1];
+            int arc = start[u];
+            while (arc < end && (residual[arc] == 0 || level[target[arc]] != level[u] + 1)) {
+                arc++;
+            }
+            if (stats != null) {
+                stats.edgesScanned += arc - start[u] + (arc < end ? 1 : 0);
+            }
+            start[u] = arc;
+
+            if (arc < end) {
+                pathArcs[depth++] = arc;
+                u = target[arc];
+            } else {
+                if (depth == 0) {
+                    return pushed;
+                }
+                // Dead end: retreat and skip the arc that led here
+                if (stats != null) {
+                    stats.deadEnds++;
+                }
+                u = target[reverse[pathArcs[--depth]]];
+                start[u]++;
+            }
+        }
+    }
+
+    // Dinic's max flow method
+    public long dinicMaxFlow(int source, int sink) {
+        if (source == sink) {
+            return 0;
+        }
+
+        int[] level = new int[vertexCount];
+        long maxFlow = 0;
+        int phase = 0;
+        long phaseStarted = stats != null ? System.nanoTime() : 0;
+        while (bfsDinic(level, source, sink)) {
+            System.arraycopy(offsets, 0, start, 0, vertexCount);
+            maxFlow += blockingFlow(level, source, sink, phase++);
+            if (stats != null) {
+                stats.phaseDone(phaseStarted);
+                phaseStarted = System.nanoTime();
+            }
+        }
+        return maxFlow;
+    }
+
+    // BFS for an augmenting path; parentArc[v] is the residual arc used to reach v
+    private boolean bfsEdmondsKarp(int[] parentArc, int source, int sink) {
+        Arrays.fill(parentArc, -1);
+        int head = 0, tail = 0;
+        queue[tail++] = source;
+
+        while (head < tail) {
+            int u = queue[head++];
+            for (int arc = offsets[u]; arc < offsets[u + 1]; arc++) {
+                if (stats != null) {
+                    stats.edgesScanned++;
+                }
+                int v = target[arc];
+                if (v != source && parentArc[v] < 0 && residual[arc] > 0) {
+                    parentArc[v] = arc;
+                    if (v == sink) {
+                        return true;
+                    }
+                    queue[tail++] = v;
+                }
+            }
+        }
+        return false;
+    }
+
+    // Edmonds-Karp max flow method
+    public long edmondsKarpMaxFlow(int source, int sink) {
+        if (source == sink) {
+            return 0;
+        }
+
+        int[] parentArc = new int[vertexCount];
+        long maxFlow = 0;
+        int phase = 0;
+
+        // Every BFS that finds a path is one phase with a single augmentation
+        long phaseStarted = stats != null ? System.nanoTime() : 0;
+        while (bfsEdmondsKarp(parentArc, source, sink)) {
+            int length = 0;
+            for (int v = sink; v != source; v = target[reverse[parentArc[v]]]) {
+                pathArcs[length++] = parentArc[v];
+            }
+            for (int i = 0, j = length - 1; i < j; i++, j--) {
+                int arc = pathArcs[i];
+                pathArcs[i] = pathArcs[j];
+                pathArcs[j] = arc;
+            }
+
+            maxFlow += augment(source, length, phase++);
+            if (stats != null) {
+                stats.phaseDone(phaseStarted);
+                phaseStarted = System.nanoTime();
+            }
+        }
+        return maxFlow;
+    }
+
+    // Dijkstra over residual arcs with reduced costs cost + potential[u] - potential[v].
+    // Entries are {distance, vertex}; stale ones are skipped when popped.
+    private boolean dijkstraMinCost(double[] potential, double[] dist, int[] parentArc, int source, int sink) {
+        Arrays.fill(dist, Double.POSITIVE_INFINITY);
+        Arrays.fill(parentArc, -1);
+        dist[source] = 0;
+
+        PriorityQueue<double[]> heap = new PriorityQueue<>((a, b) -> Double.compare(a[0], b[0]));
+        heap.add(new double[]{0, source});
+        while (!heap.isEmpty()) {
+            double[] entry = heap.poll();
+            int u = (int) entry[1];
+            if (entry[0] > dist[u]) {
+                continue;
+            }
+
+            for (int arc = offsets[u]; arc < offsets[u + 1]; arc++) {
+                if (stats != null) {
+                    stats.edgesScanned++;
+                }
+                int v = target[arc];
+                if (residual[arc] > 0) {
+                    // Rounding can leave a reduced cost a hair below zero
+                    double reduced = Math.max(0, cost[arc] + potential[u] - potential[v]);
+                    if (dist[u] + reduced < dist[v]) {
+                        dist[v] = dist[u] + reduced;
+                        parentArc[v] = arc;
+                        heap.add(new double[]{dist[v], v});
+                    }
+                }
+            }
+        }
+        return dist[sink] < Double.POSITIVE_INFINITY;
+    }
+
+    // Min-cost max flow by successive shortest paths, as FlowAlgorithm.minCostMaxFlow
+    public long minCostMaxFlow(int source, int sink) {
+        if (source == sink) {
+            return 0;
+        }
+
+        double[] potential = new double[vertexCount];
+        double[] dist = new double[vertexCount];
+        int[] parentArc = new int[vertexCount];
+        long maxFlow = 0;
+        int phase = 0;
+
+        long phaseStarted = stats != null ? System.nanoTime() : 0;
+        while (dijkstraMinCost(potential, dist, parentArc, source, sink)) {
+            for (int v = 0; v < vertexCount; v++) {
+                if (dist[v] < Double.POSITIVE_INFINITY) {
+                    potential[v] += dist[v];
+                }
+            }
+
+            int length = 0;
+            for (int v = sink; v != source; v = target[reverse[parentArc[v]]]) {
+                pathArcs[length++] = parentArc[v];
+            }
+            for (int i = 0, j = length - 1; i < j; i++, j--) {
+                int arc = pathArcs[i];
+                pathArcs[i] = pathArcs[j];
+                pathArcs[j] = arc;
+            }
+
+            maxFlow += augment(source, length, phase++);
+            if (stats != null) {
+                stats.phaseDone(phaseStarted);
+                phaseStarted = System.nanoTime();
+            }
+        }
+        return maxFlow;
+    }
+
+    // Push-relabel state: heights, excess and active-vertex buckets by height
+    private int[] height;
+    private long[] excess;
+    private int[] heightCount;
+    private int[] bucketHead;
+    private int[] bucketNext;
+    private boolean[] active;
+    private int highest;
+    private long relabelWork;
+
+    // Exact heights from a reverse residual BFS: distance to the sink, or n plus
+    // the distance back to the source for vertices that can no longer reach the sink
+    private void globalRelabel(int source, int sink) {
+        int n = vertexCount;
+        Arrays.fill(height, 2 * n);
+        height[sink] = 0;
+        height[source] = n;
+
+        // The source BFS only labels vertices the sink BFS could not reach
+        int[] roots = {sink, source};
+        for (int root : roots) {
+            int head = 0, tail = 0;
+            queue[tail++] = root;
+            while (head < tail) {
+                int u = queue[head++];
+                for (int arc = offsets[u]; arc < offsets[u + 1]; arc++) {
+                    int v = target[arc];
+                    if (height[v] == 2 * n && residual[reverse[arc]] > 0) {
+                        height[v] = height[u] + 1;
+                        queue[tail++] = v;
+                    }
+                }
+            }
+        }
+
+        Arrays.fill(heightCount, 0);
+        for (int v = 0; v < n; v++) {
+            heightCount[height[v]]++;
+        }
+        Arrays.fill(bucketHead, -1);
+        Arrays.fill(active, false);
+        System.arraycopy(offsets, 0, start, 0, n);
+        highest = -1;
+        for (int v = 0; v < n; v++) {
+            activate(v, source, sink);
+        }
+        relabelWork = 0;
+    }
+
+    private void activate(int v, int source, int sink) {
+        if (excess[v] > 0 && !active[v] && v != source && v != sink && height[v] < 2 * vertexCount) {
+            active[v] = true;
+            bucketNext[v] = bucketHead[height[v]];
+            bucketHead[height[v]] = v;
+            highest = Math.max(highest, height[v]);
+        }
+    }
+
+    // Gap heuristic: nothing is left at height h, so every vertex between h
+    // and n is cut off from the sink and can be lifted straight above n
+    private void gap(int h) {
+        int n = vertexCount;
+        for (int v = 0; v < n; v++) {
+            if (height[v] > h && height[v] < n) {
+                heightCount[height[v]]--;
+                height[v] = n + 1;
+                heightCount[n + 1]++;
+                start[v] = offsets[v];
+            }
+        }
+    }
+
+    private void relabel(int v) {
+        int oldHeight = height[v];
+        int newHeight = 2 * vertexCount;
+        for (int arc = offsets[v]; arc < offsets[v + 1]; arc++) {
+            if (residual[arc] > 0) {
+                newHeight = Math.min(newHeight, height[target[arc]] + 1);
+            }
+        }
+        relabelWork += offsets[v + 1] - offsets[v] + 12;
+        if (stats != null) {
+            stats.relabels++;
+            stats.edgesScanned += offsets[v + 1] - offsets[v];
+        }
+
+        heightCount[oldHeight]--;
+        height[v] = newHeight;
+        heightCount[newHeight]++;
+        start[v] = offsets[v];
+        if (heightCount[oldHeight] == 0 && oldHeight < vertexCount) {
+            gap(oldHeight);
+        }
+    }
+
+    // Push excess out of v along admissible arcs, relabeling when none are left
+    private void discharge(int v, int source, int sink) {
+        while (excess[v] > 0 && height[v] < 2 * vertexCount) {
+            int arc = start[v];
+            if (arc == offsets[v + 1]) {
+                relabel(v);
+                continue;
+            }
+            int w = target[arc];
+            if (stats != null) {
+                stats.edgesScanned++;
+            }
+            if (residual[arc] > 0 && height[v] == height[w] + 1) {
+                if (stats != null) {
+                    stats.pushes++;
+                }
+                long amount = Math.min(excess[v], residual[arc]);
+                residual[arc] -= amount;
+                residual[reverse[arc]] += amount;
+                excess[v] -= amount;
+                excess[w] += amount;
+                activate(w, source, sink);
+            } else {
+                start[v]++;
+            }
+        }
+    }
+
+    // Highest-label push-relabel max flow method with gap and global relabeling
+    public long pushRelabelMaxFlow(int source, int sink) {
+        if (source == sink) {
+            return 0;
+        }
+
+        int n = vertexCount;
+        height = new int[n];
+        excess = new long[n];
+        heightCount = new int[2 * n + 1];
+        bucketHead = new int[2 * n];
+        bucketNext = new int[n];
+        active = new boolean[n];
+
+        for (int arc = offsets[source]; arc < offsets[source + 1]; arc++) {
+            long amount = residual[arc];
+            if (amount > 0) {
+                residual[arc] = 0;
+                residual[reverse[arc]] += amount;
+                excess[target[arc]] += amount;
+                excess[source] -= amount;
+            }
+        }
+        // Label after the source arcs are saturated so every vertex holding
+        // excess already has a residual route back to the source
+        globalRelabel(source, sink);
+
+        // With stats on, each stretch between global relabels counts as a phase
+        long phaseStarted = stats != null ? System.nanoTime() : 0;
+        long relabelPeriod = 6L * n + edgeCount;
+        while (highest >= 0) {
+            int v = bucketHead[highest];
+            if (v < 0) {
+                highest--;
+                continue;
+            }
+            bucketHead[highest] = bucketNext[v];
+            active[v] = false;
+            if (height[v] != highest) {
+                // Lifted by a gap while queued; requeue at its new height
+                activate(v, source, sink);
+                continue;
+            }
+
+            discharge(v, source, sink);
+            activate(v, source, sink);
+            if (relabelWork > relabelPeriod) {
+                globalRelabel(source, sink);
+                if (stats != null) {
+                    stats.phaseDone(phaseStarted);
+                    phaseStarted = System.nanoTime();
+                }
+            }
+        }
+        if (stats != null) {
+            stats.phaseDone(phaseStarted);
+        }
+
+        return excess[sink];
+    }
+
+    // Run the named algorithm on the current residual graph
+    public long maxFlow(String algorithm, int source, int sink) {
+        switch (algorithm) {
+            case "Dinic":
+            case "Parallel Dinic":
+                // The 64-bit path has no parallel mode; Dinic gives the same max flow
+                return dinicMaxFlow(source, sink);
+            case "Edmonds-Karp":
+                return edmondsKarpMaxFlow(source, sink);
+            case "Push-Relabel":
+                return pushRelabelMaxFlow(source, sink);
+            case "Min-Cost Max-Flow":
+                return minCostMaxFlow(source, sink);
+            default:
+                throw new IllegalArgumentException("Unknown algorithm: " + algorithm);
+        }
+    }
+
+    // Current flow on every edge, in input order
+    public long[] getEdgeFlows() {
+        long[] flows = new long[edgeCount];
+        for (int i = 0; i < edgeCount; i++) {
+            flows[i] = capacity[edgeArc[i]] - residual[edgeArc[i]];
+        }
+        return flows;
+    }
+
+    // Vertices still reachable from the source in the residual graph (source side of the min cut)
+    public int[] minCutSourceSide(int source) {
+        boolean[] visited = new boolean[vertexCount];
+        int head = 0, tail = 0;
+        queue[tail++] = source;
+        visited[source] = true;
+
+        while (head < tail) {
+            int u = queue[head++];
+            for (int arc = offsets[u]; arc < offsets[u + 1]; arc++) {
+                int v = target[arc];
+                if (!visited[v] && residual[arc] > 0) {
+                    visited[v] = true;
+                    queue[tail++] = v;
+                }
+            }
+        }
+
+        int[] sourceSide = Arrays.copyOf(queue, tail);
+        Arrays.sort(sourceSide);
+        return sourceSide;
+    }
+
+    // Run the named algorithm and collect per-edge flows, the min cut and,
+    // when requested, the augmenting paths and solve stats
+    public LongFlowResult solve(String algorithm, int source, int sink, boolean trace, boolean collectStats) {
+        augmentingPaths = trace ? new ArrayList<long[]>() : null;
+        stats = collectStats ? new SolveStats() : null;
+        try {
+            long started = System.nanoTime();
+            long maxFlow = maxFlow(algorithm, source, sink);
+            if (stats != null) {
+                stats.solveNanos = System.nanoTime() - started;
+            }
+            List<long[]> paths = trace ? augmentingPaths : Collections.<long[]>emptyList();
+            return new LongFlowResult(maxFlow, getEdgeFlows(), minCutSourceSide(source), paths, stats);
+        } finally {
+            augmentingPaths = null;
+            stats = null;
+        }
+    }
+}
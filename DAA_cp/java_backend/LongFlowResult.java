@@ -0,0 +1,83 @@
+import java.nio.ByteBuffer;
+import java.util.List;
+
+// Outcome of a LongFlowAlgorithm solve; FlowResult with 64-bit flows
+public class LongFlowResult {
+
+    private final long maxFlow;
+    private final long[] edgeFlows;
+    private final int[] minCut;
+    private final List<long[]> augmentingPaths;
+    private final SolveStats stats;
+
+    public LongFlowResult(long maxFlow, long[] edgeFlows, int[] minCut, List<long[]> augmentingPaths,
+                          SolveStats stats) {
+        this.maxFlow = maxFlow;
+        this.edgeFlows = edgeFlows;
+        this.minCut = minCut;
+        this.augmentingPaths = augmentingPaths;
+        this.stats = stats;
+    }
+
+    public long getMaxFlow() {
+        return maxFlow;
+    }
+
+    public long[] getEdgeFlows() {
+        return edgeFlows;
+    }
+
+    public int[] getMinCut() {
+        return minCut;
+    }
+
+    public List<long[]> getAugmentingPaths() {
+        return augmentingPaths;
+    }
+
+    public SolveStats getStats() {
+        return stats;
+    }
+
+    // Same layout as FlowResult.toBytes, but every word is a big-endian int64:
+    // [maxFlow, edgeCount, cutSize, pathCount, edgeFlows..., minCut...,
+    //  then per path: phase, bottleneck, length, vertices...]
+    // and, when stats were collected, statCount and the SolveStats.toLongs words.
+    public byte[] toBytes() {
+        int words = 4 + edgeFlows.length + minCut.length;
+        for (long[] path : augmentingPaths) {
+            words += path.length + 1;
+        }
+        long[] statWords = stats != null ? stats.toLongs() : null;
+        if (statWords != null) {
+            words += 1 + statWords.length;
+        }
+
+        ByteBuffer buffer = ByteBuffer.allocate(words * 8);
+        buffer.putLong(maxFlow);
+        buffer.putLong(edgeFlows.length);
+        buffer.putLong(minCut.length);
+        buffer.putLong(augmentingPaths.size());
+        for (long flow : edgeFlows) {
+            buffer.putLong(flow);
+        }
+        for (int vertex : minCut) {
+            buffer.putLong(vertex);
+        }
+        for (long[] path : augmentingPaths) {
+            buffer.putLong(path[0]);
+            buffer.putLong(path[1]);
+            buffer.putLong(path.length - 2);
+            for (int i = 2; i < path.length; i++) {
+                buffer.putLong(path[i]);
+            }
+        }
+        if (statWords != null) {
+            buffer.putLong(statWords.length);
+            for (long word : statWords) {
+                buffer.putLong(word);
+            }
+        }
+        return buffer.array();
+    }
+}
@@ -0,0 +1,40 @@
+import java.util.ArrayList;
+import java.util.List;
+
+// Counters collected during one solve when stats are requested; the solvers
+// skip every update while FlowAlgorithm's stats field is null
+public class SolveStats {
+
+    long phases;
+    long augmentingPaths;
+    long edgesScanned;
+    long deadEnds;
+    long pushes;
+    long relabels;
+    long solveNanos;
+    final List<Long> phaseNanos = new ArrayList<>();
+
+    // Close one phase that started at the given System.nanoTime()
+    void phaseDone(long started) {
+        phases++;
+        phaseNanos.add(System.nanoTime() - started);
+    }
+
+    // Packed as longs: [phases, augmentingPaths, edgesScanned, deadEnds,
+    //  pushes, relabels, solveNanos, phaseCount, phaseNanos...]
+    public long[] toLongs() {
+        long[] words = new long[8 + phaseNanos.size()];
+        words[0] = phases;
+        words[1] = augmentingPaths;
+        words[2] = edgesScanned;
+        words[3] = deadEnds;
+        words[4] = pushes;
+        words[5] = relabels;
+        words[6] = solveNanos;
+        words[7] = phaseNanos.size();
+        for (int i = 0; i < phaseNanos.size(); i++) {
+            words[8 + i] = phaseNanos.get(i);
+        }
+        return words;
+    }
+}
@@ -2,18 +2,73 @@ import streamlit as st
 from py4j.java_gateway import JavaGateway
 import os
 import json
+import shutil
 import tempfile
+import time
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from native_flow import (FlowResult, GomoryHuTree, NativeFlowAlgorithm, fits_int32, pack_costs, pack_edges,
+                         pack_edges_long, reduce_topology)
+from gateway_client import GatewayGraph
+from result_cache import ResultCache, canonical_edges, topology_key
+from render_queue import RenderQueue
+from static_renderer import render_flow_network
+from failure_simulator import FailureSimulator
+from topology_validation import link_lengths, normalize_topology
+from topology_format import TOPOLOGY_FILE_TYPES, circle_layout, convert_topology, load_topology
 
-def generate_manim_script(vertices_data, edges_data, source_node, sink_node):
+BACKENDS = ["Java Gateway", "Native (in-process)"]
+ALGORITHMS = ["Dinic", "Edmonds-Karp", "Push-Relabel"]
+# Runs on one worker thread per core, so only the Java backend offers it
+JAVA_ALGORITHMS = ALGORITHMS + ["Parallel Dinic"]
+# Max flow at the lowest total link cost; both backends offer it
+MIN_COST_ALGORITHM = "Min-Cost Max-Flow"
+
+SCENE_NAME = "InternetDataFlowScene"
+
+# Render tiers: manim flags and the output path manim writes under --media_dir.
+# The snapshot is drawn in-process by static_renderer instead of starting manim.
+SNAPSHOT_RENDER_TIER = "Snapshot (PNG)"
+RENDER_TIERS = {
+    "Draft (480p15)": (["-ql"], ["videos", "{module}", "480p15", "{scene}.mp4"]),
+    "Final (1080p60)": (["-qh"], ["videos", "{module}", "1080p60", "{scene}.mp4"]),
+}
+DEFAULT_RENDER_TIER = "Draft (480p15)"
+FINAL_RENDER_TIER = "Final (1080p60)"
+
+# Manim animates every router and link; the static overlay draws the whole
+# network as one image and stays fast on large topologies
+MANIM_VISUALIZATION = "Manim Animation"
+STATIC_VISUALIZATION = "Static Overlay (fast)"
+VISUALIZATIONS = [MANIM_VISUALIZATION, STATIC_VISUALIZATION]
+
+# Topologies come from the JSON text areas or an uploaded file (see topology_format)
+JSON_INPUT = "Paste JSON"
+UPLOAD_INPUT = "Upload File"
+INPUT_MODES = [JSON_INPUT, UPLOAD_INPUT]
+UPLOAD_CHUNK_BYTES = 1 << 20
+
+# Defaults for the Monte-Carlo link-failure panel (see failure_simulator)
+DEFAULT_FAILURE_SCENARIOS = 1000
+DEFAULT_FAILURE_PROBABILITY = 0.05
+# Topologies whose failure-simulation worker pools are kept alive at once
+FAILURE_SIMULATOR_CACHE_SIZE = 4
+
+TIMING_STAGES = ["Preprocess", "Load graph", "Solve call", "Transfer overhead", "Solve", "Decode result", "Render"]
+
+def generate_manim_script(vertices_data, edges_data, source_node, sink_node, edge_flows=None):
+    if edge_flows is None:
+        edge_flows = [0] * len(edges_data)
     return f"""
 from manim import *
 
 config.background_color = BLACK
 
-class InternetDataFlowScene(Scene):
+class {SCENE_NAME}(Scene):
     def construct(self):
         vertices_info = {vertices_data}
         edges_info = {edges_data}
+        flows_info = {edge_flows}
         source = {source_node}
         sink = {sink_node}
         
@@ -39,13 +94,18 @@ class InternetDataFlowScene(Scene):
                 font_size=24
             ).next_to(vertices[i], UP, buff=0.1)
         
+        # Every phase is one grouped play(), so the video length stays flat
+        # as the topology grows instead of adding a second per link
         self.play(
-            *[Create(v) for v in vertices.values()],
-            *[Write(l) for l in vertex_labels.values()],
+            Create(VGroup(*vertices.values()), lag_ratio=0.05),
+            Write(VGroup(*vertex_labels.values())),
             run_time=2
         )
         
-        for u, v, capacity in edges_info:
+        arrows = VGroup()
+        capacity_labels = VGroup()
+        flow_arrows = VGroup()
+        for (u, v, capacity), flow in zip(edges_info, flows_info):
             start = vertices[u].get_center()
             end = vertices[v].get_center()
             arrow = Arrow(
@@ -56,20 +116,30 @@ class InternetDataFlowScene(Scene):
                 stroke_width=2,
                 color=edge_color
             )
+            arrows.add(arrow)
+            if flow > 0:
+                flow_arrows.add(arrow)
             
             mid_point = arrow.get_center()
-            capacity_label = Text(
-                str(capacity),
+            capacity_labels.add(Text(
+                f"{{flow}}/{{capacity}}",
                 color=BLACK,
                 font_size=24
-            ).next_to(mid_point, UP, buff=0.1)
-            
+            ).next_to(mid_point, UP, buff=0.1))
+        
+        if len(arrows) > 0:
             self.play(
-                Create(arrow),
-                Write(capacity_label),
-                run_time=1
+                AnimationGroup(
+                    Create(arrows, lag_ratio=0.1),
+                    FadeIn(capacity_labels),
+                    lag_ratio=0.5
+                ),
+                run_time=2
             )
         
+        if len(flow_arrows) > 0:
+            self.play(flow_arrows.animate.set_color(data_flow_color), run_time=1)
+        
         self.play(
             *[v.animate.scale(1.2) for v in [vertices[source], vertices[sink]]],
             run_time=0.5
@@ -82,44 +152,399 @@ class InternetDataFlowScene(Scene):
         self.wait(1)
 """
 
+@st.cache_resource
+def get_gateway():
+    # One gateway per server process, shared by every session. py4j keeps a
+    # pool of reusable sockets behind it and gives each concurrent call its own.
+    return JavaGateway()
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+@st.cache_resource
+def get_render_queue():
+    # Shared by every session so the number of concurrent manim processes
+    # stays capped at one per CPU for the whole server
+    return RenderQueue()
+
+@st.cache_resource(max_entries=FAILURE_SIMULATOR_CACHE_SIZE)
+def get_failure_simulator(simulation_key, router_count, _edges):
+    # One simulator per topology, shared by every session, so its spawned
+    # worker processes and shared-memory graph outlive a single run. An
+    # evicted simulator shuts its pool down once it is garbage collected.
+    return FailureSimulator(router_count, _edges)
+
+def request_render(result_key, routers, edges, source, sink, edge_flows, tier):
+    # Returns (output_path, None) on a cache hit, else (None, job_id)
+    cache = get_result_cache()
+    flags, output_parts = RENDER_TIERS[tier]
+    video_key = topology_key(result_key, routers, tier)
+    cached_output = cache.get_video(video_key, os.path.splitext(output_parts[-1])[1])
+    if cached_output is not None:
+        return cached_output, None
+    
+    temp_dir = tempfile.mkdtemp()
+    module_name = "internet_packet_flow_visualization"
+    script_path = os.path.join(temp_dir, module_name + ".py")
+    
+    script_content = generate_manim_script(routers, edges, source, sink, edge_flows)
+    
+    with open(script_path, "w") as f:
+        f.write(script_content)
+    
+    # Each job renders into its own media dir so concurrent renders never collide
+    media_dir = os.path.join(temp_dir, "media")
+    cmd = ["manim", *flags, "--media_dir", media_dir, script_path, SCENE_NAME]
+    output_pattern = os.path.join(media_dir, *output_parts).format(module=module_name, scene=SCENE_NAME)
+    job_id = get_render_queue().submit(
+        cmd, output_pattern, on_done=lambda path: cache.put_video(video_key, path)
+    )
+    return None, job_id
+
+# Directory for this session's uploads. It is removed when the session ends
+# and only ever holds the current upload's topology file.
+def upload_dir():
+    if "upload_dir" not in st.session_state:
+        st.session_state["upload_dir"] = tempfile.TemporaryDirectory(prefix="topology-upload-")
+    return st.session_state["upload_dir"].name
+
+# Copies an upload to disk in chunks and converts it to the binary topology
+# format, so the edges are memory-mapped rather than parsed into Python lists
+def load_uploaded_topology(uploaded):
+    upload_key = (uploaded.name, uploaded.size)
+    cached = st.session_state.get("uploaded_topology")
+    if cached is not None and cached[0] == upload_key:
+        return cached[1]
+
+    extension = os.path.splitext(uploaded.name)[1].lower()
+    handle, path = tempfile.mkstemp(suffix=extension, dir=upload_dir())
+    with os.fdopen(handle, "wb") as f:
+        shutil.copyfileobj(uploaded, f, UPLOAD_CHUNK_BYTES)
+    if extension != ".ftop":
+        converted = os.path.splitext(path)[0] + ".ftop"
+        try:
+            convert_topology(path, converted)
+        finally:
+            os.remove(path)
+        path = converted
+
+    topology = load_topology(path)
+    st.session_state["uploaded_topology"] = (upload_key, topology, path)
+    if cached is not None:
+        # Where a mapped file cannot be deleted (Windows) it goes with the directory
+        try:
+            os.remove(cached[2])
+        except OSError:
+            pass
+    return topology
+
+# Whether a solve needs the 64-bit capacity path: some capacity does not fit
+# an int32, or the flow out of the source and into the sink could exceed one
+def needs_long_path(edges, source, sink):
+    if not fits_int32(edges):
+        return True
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+    out_of_source = edges[edges[:, 0] == source, 2].sum()
+    into_sink = edges[edges[:, 1] == sink, 2].sum()
+    return not fits_int32(min(out_of_source, into_sink))
+
+# Gomory-Hu trees only travel as int32 words. A link's capacity counts toward
+# both of its routers and no cut exceeds the capacity around either side, so
+# the tree fits when every router's summed link capacity does.
+def fits_gomory_hu(router_count, edges):
+    if not fits_int32(edges):
+        return False
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+    around = np.zeros(router_count, dtype=np.int64)
+    np.add.at(around, edges[:, 0], edges[:, 2])
+    np.add.at(around, edges[:, 1], edges[:, 2])
+    return fits_int32(around)
+
 class InternetPacketFlowVisualizer:
-    def __init__(self):
-        self.gateway = JavaGateway()
-        self.flow_algorithm = self.gateway.entry_point
+    def __init__(self, backend="Java Gateway"):
+        if backend == "Java Gateway":
+            self.gateway = get_gateway()
+            self.flow_algorithm = GatewayGraph(self.gateway)
+        else:
+            self.gateway = None
+            self.flow_algorithm = NativeFlowAlgorithm()
+        self.cache = get_result_cache()
+        # Wall time in seconds of each stage of the last create_visualization call
+        self.timings = {}
+        # (routers, links) actually solved after preprocessing, when it ran
+        self.reduced_size = None
+        # Total link cost of the last min-cost solve
+        self.total_cost = None
         
-    def create_visualization(self, router_count, source, sink, routers, edges, algorithm):
+    def create_visualization(self, router_count, source, sink, routers, edges, algorithm, trace=False,
+                             tier=DEFAULT_RENDER_TIER, visualization=MANIM_VISUALIZATION, metrics=False,
+                             preprocess=False, costs=None):
         try:
-            self.flow_algorithm.resetGraph(router_count)
-            for u, v, capacity in edges:
-                self.flow_algorithm.addEdge(u, v, capacity)
-            
-            max_flow = (self.flow_algorithm.dinicMaxFlow(source, sink) 
-                        if algorithm == "Dinic" 
-                        else self.flow_algorithm.edmondsKarpMaxFlow(source, sink))
-            
-            st.success(f"Maximum Packet Flow: **{max_flow}* *")
-            
-            temp_dir = tempfile.mkdtemp()
-            script_path = os.path.join(temp_dir, "internet_packet_flow_visualization.py")
-            
-            script_content = generate_manim_script(routers, edges, source, sink)
-            
-            with open(script_path, "w") as f:
-                f.write(script_content)
-            
-            cmd = f"manim -pqh {script_path} InternetPacketFlowScene"
-            os.system(cmd)
-            
-            video_path = os.path.join(temp_dir, "media/videos/1080p60/InternetPacketFlowScene.mp4")
-            if os.path.exists(video_path):
-                with open(video_path, "rb") as f:
-                    return f.read(), max_flow
+            self.timings = {}
+            self.reduced_size = None
+            self.total_cost = None
+            # Traced paths must use the routers as given, and merged links
+            # would lose their costs, so those solves skip preprocessing
+            min_cost = algorithm == MIN_COST_ALGORITHM
+            preprocess = preprocess and not trace and not min_cost
+            # Solve on the canonical edge order so the cached flows line up
+            # with any ordering of the same topology
+            canonical, rank = canonical_edges(edges)
+            canonical_costs = None
+            if min_cost:
+                # Links cost their length unless costs are given
+                costs = link_lengths(routers, edges) if costs is None else np.asarray(costs, dtype=np.float64)
+                canonical_costs = np.empty_like(costs)
+                canonical_costs[rank] = costs
+            result_key = topology_key(router_count, source, sink, canonical, algorithm, trace, metrics,
+                                      preprocess, canonical_costs)
+            wide = needs_long_path(canonical, source, sink)
+            payload = self.cache.get_result(result_key)
+            if payload is None:
+                solve_size, solve_edges, solve_source, solve_sink = router_count, canonical, source, sink
+                if preprocess:
+                    started = time.perf_counter()
+                    reduction = reduce_topology(router_count, canonical, source, sink)
+                    solve_size, solve_edges = reduction.vertex_count, reduction.edges
+                    solve_source, solve_sink = reduction.source, reduction.sink
+                    self.reduced_size = (solve_size, len(solve_edges))
+                    self.timings["Preprocess"] = time.perf_counter() - started
+                
+                started = time.perf_counter()
+                if wide:
+                    self.flow_algorithm.loadGraphLong(solve_size, pack_edges_long(solve_edges))
+                else:
+                    self.flow_algorithm.loadGraph(solve_size, pack_edges(solve_edges))
+                if min_cost:
+                    self.flow_algorithm.setEdgeCosts(pack_costs(canonical_costs))
+                loaded = time.perf_counter()
+                try:
+                    solve = self.flow_algorithm.solveLong if wide else self.flow_algorithm.solve
+                    payload = solve(algorithm, solve_source, solve_sink, trace, metrics)
+                finally:
+                    self.flow_algorithm.close()
+                self.timings["Load graph"] = loaded - started
+                self.timings["Solve call"] = time.perf_counter() - loaded
+                
+                if preprocess:
+                    # Cached in terms of the input edges, like an unreduced solve
+                    started = time.perf_counter()
+                    reduced = FlowResult.from_bytes(payload, wide)
+                    edge_flows = reduction.expand_flows(reduced.edge_flows)
+                    payload = FlowResult(reduced.max_flow, edge_flows, reduction.min_cut_source_side(edge_flows),
+                                         stats=reduced.stats).to_bytes(wide)
+                    self.timings["Preprocess"] += time.perf_counter() - started
+                self.cache.put_result(result_key, payload)
+            started = time.perf_counter()
+            result = FlowResult.from_bytes(payload, wide)
+            result.edge_flows = result.edge_flows[rank]
+            self.timings["Decode result"] = time.perf_counter() - started
+            if min_cost:
+                self.total_cost = float(result.edge_flows @ costs)
             
-            raise Exception("Animation generation failed")
+            render_request = (result_key, routers, edges, source, sink, result.edge_flows.tolist())
+            if visualization == STATIC_VISUALIZATION or tier == SNAPSHOT_RENDER_TIER:
+                started = time.perf_counter()
+                image = render_flow_network(routers, edges, result.edge_flows, source, sink, result.min_cut)
+                self.timings["Render"] = time.perf_counter() - started
+                return result, render_request, image, None
+            output_path, job_id = request_render(*render_request, tier)
+            return result, render_request, output_path, job_id
                 
         except Exception as e:
             raise Exception(f"Visualization error: {str(e)}")
 
+    # All-pairs min cuts of the topology as a Gomory-Hu tree, cached like solve results
+    def gomory_hu_tree(self, router_count, edges):
+        canonical, _ = canonical_edges(edges)
+        tree_key = topology_key(router_count, canonical, "Gomory-Hu")
+        payload = self.cache.get_result(tree_key)
+        if payload is None:
+            if not fits_gomory_hu(router_count, canonical):
+                raise ValueError("Weakest cuts are not supported for 64-bit capacities; "
+                                 "some cut could exceed 2^31 - 1")
+            self.flow_algorithm.loadGraph(router_count, pack_edges(canonical))
+            try:
+                payload = self.flow_algorithm.gomoryHuTree()
+            finally:
+                self.flow_algorithm.close()
+            self.cache.put_result(tree_key, payload)
+        return GomoryHuTree.from_bytes(payload)
+
+
+def show_flow_result(result):
+    st.success(f"Maximum Packet Flow: **{result.max_flow}**")
+    st.write(f"Min-cut source side: {result.min_cut.tolist()}")
+    
+    if result.augmenting_paths:
+        st.table([
+            {"Phase": phase, "Bottleneck": bottleneck,
+             "Path": " → ".join(map(str, vertices))}
+            for phase, bottleneck, vertices in result.augmenting_paths
+        ])
+
+def show_timing_breakdown(result, timings):
+    # The solve call covers the py4j round-trip too; the solver's own clock
+    # splits it into solve time and transfer overhead
+    stages = dict(timings)
+    if result.stats is not None and "Solve call" in stages:
+        solve = result.stats.solve_ns / 1e9
+        stages["Transfer overhead"] = max(0.0, stages.pop("Solve call") - solve)
+        stages["Solve"] = solve
+    
+    with st.expander("Timing breakdown", expanded=True):
+        if "Load graph" not in stages:
+            st.caption("Result served from cache; the solver did not run.")
+        st.table([{"Stage": stage, "Time (ms)": round(stages[stage] * 1000, 2)}
+                  for stage in TIMING_STAGES if stage in stages])
+        
+        stats = result.stats
+        if stats is not None:
+            columns = st.columns(3)
+            columns[0].metric("BFS phases", stats.phases)
+            columns[1].metric("Augmenting paths", stats.augmenting_paths)
+            columns[2].metric("Edges scanned", stats.edges_scanned)
+            columns = st.columns(3)
+            columns[0].metric("DFS dead ends", stats.dead_ends)
+            columns[1].metric("Pushes", stats.pushes)
+            columns[2].metric("Relabels", stats.relabels)
+            if stats.phase_ns:
+                st.caption("Wall time per phase (ms)")
+                st.bar_chart([ns / 1e6 for ns in stats.phase_ns])
+
+def show_weakest_cuts():
+    backend, router_count, routers, edges = st.session_state["topology"]
+    edge_flows = st.session_state["render_request"][5]
+    
+    with st.expander("Resilience: weakest cuts"):
+        count = st.number_input("Cuts to list", min_value=1, value=5)
+        if st.button("Compute all-pairs min cuts"):
+            with st.spinner("Building Gomory-Hu tree..."):
+                try:
+                    tree = InternetPacketFlowVisualizer(backend).gomory_hu_tree(router_count, edges)
+                    st.session_state["cut_tree"] = tree
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+        
+        tree = st.session_state.get("cut_tree")
+        if tree is None:
+            return
+        cuts = tree.weakest_cuts(count)
+        st.table([
+            {"Between": f"{u} ↔ {v}", "Min cut": value, "Isolated routers": ", ".join(map(str, side))}
+            for u, v, value, side in cuts
+        ])
+        
+        if cuts:
+            # Links are counted both ways here, so the overlay marks every link crossing the cut
+            index = st.selectbox("Show cut", range(len(cuts)),
+                                 format_func=lambda i: f"{cuts[i][0]} ↔ {cuts[i][1]} ({cuts[i][2]})")
+            u, v, _, side = cuts[index]
+            st.image(render_flow_network(routers, edges, edge_flows, u, v, side, undirected_cut=True))
+        
+        col1, col2 = st.columns(2)
+        a = col1.number_input("Router A", min_value=0, max_value=router_count - 1, value=0)
+        b = col2.number_input("Router B", min_value=0, max_value=router_count - 1, value=router_count - 1)
+        if a != b:
+            st.write(f"Min cut between {a} and {b}: **{tree.min_cut(a, b)}**")
+
+def show_failure_simulation():
+    _, router_count, routers, edges = st.session_state["topology"]
+    source, sink = st.session_state["render_request"][3:5]
+    
+    with st.expander("Resilience: link-failure simulation"):
+        col1, col2 = st.columns(2)
+        scenarios = col1.number_input("Scenarios", min_value=1, value=DEFAULT_FAILURE_SCENARIOS)
+        probability = col2.number_input("Link failure probability", min_value=0.0, max_value=1.0,
+                                        value=DEFAULT_FAILURE_PROBABILITY, step=0.01)
+        algorithm = st.selectbox("Solver", ALGORITHMS, key="failure_algorithm")
+        st.caption("Scenarios are always solved by the native in-process solvers on a local process "
+                   "pool, whichever compute backend is selected.")
+        if not st.button("Run failure simulation"):
+            return
+        
+        # Placeholders are redrawn as every batch of scenarios comes back
+        progress = st.progress(0.0)
+        summary = st.empty()
+        chart = st.empty()
+        links = st.empty()
+        try:
+            edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+            simulator = get_failure_simulator(topology_key(router_count, edges), router_count, edges)
+            for stats in simulator.run(source, sink, scenarios, probability, algorithm):
+                progress.progress(stats.completed / stats.scenarios,
+                                  text=f"{stats.completed} / {stats.scenarios} scenarios")
+                percentiles = stats.percentiles()
+                summary.markdown(
+                    f"Failure-free flow **{stats.baseline}**, mean under failures **{stats.mean():.1f}**, "
+                    f"full flow kept in **{stats.availability():.1%}** of scenarios  \n"
+                    + " · ".join(f"p{p}: {value:g}" for p, value in percentiles.items()))
+                values, counts = stats.distribution()
+                chart.bar_chart({"Max flow": values, "Scenarios": counts}, x="Max flow", y="Scenarios")
+                links.table([
+                    {"Link": f"{u} → {v}", "Capacity": capacity, "Times failed": failed,
+                     "Mean flow lost": round(loss, 2)}
+                    for _, u, v, capacity, failed, loss in stats.critical_links()
+                ])
+        except BrokenProcessPool:
+            # A worker died and the pool cannot be reused; start fresh ones next run
+            get_failure_simulator.clear()
+            st.error("A simulation worker crashed; run the simulation again")
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+
+def show_render_status():
+    output_path = st.session_state.get("render_output")
+    job_id = st.session_state.get("render_job")
+    if output_path is None and job_id is not None:
+        job = get_render_queue().status(job_id)
+        if job is None:
+            st.session_state.pop("render_job")
+        elif job.state == "done":
+            output_path = st.session_state["render_output"] = job.output_path
+            if st.session_state.get("timings") is not None:
+                st.session_state["timings"]["Render"] = job.finished_at - job.started_at
+        elif job.state == "failed":
+            st.error(f"Visualization error: {job.error}")
+            st.session_state.pop("render_job")
+        else:
+            # Keep polling the queue; the page stays responsive in between
+            st.info(f"Rendering {st.session_state['render_tier']}… ({job.state})")
+            time.sleep(1)
+            st.rerun()
+    
+    if output_path is None:
+        return
+    if isinstance(output_path, bytes):
+        # Static overlay or snapshot, already rendered in-process
+        st.image(output_path)
+        if st.session_state.get("render_tier") != SNAPSHOT_RENDER_TIER:
+            return
+    else:
+        try:
+            with open(output_path, "rb") as f:
+                video = f.read()
+        except FileNotFoundError:
+            # Evicted from the result cache since it was rendered; render it again
+            output_path, job_id = request_render(*st.session_state["render_request"],
+                                                 st.session_state["render_tier"])
+            st.session_state["render_output"] = output_path
+            st.session_state["render_job"] = job_id
+            st.rerun()
+        st.video(video)
+    
+    # Drafts and snapshots are for exploring; the expensive render runs only on request
+    if st.session_state.get("render_tier") != FINAL_RENDER_TIER:
+        if st.button(f"Render {FINAL_RENDER_TIER}"):
+            output_path, job_id = request_render(*st.session_state["render_request"], FINAL_RENDER_TIER)
+            st.session_state["render_tier"] = FINAL_RENDER_TIER
+            st.session_state["render_output"] = output_path
+            st.session_state["render_job"] = job_id
+            if st.session_state.get("timings") is not None:
+                st.session_state["timings"].pop("Render", None)
+            st.rerun()
+
 
 def main():
     st.set_page_config(page_title="Internet Packet Flow Simulator", layout="centered", page_icon="🌐")
@@ -133,40 +558,111 @@ def main():
         col1, col2 = st.columns([1, 2])
         
         with col1:
-            router_count = st.number_input("Number of Routers", min_value=2, value=6)
-            source = st.number_input("Source Router", min_value=0)
-            sink = st.number_input("Sink Router", min_value=0)
+            router_count = st.number_input("Number of Routers", min_value=2, value=4)
+            source = st.number_input("Source Router", min_value=0, value=0)
+            sink = st.number_input("Sink Router", min_value=0, value=3)
             
-            algorithm = st.selectbox("Routing Algorithm", ["Dinic", "Edmonds-Karp"])
+            backend = st.selectbox("Compute Backend", BACKENDS)
+            algorithm = st.selectbox("Routing Algorithm",
+                                     (JAVA_ALGORITHMS if backend == "Java Gateway" else ALGORITHMS)
+                                     + [MIN_COST_ALGORITHM])
+            trace = st.checkbox("Record augmenting paths")
+            visualization = st.selectbox("Visualization", VISUALIZATIONS)
+            metrics = st.checkbox("Collect solver metrics")
+            preprocess = st.checkbox("Preprocess topology", value=True,
+                                     help="Drop routers on no source-sink path, contract chains of "
+                                          "transit routers and merge parallel links before solving")
+            tier = st.selectbox("Render Quality", [SNAPSHOT_RENDER_TIER] + list(RENDER_TIERS),
+                                index=1 + list(RENDER_TIERS).index(DEFAULT_RENDER_TIER))
             
-            routers_input = st.text_area("Router Coordinates", value='[[-3, 1], [-1, 2], [1, 2], [3, 1]]')
-            edges_input = st.text_area("Connections (Edges)", value='[[0, 1, 10], [1, 2, 15]]')
+            input_mode = st.radio("Topology Input", INPUT_MODES, horizontal=True)
+            if input_mode == UPLOAD_INPUT:
+                uploaded = st.file_uploader("Topology File", type=TOPOLOGY_FILE_TYPES,
+                                            help="A .ftop file, JSON with routers, edges and costs, "
+                                                 "CSV or a whitespace-separated edge list with an "
+                                                 "optional fourth cost column")
+            else:
+                routers_input = st.text_area("Router Coordinates", value='[[-3, 1], [-1, 2], [1, 2], [3, 1]]')
+                edges_input = st.text_area("Connections (Edges)", value='[[0, 1, 10], [1, 2, 15], [0, 2, 5], [2, 3, 12]]')
+                costs_input = st.text_area("Link Costs", value="",
+                                           help="One cost per connection (e.g. latency) for "
+                                                f"{MIN_COST_ALGORITHM}; leave empty to use link lengths")
         
         with col2:
             st.markdown("### Packet Flow Visualization")
             
             if st.button("Simulate Packet Flow"):
                 try:
-                    routers = json.loads(routers_input)
-                    edges = json.loads(edges_input)
+                    if input_mode == UPLOAD_INPUT:
+                        if uploaded is None:
+                            raise ValueError("Upload a topology file first.")
+                        topology = load_uploaded_topology(uploaded)
+                        router_count = topology.vertex_count
+                        routers = topology.routers if topology.routers is not None else circle_layout(router_count)
+                        edges = topology.edges
+                        costs = topology.costs if algorithm == MIN_COST_ALGORITHM else None
+                        if algorithm == MIN_COST_ALGORITHM and costs is None and topology.routers is None:
+                            # Circle positions are made up, so their link lengths are no cost
+                            costs = np.ones(len(edges))
+                            st.info("The file has no link costs or router coordinates, so every link costs 1.")
+                    else:
+                        routers = json.loads(routers_input)
+                        edges = json.loads(edges_input)
+                        costs = json.loads(costs_input) if costs_input.strip() else None
+                    
+                    routers, edges, costs, warnings = normalize_topology(router_count, routers, edges, source,
+                                                                         sink, costs)
+                    for warning in warnings:
+                        st.warning(warning)
+                    if visualization == MANIM_VISUALIZATION:
+                        # The manim script embeds the topology as literals
+                        routers, edges = routers.tolist(), edges.tolist()
                     
-                    with st.spinner("Generating animation..."):
-                        visualizer = InternetPacketFlowVisualizer()
-                        video_bytes, max_flow = visualizer.create_visualization(
+                    with st.spinner("Computing packet flow..."):
+                        visualizer = InternetPacketFlowVisualizer(backend)
+                        result, render_request, output_path, job_id = visualizer.create_visualization(
                             router_count,
                             source,
                             sink,
                             routers,
                             edges,
-                            algorithm
+                            algorithm,
+                            trace,
+                            tier,
+                            visualization,
+                            metrics,
+                            preprocess,
+                            costs
                         )
                         
-                        st.video(video_bytes)
+                        st.session_state["flow_result"] = result
+                        st.session_state["render_request"] = render_request
+                        st.session_state["render_tier"] = tier
+                        st.session_state["render_output"] = output_path
+                        st.session_state["render_job"] = job_id
+                        st.session_state["timings"] = visualizer.timings if metrics else None
+                        st.session_state["reduced_size"] = visualizer.reduced_size
+                        st.session_state["total_cost"] = visualizer.total_cost
+                        st.session_state["topology"] = (backend, router_count, routers, edges)
+                        st.session_state.pop("cut_tree", None)
                         
                 except json.JSONDecodeError:
                     st.error("Invalid JSON format in input fields.")
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
+            
+            if "flow_result" in st.session_state:
+                show_flow_result(st.session_state["flow_result"])
+                if st.session_state.get("total_cost") is not None:
+                    st.write(f"Total link cost: **{st.session_state['total_cost']:.6g}**")
+                if st.session_state.get("reduced_size") is not None:
+                    st.caption("Solved on %d routers and %d links after preprocessing"
+                               % st.session_state["reduced_size"])
+                show_render_status()
+                if st.session_state.get("timings") is not None:
+                    show_timing_breakdown(st.session_state["flow_result"], st.session_state["timings"])
+                show_weakest_cuts()
+                show_failure_simulation()
     
     with tab2:
         st.header("Example Packet Flows")
@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from native_flow import SOLVERS, CSRGraph
+
+# Scenarios handed to a worker per task; results stream back once per task
+SCENARIOS_PER_TASK = 32
+PERCENTILES = (5, 25, 50, 75, 95)
+CRITICAL_LINK_LIMIT = 10
+
+# The shared topology as seen from inside a worker process, set up once by _attach
+_shared = {}
+
+
+# Views of the five CSR arrays packed back to back in one int64 buffer
+def _split(words, vertex_count, edge_count):
+    sizes = [vertex_count + 1, 2 * edge_count, 2 * edge_count, 2 * edge_count, edge_count]
+    return np.split(words, np.cumsum(sizes)[:-1])
+
+
+def _attach(block_name, vertex_count, edge_count):
+    block = shared_memory.SharedMemory(name=block_name)
+    words = np.ndarray((vertex_count + 7 * edge_count + 1,), dtype=np.int64, buffer=block.buf)
+    offsets, targets, reverse, capacities, edge_arcs = _split(words, vertex_count, edge_count)
+    _shared["block"] = block
+    _shared["capacities"] = capacities
+    _shared["graph"] = CSRGraph.from_arrays(vertex_count, offsets, targets, reverse, capacities.copy(),
+                                            edge_arcs)
+
+
+# Solves scenarios first .. first + count - 1. Each scenario fails every link
+# independently with the given probability, drawn from its own seed so the
+# results do not depend on how scenarios are split across workers.
+def _run_scenarios(first, count, seed, failure_probability, algorithm, source, sink, baseline):
+    graph = _shared["graph"]
+    capacities = _shared["capacities"]
+    solver = SOLVERS[algorithm]
+
+    flows = np.empty(count, dtype=np.int64)
+    failures = np.zeros(graph.edge_count, dtype=np.int64)
+    loss = np.zeros(graph.edge_count, dtype=np.int64)
+    for i in range(count):
+        rng = np.random.default_rng([seed, first + i])
+        failed = np.flatnonzero(rng.random(graph.edge_count) < failure_probability)
+
+        # Failed links are masked to zero capacity; the topology is never rebuilt
+        np.copyto(graph.capacities, capacities)
+        graph.capacities[graph.edge_arcs[failed]] = 0
+        graph.reset_flows()
+        flows[i] = solver(graph, source, sink)
+
+        failures[failed] += 1
+        loss[failed] += baseline - flows[i]
+    return first, flows, failures, loss
+
+
+def _release(executor, block):
+    executor.shutdown(wait=False, cancel_futures=True)
+    block.close()
+    block.unlink()
+
+
+class FailureStats:
+    # Running aggregate of a simulation; updated as every task finishes
+    def __init__(self, baseline, scenarios, edges):
+        self.baseline = baseline
+        self.scenarios = scenarios
+        self.edges = edges
+        self.completed = 0
+        self.flows = np.zeros(scenarios, dtype=np.int64)
+        self.done = np.zeros(scenarios, dtype=bool)
+        self.failures = np.zeros(len(edges), dtype=np.int64)
+        self.loss = np.zeros(len(edges), dtype=np.int64)
+
+    def add(self, first, flows, failures, loss):
+        self.flows[first:first + len(flows)] = flows
+        self.done[first:first + len(flows)] = True
+        self.completed += len(flows)
+        self.failures += failures
+        self.loss += loss
+
+    def completed_flows(self):
+        return self.flows[self.done]
+
+    def mean(self):
+        return float(self.completed_flows().mean()) if self.completed else 0.0
+
+    def percentiles(self):
+        if not self.completed:
+            return {p: 0.0 for p in PERCENTILES}
+        return dict(zip(PERCENTILES, np.percentile(self.completed_flows(), PERCENTILES).tolist()))
+
+    # Share of scenarios that still carried the full failure-free flow
+    def availability(self):
+        return float((self.completed_flows() == self.baseline).mean()) if self.completed else 0.0
+
+    # Number of scenarios that ended at each max flow value
+    def distribution(self):
+        values, counts = np.unique(self.completed_flows(), return_counts=True)
+        return values, counts
+
+    # Links whose failure cost the most flow on average, as
+    # (edge id, u, v, capacity, times failed, mean flow lost when failed)
+    def critical_links(self, limit=CRITICAL_LINK_LIMIT):
+        failed = np.flatnonzero(self.failures)
+        mean_loss = self.loss[failed] / self.failures[failed]
+        order = failed[np.argsort(-mean_loss, kind="stable")][:limit]
+        return [(int(edge), *map(int, self.edges[edge]), int(self.failures[edge]),
+                 float(self.loss[edge] / self.failures[edge])) for edge in order]
+
+
+class FailureSimulator:
+    # Monte-Carlo link-failure runs over one topology on a process pool. The CSR
+    # arrays are written once into a shared memory block that every worker maps
+    # on startup, so each task only ships a scenario range, never the graph.
+    def __init__(self, vertex_count, edges, max_workers=None):
+        self.vertex_count = vertex_count
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        graph = CSRGraph.from_edges(vertex_count, self.edges)
+        words = np.concatenate([graph.offsets, graph.targets, graph.reverse, graph.capacities,
+                                graph.edge_arcs]).astype(np.int64)
+        self.block = shared_memory.SharedMemory(create=True, size=words.nbytes)
+        np.ndarray(words.shape, dtype=np.int64, buffer=self.block.buf)[:] = words
+        # Spawned rather than forked, since the app's process is running server threads
+        context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(self.max_workers, mp_context=context, initializer=_attach,
+                                            initargs=(self.block.name, vertex_count, len(self.edges)))
+        # Also released when the simulator is dropped without close(), e.g.
+        # evicted from a cache, or at interpreter exit
+        self._finalizer = weakref.finalize(self, _release, self.executor, self.block)
+
+    # Yields the running FailureStats every time a batch of scenarios finishes
+    def run(self, source, sink, scenarios, failure_probability, algorithm="Dinic", seed=0):
+        if algorithm not in SOLVERS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        baseline = SOLVERS[algorithm](CSRGraph.from_edges(self.vertex_count, self.edges), source, sink)
+        stats = FailureStats(baseline, scenarios, self.edges)
+
+        futures = [
+            self.executor.submit(_run_scenarios, first, min(SCENARIOS_PER_TASK, scenarios - first), seed,
+                                 failure_probability, algorithm, source, sink, baseline)
+            for first in range(0, scenarios, SCENARIOS_PER_TASK)
+        ]
+        try:
+            for future in as_completed(futures):
+                stats.add(*future.result())
+                yield stats
+        finally:
+            # Stopping early drops whatever has not started yet
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
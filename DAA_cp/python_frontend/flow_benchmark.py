@@ -0,0 +1,334 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from gateway_client import GatewayGraph
+from native_flow import PATH, SOLVERS, TRACERS, CSRGraph, pack_edges
+
+# Benchmarks the flow engines on generated router topologies and writes the
+# measurements as CSV and JSON plus a plot of time against edge count.
+#
+# Usage: python flow_benchmark.py [--sizes 100 400 1600] [--java] [--baseline old.json]
+
+REPEATS = 3
+
+# A row is a regression when it runs this much slower than in the baseline
+REGRESSION_RATIO = 1.5
+
+# Timings below this are mostly noise and never count as regressions
+REGRESSION_MIN_MS = 1.0
+
+# Gateway method for each algorithm, as in FlowAlgorithmEntryPoint
+GATEWAY_METHODS = {
+    "Dinic": "dinicMaxFlow",
+    "Edmonds-Karp": "edmondsKarpMaxFlow",
+    "Push-Relabel": "pushRelabelMaxFlow",
+}
+
+# Only the max-flow engines are compared; min-cost max-flow needs link costs
+# the generated topologies do not have, and solves a different problem
+ALGORITHMS = list(GATEWAY_METHODS)
+
+
+# Every generator returns (vertex_count, edges, source, sink) where edges is
+# an (E, 3) array of (u, v, capacity) rows
+
+def grid_topology(size, rng):
+    # Square mesh of routers linked both ways to their right and lower neighbours
+    side = max(2, int(np.ceil(np.sqrt(size))))
+    ids = np.arange(side * side).reshape(side, side)
+    pairs = np.concatenate([
+        np.column_stack([ids[:, :-1].ravel(), ids[:, 1:].ravel()]),
+        np.column_stack([ids[:-1, :].ravel(), ids[1:, :].ravel()]),
+    ])
+    pairs = np.concatenate([pairs, pairs[:, ::-1]])
+    capacities = rng.integers(1, 101, len(pairs))
+    return side * side, np.column_stack([pairs, capacities]), 0, side * side - 1
+
+
+def layered_topology(size, rng):
+    # Source, about sqrt(size) layers of sqrt(size) routers, sink; every router
+    # links to three random routers of the next layer
+    width = max(2, int(np.sqrt(size)))
+    layers = max(2, size // width)
+    vertex_count = layers * width + 2
+    source, sink = 0, vertex_count - 1
+    first = np.arange(1, width + 1)
+    edges = [np.column_stack([np.full(width, source), first, np.full(width, 1000)])]
+    for layer in range(layers - 1):
+        tails = np.repeat(1 + layer * width + np.arange(width), 3)
+        heads = 1 + (layer + 1) * width + rng.integers(0, width, len(tails))
+        edges.append(np.column_stack([tails, heads, rng.integers(1, 101, len(tails))]))
+    last = 1 + (layers - 1) * width + np.arange(width)
+    edges.append(np.column_stack([last, np.full(width, sink), np.full(width, 1000)]))
+    return vertex_count, np.concatenate(edges), source, sink
+
+
+def geometric_topology(size, rng):
+    # Routers scattered in the unit square, linked both ways when close enough
+    # to average about eight neighbours; nearer links get more capacity
+    points = rng.random((size, 2))
+    radius = np.sqrt(8.0 / (np.pi * size))
+    tails, heads = [], []
+    for start in range(0, size, 512):
+        block = points[start:start + 512]
+        distance = np.linalg.norm(block[:, None, :] - points[None, :, :], axis=2)
+        u, v = np.nonzero(distance < radius)
+        u += start
+        keep = u < v
+        tails.append(u[keep])
+        heads.append(v[keep])
+    tails, heads = np.concatenate(tails), np.concatenate(heads)
+    length = np.linalg.norm(points[tails] - points[heads], axis=1)
+    capacities = np.maximum(1, (100 * (1 - length / radius))).astype(np.int64)
+    edges = np.concatenate([np.column_stack([tails, heads, capacities]),
+                            np.column_stack([heads, tails, capacities])])
+    source = int(np.argmin(points.sum(axis=1)))
+    sink = int(np.argmax(points.sum(axis=1)))
+    return size, edges, source, sink
+
+
+def scale_free_topology(size, rng, links=2):
+    # Barabasi-Albert preferential attachment: each new router links to
+    # `links` existing ones picked in proportion to their degree
+    endpoints = list(range(links + 1)) * links
+    pairs = []
+    for v in range(links + 1, size):
+        targets = set()
+        while len(targets) < links:
+            targets.add(endpoints[rng.integers(len(endpoints))])
+        for u in targets:
+            pairs.append((u, v))
+            endpoints += (u, v)
+    pairs = np.asarray(pairs, dtype=np.int64)
+    pairs = np.concatenate([pairs, pairs[:, ::-1]])
+    capacities = rng.integers(1, 101, len(pairs))
+    degree = np.bincount(pairs[:, 0], minlength=size)
+    # Hub to leaf, the typical core-to-edge path
+    return size, np.column_stack([pairs, capacities]), int(np.argmax(degree)), size - 1
+
+
+def bipartite_topology(size, rng):
+    # Unit-capacity matching: source -> left half -> right half -> sink
+    half = max(1, size // 2)
+    vertex_count = 2 * half + 2
+    source, sink = 0, vertex_count - 1
+    left = 1 + np.arange(half)
+    right = 1 + half + np.arange(half)
+    tails = np.repeat(left, 4)
+    heads = right[rng.integers(0, half, len(tails))]
+    edges = np.concatenate([
+        np.column_stack([np.full(half, source), left, np.ones(half, dtype=np.int64)]),
+        np.column_stack([tails, heads, np.ones(len(tails), dtype=np.int64)]),
+        np.column_stack([right, np.full(half, sink), np.ones(half, dtype=np.int64)]),
+    ])
+    return vertex_count, edges, source, sink
+
+
+def unit_capacity_topology(size, rng):
+    # Sparse random digraph with every link carrying one packet
+    edge_count = 4 * size
+    tails = rng.integers(0, size, edge_count)
+    heads = rng.integers(0, size, edge_count)
+    keep = tails != heads
+    edges = np.column_stack([tails[keep], heads[keep], np.ones(keep.sum(), dtype=np.int64)])
+    return size, edges, 0, size - 1
+
+
+TOPOLOGIES = {
+    "grid": grid_topology,
+    "layered": layered_topology,
+    "geometric": geometric_topology,
+    "scale-free": scale_free_topology,
+    "bipartite": bipartite_topology,
+    "unit-capacity": unit_capacity_topology,
+}
+
+
+# Augmenting paths and BFS phases that found one, counted from the native
+# trace. The Java engines run the same algorithms, so the counts apply to both.
+def count_steps(algorithm, vertex_count, edges, source, sink):
+    if algorithm not in TRACERS:
+        return None, None
+    augmentations = 0
+    phases = set()
+    for event in TRACERS[algorithm](CSRGraph.from_edges(vertex_count, edges), source, sink):
+        if event[0] == PATH:
+            augmentations += 1
+            phases.add(event[1])
+    return augmentations, len(phases)
+
+
+# Best-of-REPEATS wall time in milliseconds plus peak traced memory in bytes,
+# timing only the solve itself, not the CSR build
+def time_native(algorithm, vertex_count, edges, source, sink, repeats):
+    solver = SOLVERS[algorithm]
+    best = float("inf")
+    for _ in range(repeats):
+        graph = CSRGraph.from_edges(vertex_count, edges)
+        started = time.perf_counter()
+        max_flow = solver(graph, source, sink)
+        best = min(best, time.perf_counter() - started)
+
+    # A separate run for memory, since tracing slows the solver down
+    graph = CSRGraph.from_edges(vertex_count, edges)
+    tracemalloc.start()
+    solver(graph, source, sink)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return max_flow, best * 1000, peak
+
+
+# Best-of-REPEATS wall time in milliseconds through the gateway. Each run gets
+# a fresh session graph because a solved graph keeps its flow. With threads
+# set, Dinic runs as parallel Dinic on that many Java workers.
+def time_java(gateway, algorithm, vertex_count, edges, source, sink, repeats, threads=None):
+    graph = GatewayGraph(gateway)
+    payload = pack_edges(edges)
+    best = float("inf")
+    try:
+        for _ in range(repeats):
+            graph.loadGraph(vertex_count, payload)
+            started = time.perf_counter()
+            if threads:
+                max_flow = graph.parallelDinicMaxFlow(source, sink, threads)
+            else:
+                max_flow = getattr(graph, GATEWAY_METHODS[algorithm])(source, sink)
+            best = min(best, time.perf_counter() - started)
+    finally:
+        graph.close()
+    return max_flow, best * 1000, None
+
+
+def run_benchmarks(topologies, sizes, algorithms, gateway=None, repeats=REPEATS, seed=42, java_threads=None):
+    rows = []
+    for topology in topologies:
+        for size in sizes:
+            vertex_count, edges, source, sink = TOPOLOGIES[topology](size, np.random.default_rng(seed))
+            expected = None
+            for algorithm in algorithms:
+                augmentations, phases = count_steps(algorithm, vertex_count, edges, source, sink)
+                engines = [("Native", lambda: time_native(algorithm, vertex_count, edges, source, sink,
+                                                          repeats))]
+                if gateway is not None:
+                    engines.append(("Java", lambda: time_java(gateway, algorithm, vertex_count, edges,
+                                                              source, sink, repeats)))
+                    if java_threads and algorithm == "Dinic":
+                        engines.append((f"Java x{java_threads}",
+                                        lambda: time_java(gateway, algorithm, vertex_count, edges, source,
+                                                          sink, repeats, java_threads)))
+                for engine, measure in engines:
+                    max_flow, ms, peak = measure()
+                    if expected is not None and max_flow != expected:
+                        raise RuntimeError(f"{engine} {algorithm} max flow {max_flow} != {expected} "
+                                           f"on {topology} ({size})")
+                    expected = max_flow
+                    rows.append({
+                        "topology": topology,
+                        "size": size,
+                        "vertices": vertex_count,
+                        "edges": len(edges),
+                        "engine": engine,
+                        "algorithm": algorithm,
+                        "max_flow": int(max_flow),
+                        "time_ms": round(ms, 3),
+                        "augmentations": augmentations,
+                        "phases": phases,
+                        "peak_bytes": peak,
+                    })
+                    print(f"{topology:>14} {vertex_count:>7} {len(edges):>8} {engine:>7} {algorithm:>13} "
+                          f"{ms:>10.2f} ms")
+    return rows
+
+
+def write_report(rows, directory):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "benchmark.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(os.path.join(directory, "benchmark.json"), "w") as f:
+        json.dump(rows, f, indent=2)
+
+    # One panel per topology: time against edge count for every engine/algorithm
+    topologies = list(dict.fromkeys(row["topology"] for row in rows))
+    columns = min(3, len(topologies))
+    panels = (len(topologies) + columns - 1) // columns
+    figure = Figure(figsize=(5 * columns, 4 * panels))
+    for i, topology in enumerate(topologies):
+        ax = figure.add_subplot(panels, columns, i + 1)
+        series = {}
+        for row in rows:
+            if row["topology"] == topology:
+                series.setdefault(f"{row['engine']} {row['algorithm']}", []).append(
+                    (row["edges"], row["time_ms"]))
+        for label, points in series.items():
+            points.sort()
+            ax.plot(*zip(*points), marker="o", label=label)
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_title(topology)
+        ax.set_xlabel("Edges")
+        ax.set_ylabel("Time (ms)")
+        ax.legend(fontsize="small")
+    figure.tight_layout()
+    figure.savefig(os.path.join(directory, "scaling.png"))
+
+
+# Rows that got more than REGRESSION_RATIO times slower than the baseline run
+def find_regressions(rows, baseline_rows, ratio=REGRESSION_RATIO):
+    def key(row):
+        return row["topology"], row["size"], row["engine"], row["algorithm"]
+
+    baseline = {key(row): row for row in baseline_rows}
+    regressions = []
+    for row in rows:
+        old = baseline.get(key(row))
+        if (old is not None and old["time_ms"] >= REGRESSION_MIN_MS
+                and row["time_ms"] > ratio * old["time_ms"]):
+            regressions.append((row, old))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the max-flow engines on generated topologies")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 400, 1600])
+    parser.add_argument("--topologies", nargs="+", choices=list(TOPOLOGIES), default=list(TOPOLOGIES))
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=ALGORITHMS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--java", action="store_true", help="also time the Java engines via the gateway")
+    parser.add_argument("--java-threads", type=int,
+                        help="with --java, also time parallel Dinic on this many Java workers")
+    parser.add_argument("--output", default="benchmark_results")
+    parser.add_argument("--baseline", help="benchmark.json from an earlier run to compare against")
+    args = parser.parse_args()
+
+    gateway = None
+    if args.java:
+        from py4j.java_gateway import JavaGateway
+        gateway = JavaGateway()
+
+    rows = run_benchmarks(args.topologies, args.sizes, args.algorithms, gateway, args.repeats,
+                          java_threads=args.java_threads)
+    write_report(rows, args.output)
+    print(f"Wrote {len(rows)} rows to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(rows, json.load(f))
+        for row, old in regressions:
+            print(f"Regression: {row['engine']} {row['algorithm']} on {row['topology']} ({row['size']}): "
+                  f"{old['time_ms']:.2f} ms -> {row['time_ms']:.2f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
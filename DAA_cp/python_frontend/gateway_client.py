@@ -0,0 +1,80 @@
+class GatewayGraph:
+    # Session-scoped graph living in the Java backend. It exposes the same
+    # methods as FlowAlgorithmEntryPoint, but every call is routed to this
+    # session's graph id so concurrent users never overwrite each other.
+    def __init__(self, gateway):
+        self.entry_point = gateway.entry_point
+        self.graph_id = None
+
+    def resetGraph(self, vertex_count):
+        self.close()
+        self.graph_id = self.entry_point.createGraph(vertex_count)
+
+    def loadGraph(self, vertex_count, payload):
+        self.close()
+        self.graph_id = self.entry_point.createGraph(vertex_count, payload)
+
+    # 64-bit capacities live in a LongFlowAlgorithm graph, solved with solveLong
+    def loadGraphLong(self, vertex_count, payload):
+        self.close()
+        self.graph_id = self.entry_point.createGraphLong(vertex_count, payload)
+
+    def addEdge(self, u, v, capacity):
+        return self.entry_point.addEdge(self.graph_id, u, v, capacity)
+
+    def addEdgesPacked(self, payload):
+        self.entry_point.addEdgesPacked(self.graph_id, payload)
+
+    def dinicMaxFlow(self, source, sink):
+        return self.entry_point.dinicMaxFlow(self.graph_id, source, sink)
+
+    def edmondsKarpMaxFlow(self, source, sink):
+        return self.entry_point.edmondsKarpMaxFlow(self.graph_id, source, sink)
+
+    def pushRelabelMaxFlow(self, source, sink):
+        return self.entry_point.pushRelabelMaxFlow(self.graph_id, source, sink)
+
+    def parallelDinicMaxFlow(self, source, sink, threads):
+        return self.entry_point.parallelDinicMaxFlow(self.graph_id, source, sink, threads)
+
+    # Worker count for solves that pick "Parallel Dinic" by name
+    def setParallelism(self, threads):
+        self.entry_point.setParallelism(self.graph_id, threads)
+
+    # Per-edge costs for "Min-Cost Max-Flow"; works on int and 64-bit graphs alike
+    def setEdgeCosts(self, payload):
+        self.entry_point.setEdgeCosts(self.graph_id, payload)
+
+    # Incremental updates on an already-solved graph; each returns the new max flow
+    def updateCapacity(self, edge_id, capacity, source, sink):
+        return self.entry_point.updateCapacity(self.graph_id, edge_id, capacity, source, sink)
+
+    def addEdgeIncremental(self, u, v, capacity, source, sink):
+        return self.entry_point.addEdgeIncremental(self.graph_id, u, v, capacity, source, sink)
+
+    def removeEdge(self, edge_id, source, sink):
+        return self.entry_point.removeEdge(self.graph_id, edge_id, source, sink)
+
+    # Batch and multi-terminal solves run on copies; the session graph keeps its flow
+    def maxFlowBatch(self, algorithm, pairs, threads=1):
+        return self.entry_point.maxFlowBatch(self.graph_id, algorithm, pairs, threads)
+
+    def solveMulti(self, algorithm, sources, sinks, trace):
+        return self.entry_point.solveMulti(self.graph_id, algorithm, sources, sinks, trace)
+
+    def gomoryHuTree(self):
+        return self.entry_point.gomoryHuTree(self.graph_id)
+
+    def minCutBetween(self, u, v):
+        return self.entry_point.minCutBetween(self.graph_id, u, v)
+
+    def solve(self, algorithm, source, sink, trace, collect_stats=False):
+        return self.entry_point.solve(self.graph_id, algorithm, source, sink, trace, collect_stats)
+
+    def solveLong(self, algorithm, source, sink, trace, collect_stats=False):
+        return self.entry_point.solveLong(self.graph_id, algorithm, source, sink, trace, collect_stats)
+
+    def close(self):
+        if self.graph_id is not None:
+            self.entry_point.freeGraph(self.graph_id)
+            self.graph_id = None
@@ -0,0 +1,54 @@
+from .batch import max_flow_batch, with_super_terminals
+from .csr_graph import CSRGraph
+from .dinic import dinic_events, dinic_max_flow
+from .edmonds_karp import edmonds_karp_events, edmonds_karp_max_flow
+from .entry_point import SOLVERS, TRACERS, NativeFlowAlgorithm
+from .flow_result import FlowResult
+from .gomory_hu import GomoryHuTree, gomory_hu_tree
+from .min_cost_flow import min_cost_max_flow
+from .packing import (fits_int32, pack_costs, pack_edges, pack_edges_long, pack_ints, unpack_costs,
+                      unpack_edges, unpack_edges_long, unpack_ints)
+from .preprocess import TopologyReduction, reduce_topology
+from .push_relabel import push_relabel_max_flow
+from .solve_stats import SolveStats
+from .trace_events import (DONE, FLOW, LEVEL, PATH, PHASE, EventWriter, read_events, solver_events,
+                           write_events)
+
+__all__ = [
+    "CSRGraph",
+    "DONE",
+    "EventWriter",
+    "FLOW",
+    "FlowResult",
+    "GomoryHuTree",
+    "LEVEL",
+    "NativeFlowAlgorithm",
+    "PATH",
+    "PHASE",
+    "SOLVERS",
+    "SolveStats",
+    "TRACERS",
+    "TopologyReduction",
+    "dinic_events",
+    "dinic_max_flow",
+    "edmonds_karp_events",
+    "edmonds_karp_max_flow",
+    "fits_int32",
+    "gomory_hu_tree",
+    "max_flow_batch",
+    "min_cost_max_flow",
+    "pack_costs",
+    "pack_edges",
+    "pack_edges_long",
+    "pack_ints",
+    "push_relabel_max_flow",
+    "read_events",
+    "reduce_topology",
+    "solver_events",
+    "unpack_costs",
+    "unpack_edges",
+    "unpack_edges_long",
+    "unpack_ints",
+    "with_super_terminals",
+    "write_events",
+]
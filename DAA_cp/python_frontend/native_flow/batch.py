@@ -0,0 +1,36 @@
+import numpy as np
+
+
+# Max flow for every (source, sink) pair on one graph. Flows are reset between
+# pairs, so the CSR arrays are built once for the whole batch.
+def max_flow_batch(graph, solver, pairs):
+    flows = np.empty(len(pairs), dtype=np.int64)
+    for i, (source, sink) in enumerate(pairs):
+        graph.reset_flows()
+        flows[i] = solver(graph, int(source), int(sink))
+    graph.reset_flows()
+    return flows
+
+
+# Edge list extended with a super-source (vertex_count) feeding every source and
+# a super-sink (vertex_count + 1) fed by every sink, as FlowAlgorithm.solveMulti
+# builds it. Each super edge carries what its terminal's own links can, which
+# never limits the flow. Returns (vertex_count, edges, source, sink).
+def with_super_terminals(vertex_count, edges, sources, sinks):
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+    sources = np.asarray(sources, dtype=np.int64)
+    sinks = np.asarray(sinks, dtype=np.int64)
+    # Summed in int64; bincount weights would go through float64 and lose
+    # precision on capacities past 2^53
+    outgoing = np.zeros(vertex_count, dtype=np.int64)
+    incoming = np.zeros(vertex_count, dtype=np.int64)
+    np.add.at(outgoing, edges[:, 0], edges[:, 2])
+    np.add.at(incoming, edges[:, 1], edges[:, 2])
+
+    super_source, super_sink = vertex_count, vertex_count + 1
+    extended = np.concatenate([
+        edges,
+        np.column_stack([np.full(len(sources), super_source), sources, outgoing[sources]]),
+        np.column_stack([sinks, np.full(len(sinks), super_sink), incoming[sinks]]),
+    ])
+    return vertex_count + 2, extended, super_source, super_sink
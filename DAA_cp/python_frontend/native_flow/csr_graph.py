@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class CSRGraph:
+    # Residual graph in compressed sparse row form. Edge i is stored as two
+    # paired arcs (forward arc and its zero-capacity reverse arc), just like
+    # FlowAlgorithm.addEdge does with Edge/reverse on the Java side.
+    def __init__(self, vertex_count, tails, heads, capacities):
+        tails = np.asarray(tails, dtype=np.int64)
+        heads = np.asarray(heads, dtype=np.int64)
+        capacities = np.asarray(capacities, dtype=np.int64)
+
+        if tails.size and (min(tails.min(), heads.min()) < 0
+                           or max(tails.max(), heads.max()) >= vertex_count):
+            raise IndexError(f"Edge endpoint out of range for {vertex_count} vertices")
+
+        edge_count = tails.size
+        arc_tails = np.empty(2 * edge_count, dtype=np.int64)
+        arc_heads = np.empty(2 * edge_count, dtype=np.int64)
+        arc_capacities = np.zeros(2 * edge_count, dtype=np.int64)
+        arc_tails[0::2], arc_tails[1::2] = tails, heads
+        arc_heads[0::2], arc_heads[1::2] = heads, tails
+        arc_capacities[0::2] = capacities
+
+        # A stable sort keeps every adjacency list in insertion order, which is
+        # the order the Java ArrayList<Edge> lists are scanned in.
+        order = np.argsort(arc_tails, kind="stable")
+        position = np.empty_like(order)
+        position[order] = np.arange(order.size)
+
+        self.vertex_count = vertex_count
+        self.edge_count = edge_count
+        self.offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(arc_tails, minlength=vertex_count), out=self.offsets[1:])
+        self.targets = arc_heads[order]
+        self.capacities = arc_capacities[order]
+        self.flows = np.zeros(order.size, dtype=np.int64)
+        self.reverse = position[order ^ 1]
+        self.edge_arcs = position[0::2]
+        self.costs = None
+
+    @classmethod
+    def from_edges(cls, vertex_count, edges):
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+        return cls(vertex_count, edges[:, 0], edges[:, 1], edges[:, 2])
+
+    @classmethod
+    def from_arrays(cls, vertex_count, offsets, targets, reverse, capacities, edge_arcs):
+        # Wraps CSR arrays built elsewhere (e.g. views into shared memory)
+        # without copying them; only the flows are allocated here
+        graph = cls.__new__(cls)
+        graph.vertex_count = vertex_count
+        graph.edge_count = len(edge_arcs)
+        graph.offsets = offsets
+        graph.targets = targets
+        graph.reverse = reverse
+        graph.capacities = capacities
+        graph.flows = np.zeros(len(targets), dtype=np.int64)
+        graph.edge_arcs = edge_arcs
+        graph.costs = None
+        return graph
+
+    # Per-edge costs in input order for min-cost solves; every reverse arc
+    # gets the negated cost, so pushing flow back refunds it
+    def set_costs(self, costs):
+        costs = np.asarray(costs, dtype=np.float64)
+        if costs.shape != (self.edge_count,):
+            raise ValueError(f"Need one cost per edge, got {costs.size} for {self.edge_count} edges")
+        if not np.isfinite(costs).all() or (costs < 0).any():
+            raise ValueError("Edge costs must be finite and non-negative")
+        self.costs = np.zeros(len(self.targets), dtype=np.float64)
+        self.costs[self.edge_arcs] = costs
+        self.costs[self.reverse[self.edge_arcs]] = -costs
+
+    # Input edge behind every arc, and the sign a push along that arc adds to
+    # the edge's flow (reverse arcs cancel flow), as lists for the trace events
+    def arc_edges(self):
+        edge_ids = np.arange(self.edge_count)
+        forward = self.edge_arcs
+        backward = self.reverse[forward]
+        arc_edge = np.empty(len(self.targets), dtype=np.int64)
+        arc_sign = np.empty(len(self.targets), dtype=np.int64)
+        arc_edge[forward], arc_edge[backward] = edge_ids, edge_ids
+        arc_sign[forward], arc_sign[backward] = 1, -1
+        return arc_edge.tolist(), arc_sign.tolist()
+
+    def residual(self):
+        return self.capacities - self.flows
+
+    def set_residual(self, residual):
+        self.flows = self.capacities - np.asarray(residual, dtype=np.int64)
+
+    def edge_flows(self):
+        return self.flows[self.edge_arcs]
+
+    def min_cut_source_side(self, source):
+        # Vertices still reachable from the source in the residual graph
+        offsets, targets = self.offsets, self.targets
+        has_residual = self.flows < self.capacities
+        visited = np.zeros(self.vertex_count, dtype=bool)
+        visited[source] = True
+        frontier = [source]
+        while frontier:
+            u = frontier.pop()
+            for arc in range(offsets[u], offsets[u + 1]):
+                v = targets[arc]
+                if has_residual[arc] and not visited[v]:
+                    visited[v] = True
+                    frontier.append(v)
+        return np.flatnonzero(visited)
+
+    def reset_flows(self):
+        self.flows.fill(0)
@@ -0,0 +1,120 @@
+import time
+from collections import deque
+
+from .trace_events import DONE, FLOW, LEVEL, PATH, PHASE, solver_events
+
+
+# BFS to build level graph
+def _build_levels(offsets, targets, residual, level, source, sink, stats, events, phase):
+    for i in range(len(level)):
+        level[i] = -1
+    level[source] = 0
+    if events is not None:
+        events.append((PHASE, phase))
+        events.append((LEVEL, source, 0))
+
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        next_level = level[u] + 1
+        if stats is not None:
+            stats.edges_scanned += offsets[u + 1] - offsets[u]
+        for arc in range(offsets[u], offsets[u + 1]):
+            v = targets[arc]
+            if level[v] < 0 and residual[arc] > 0:
+                level[v] = next_level
+                if events is not None:
+                    events.append((LEVEL, v, next_level))
+                queue.append(v)
+    return level[sink] != -1
+
+
+# Iterative DFS pushing paths through the level graph until it is blocked
+def _blocking_flow(offsets, targets, reverse, residual, level, source, sink, paths, phase, stats, events,
+                   arc_edge, arc_sign):
+    pushed = 0
+    start = offsets[:-1]
+    path = []
+    u = source
+
+    while True:
+        if u == sink:
+            bottleneck = min(residual[arc] for arc in path)
+            for arc in path:
+                residual[arc] -= bottleneck
+                residual[reverse[arc]] += bottleneck
+            pushed += bottleneck
+            if stats is not None:
+                stats.augmenting_paths += 1
+            if paths is not None:
+                paths.append((phase, bottleneck, [source] + [targets[arc] for arc in path]))
+            if events is not None:
+                events.append((PATH, phase, bottleneck, [source] + [targets[arc] for arc in path]))
+                for arc in path:
+                    events.append((FLOW, arc_edge[arc], arc_sign[arc] * bottleneck))
+
+            # Resume from the tail of the first saturated arc
+            for depth, arc in enumerate(path):
+                if residual[arc] == 0:
+                    del path[depth:]
+                    break
+            u = targets[path[-1]] if path else source
+            continue
+
+        end = offsets[u + 1]
+        arc = start[u]
+        while arc < end and (residual[arc] == 0 or level[targets[arc]] != level[u] + 1):
+            arc += 1
+        if stats is not None:
+            stats.edges_scanned += arc - start[u] + (arc < end)
+        start[u] = arc
+
+        if arc < end:
+            path.append(arc)
+            u = targets[arc]
+        elif u == source:
+            return pushed
+        else:
+            # Dead end: retreat and skip the arc that led here
+            if stats is not None:
+                stats.dead_ends += 1
+            arc = path.pop()
+            u = targets[reverse[arc]]
+            start[u] += 1
+
+
+# Dinic's max flow method. events, when given, gets the trace_events tuples
+# of the solve appended as they happen.
+def dinic_max_flow(graph, source, sink, paths=None, stats=None, events=None):
+    if source == sink:
+        if events is not None:
+            events.append((DONE, 0))
+        return 0
+
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    reverse = graph.reverse.tolist()
+    residual = graph.residual().tolist()
+    level = [-1] * graph.vertex_count
+    arc_edge, arc_sign = graph.arc_edges() if events is not None else (None, None)
+
+    max_flow = 0
+    phase = 0
+    phase_started = time.perf_counter_ns()
+    while _build_levels(offsets, targets, residual, level, source, sink, stats, events, phase):
+        max_flow += _blocking_flow(offsets, targets, reverse, residual, level,
+                                   source, sink, paths, phase, stats, events, arc_edge, arc_sign)
+        phase += 1
+        if stats is not None:
+            stats.phase_done(phase_started)
+            phase_started = time.perf_counter_ns()
+
+    graph.set_residual(residual)
+    if events is not None:
+        events.append((DONE, max_flow))
+    return max_flow
+
+
+# Dinic's algorithm as a trace_events stream
+def dinic_events(graph, source, sink):
+    return solver_events(dinic_max_flow, graph, source, sink)
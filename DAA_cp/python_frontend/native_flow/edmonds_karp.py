@@ -0,0 +1,104 @@
+import time
+from collections import deque
+
+from .trace_events import DONE, FLOW, LEVEL, PATH, PHASE, solver_events
+
+
+# BFS for finding augmenting paths, recording the arc used to reach each vertex.
+# distance is only kept when events are traced.
+def _find_augmenting_path(offsets, targets, residual, parent_arc, source, sink, stats, events, phase):
+    for i in range(len(parent_arc)):
+        parent_arc[i] = -1
+    visited = [False] * len(parent_arc)
+    visited[source] = True
+    if events is not None:
+        distance = [-1] * len(parent_arc)
+        distance[source] = 0
+        events.append((PHASE, phase))
+        events.append((LEVEL, source, 0))
+
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for arc in range(offsets[u], offsets[u + 1]):
+            v = targets[arc]
+            if not visited[v] and residual[arc] > 0:
+                visited[v] = True
+                parent_arc[v] = arc
+                if events is not None:
+                    distance[v] = distance[u] + 1
+                    events.append((LEVEL, v, distance[v]))
+                if v == sink:
+                    if stats is not None:
+                        stats.edges_scanned += arc - offsets[u] + 1
+                    return True
+                queue.append(v)
+        if stats is not None:
+            stats.edges_scanned += offsets[u + 1] - offsets[u]
+    return False
+
+
+# Edmonds-Karp max flow method. events, when given, gets the trace_events
+# tuples of the solve appended as they happen.
+def edmonds_karp_max_flow(graph, source, sink, paths=None, stats=None, events=None):
+    if source == sink:
+        if events is not None:
+            events.append((DONE, 0))
+        return 0
+
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    reverse = graph.reverse.tolist()
+    residual = graph.residual().tolist()
+    parent_arc = [-1] * graph.vertex_count
+    arc_edge, arc_sign = graph.arc_edges() if events is not None else (None, None)
+
+    # Every BFS that finds a path is one phase with a single augmentation
+    max_flow = 0
+    phase = 0
+    phase_started = time.perf_counter_ns()
+    while _find_augmenting_path(offsets, targets, residual, parent_arc, source, sink, stats, events, phase):
+        path_flow = None
+        v = sink
+        while v != source:
+            arc = parent_arc[v]
+            if path_flow is None or residual[arc] < path_flow:
+                path_flow = residual[arc]
+            v = targets[reverse[arc]]
+
+        v = sink
+        while v != source:
+            arc = parent_arc[v]
+            residual[arc] -= path_flow
+            residual[reverse[arc]] += path_flow
+            v = targets[reverse[arc]]
+
+        if paths is not None or events is not None:
+            arcs = [parent_arc[sink]]
+            while targets[reverse[arcs[-1]]] != source:
+                arcs.append(parent_arc[targets[reverse[arcs[-1]]]])
+            arcs.reverse()
+            vertices = [source] + [targets[arc] for arc in arcs]
+            if paths is not None:
+                paths.append((phase, path_flow, vertices))
+            if events is not None:
+                events.append((PATH, phase, path_flow, vertices))
+                for arc in arcs:
+                    events.append((FLOW, arc_edge[arc], arc_sign[arc] * path_flow))
+
+        max_flow += path_flow
+        phase += 1
+        if stats is not None:
+            stats.augmenting_paths += 1
+            stats.phase_done(phase_started)
+            phase_started = time.perf_counter_ns()
+
+    graph.set_residual(residual)
+    if events is not None:
+        events.append((DONE, max_flow))
+    return max_flow
+
+
+# Edmonds-Karp as a trace_events stream
+def edmonds_karp_events(graph, source, sink):
+    return solver_events(edmonds_karp_max_flow, graph, source, sink)
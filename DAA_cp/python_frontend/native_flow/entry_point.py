@@ -0,0 +1,158 @@
+import time
+
+import numpy as np
+
+from .batch import max_flow_batch, with_super_terminals
+from .csr_graph import CSRGraph
+from .dinic import dinic_events, dinic_max_flow
+from .edmonds_karp import edmonds_karp_events, edmonds_karp_max_flow
+from .flow_result import FlowResult
+from .gomory_hu import gomory_hu_tree
+from .min_cost_flow import min_cost_max_flow
+from .push_relabel import push_relabel_max_flow
+from .packing import pack_ints, unpack_costs, unpack_edges, unpack_edges_long, unpack_ints
+from .solve_stats import SolveStats
+
+
+SOLVERS = {
+    "Dinic": dinic_max_flow,
+    "Edmonds-Karp": edmonds_karp_max_flow,
+    "Push-Relabel": push_relabel_max_flow,
+    "Min-Cost Max-Flow": min_cost_max_flow,
+}
+
+# Solvers that emit trace_events, as event generators
+TRACERS = {
+    "Dinic": dinic_events,
+    "Edmonds-Karp": edmonds_karp_events,
+}
+
+
+class NativeFlowAlgorithm:
+    # In-process stand-in for FlowAlgorithmEntryPoint: same method names, so
+    # InternetPacketFlowVisualizer can use either one as its flow_algorithm.
+    def __init__(self, vertex_count=0):
+        self.resetGraph(vertex_count)
+
+    def resetGraph(self, vertex_count):
+        self.vertex_count = vertex_count
+        self.edges = []
+        self.edge_blocks = []
+        self.graph = None
+        self.tree = None
+        self.costs = None
+
+    def addEdge(self, u, v, capacity):
+        self.edges.append((u, v, capacity))
+        self.graph = None
+        self.tree = None
+
+    def addEdgesPacked(self, payload):
+        self._flush_edges()
+        self.edge_blocks.append(unpack_edges(payload))
+        self.graph = None
+        self.tree = None
+
+    def loadGraph(self, vertex_count, payload):
+        self.resetGraph(vertex_count)
+        self.addEdgesPacked(payload)
+
+    # The CSR arrays are int64 already, so the 64-bit capacity path only
+    # differs in its wire format: int64 edge triples in, an int64 FlowResult out
+    def loadGraphLong(self, vertex_count, payload):
+        self.resetGraph(vertex_count)
+        self.edge_blocks.append(unpack_edges_long(payload))
+
+    # Per-edge costs for "Min-Cost Max-Flow", packed by pack_costs
+    def setEdgeCosts(self, payload):
+        self.costs = unpack_costs(payload)
+        if self.graph is not None:
+            self.graph.set_costs(self.costs)
+
+    def solve(self, algorithm, source, sink, trace, collect_stats=False):
+        return self._solve(algorithm, source, sink, trace, collect_stats).to_bytes()
+
+    def solveLong(self, algorithm, source, sink, trace, collect_stats=False):
+        return self._solve(algorithm, source, sink, trace, collect_stats).to_bytes(wide=True)
+
+    def _solve(self, algorithm, source, sink, trace, collect_stats):
+        if algorithm not in SOLVERS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        graph = self._csr_graph()
+        paths = [] if trace else None
+        stats = SolveStats() if collect_stats else None
+        started = time.perf_counter_ns()
+        max_flow = SOLVERS[algorithm](graph, source, sink, paths, stats)
+        if stats is not None:
+            stats.solve_ns = time.perf_counter_ns() - started
+        return FlowResult(max_flow, graph.edge_flows(), graph.min_cut_source_side(source),
+                          paths or (), stats)
+
+    # threads is accepted for parity with the gateway; in-process the pairs
+    # run one after another, since Python threads would not run them in parallel
+    def maxFlowBatch(self, algorithm, pairs, threads=1):
+        if algorithm not in SOLVERS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        graph = self._csr_graph()
+        flows = graph.flows.copy()
+        results = max_flow_batch(graph, SOLVERS[algorithm], unpack_ints(pairs).reshape(-1, 2))
+        graph.flows = flows
+        return pack_ints(results)
+
+    def solveMulti(self, algorithm, sources, sinks, trace):
+        if algorithm not in SOLVERS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        edges = self._edge_array()
+        vertex_count, extended, source, sink = with_super_terminals(
+            self.vertex_count, edges, unpack_ints(sources), unpack_ints(sinks))
+        graph = CSRGraph.from_edges(vertex_count, extended)
+        if self.costs is not None:
+            # The super edges are free
+            graph.set_costs(np.concatenate([self.costs, np.zeros(len(extended) - len(edges))]))
+        paths = [] if trace else None
+        max_flow = SOLVERS[algorithm](graph, source, sink, paths)
+        min_cut = graph.min_cut_source_side(source)
+        # Paths run super-source, ..., super-sink; report the routers in between
+        paths = [(phase, bottleneck, vertices[1:-1]) for phase, bottleneck, vertices in paths or ()]
+        return FlowResult(max_flow, graph.edge_flows()[:len(edges)], min_cut[min_cut < self.vertex_count],
+                          paths).to_bytes()
+
+    # Gomory-Hu tree of the links, cached until the edges change
+    def gomoryHuTree(self):
+        if self.tree is None:
+            self.tree = gomory_hu_tree(self.vertex_count, self._edge_array())
+        return self.tree.to_bytes()
+
+    def minCutBetween(self, u, v):
+        self.gomoryHuTree()
+        return self.tree.min_cut(u, v)
+
+    def pushRelabelMaxFlow(self, source, sink):
+        return push_relabel_max_flow(self._csr_graph(), source, sink)
+
+    def close(self):
+        self.resetGraph(0)
+
+    def _flush_edges(self):
+        if self.edges:
+            self.edge_blocks.append(np.asarray(self.edges, dtype=np.int64))
+            self.edges = []
+
+    def _edge_array(self):
+        self._flush_edges()
+        if not self.edge_blocks:
+            return np.empty((0, 3), dtype=np.int64)
+        return np.concatenate(self.edge_blocks)
+
+    def _csr_graph(self):
+        if self.graph is None:
+            self.graph = CSRGraph.from_edges(self.vertex_count, self._edge_array())
+            if self.costs is not None:
+                self.graph.set_costs(self.costs)
+        return self.graph
+
+    def dinicMaxFlow(self, source, sink):
+        return dinic_max_flow(self._csr_graph(), source, sink)
+
+    def edmondsKarpMaxFlow(self, source, sink):
+        return edmonds_karp_max_flow(self._csr_graph(), source, sink)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from .solve_stats import SolveStats
+
+RESULT_DTYPE = np.dtype(">i4")
+WIDE_RESULT_DTYPE = np.dtype(">i8")
+STATS_DTYPE = np.dtype(">i8")
+
+
+class FlowResult:
+    # Python side of FlowResult.java. Both backends hand results over in the
+    # same packed layout:
+    # [max_flow, edge_count, cut_size, path_count, edge_flows..., min_cut...,
+    #  then per path: phase, bottleneck, length, vertices...]
+    # and, when stats were collected, stat_count plus that many int64 words.
+    # The 64-bit capacity path (LongFlowResult.java) uses the same layout with
+    # every word an int64; pass wide=True for those payloads.
+    def __init__(self, max_flow, edge_flows, min_cut, augmenting_paths=(), stats=None):
+        self.max_flow = int(max_flow)
+        self.edge_flows = np.asarray(edge_flows, dtype=np.int64)
+        self.min_cut = np.asarray(min_cut, dtype=np.int64)
+        self.augmenting_paths = list(augmenting_paths)
+        self.stats = stats
+
+    def to_bytes(self, wide=False):
+        dtype = WIDE_RESULT_DTYPE if wide else RESULT_DTYPE
+        words = [[self.max_flow, len(self.edge_flows), len(self.min_cut), len(self.augmenting_paths)],
+                 self.edge_flows, self.min_cut]
+        for phase, bottleneck, vertices in self.augmenting_paths:
+            words.append([phase, bottleneck, len(vertices)])
+            words.append(vertices)
+        words = np.concatenate([np.asarray(w, dtype=np.int64) for w in words])
+        payload = words.astype(dtype).tobytes()
+        if self.stats is not None:
+            stat_words = self.stats.to_words()
+            payload += (np.asarray([len(stat_words)], dtype=dtype).tobytes()
+                        + np.asarray(stat_words, dtype=STATS_DTYPE).tobytes())
+        return payload
+
+    @classmethod
+    def from_bytes(cls, payload, wide=False):
+        dtype = WIDE_RESULT_DTYPE if wide else RESULT_DTYPE
+        words = np.frombuffer(payload, dtype=dtype)
+        max_flow, edge_count, cut_size, path_count = words[:4].tolist()
+        position = 4
+        edge_flows = words[position:position + edge_count].astype(np.int64)
+        position += edge_count
+        min_cut = words[position:position + cut_size].astype(np.int64)
+        position += cut_size
+
+        augmenting_paths = []
+        for _ in range(path_count):
+            phase, bottleneck, length = words[position:position + 3].tolist()
+            position += 3
+            augmenting_paths.append((phase, bottleneck, words[position:position + length].tolist()))
+            position += length
+
+        stats = None
+        if position < len(words):
+            stat_count = int(words[position])
+            stat_words = np.frombuffer(payload, dtype=STATS_DTYPE, count=stat_count,
+                                       offset=(position + 1) * dtype.itemsize)
+            stats = SolveStats.from_words(stat_words.tolist())
+        return cls(max_flow, edge_flows, min_cut, augmenting_paths, stats)
@@ -0,0 +1,97 @@
+import numpy as np
+
+from .csr_graph import CSRGraph
+from .dinic import dinic_max_flow
+
+TREE_DTYPE = np.dtype(">i4")
+
+
+class GomoryHuTree:
+    # Python side of GomoryHuTree.java. Tree edge i -- parent[i] carries the
+    # min cut value between i and its parent; vertex 0 is the root (parent -1).
+    def __init__(self, parent, weight):
+        self.parent = np.asarray(parent, dtype=np.int64)
+        self.weight = np.asarray(weight, dtype=np.int64)
+
+        # Parents can have larger ids than their children, so walk the tree
+        # top-down once and keep that order for depths and subtrees
+        children = [[] for _ in range(len(self.parent))]
+        for v in range(1, len(self.parent)):
+            children[self.parent[v]].append(v)
+        self.order = [0] if len(self.parent) else []
+        for u in self.order:
+            self.order.extend(children[u])
+        self.depth = np.zeros(len(self.parent), dtype=np.int64)
+        for v in self.order[1:]:
+            self.depth[v] = self.depth[self.parent[v]] + 1
+
+    # Min cut between two routers: the lightest tree edge on the path between them, O(V)
+    def min_cut(self, u, v):
+        if u == v:
+            raise ValueError("Min cut needs two different routers")
+        parent, weight, depth = self.parent, self.weight, self.depth
+        cut = None
+        while u != v:
+            if depth[u] >= depth[v]:
+                w, u = weight[u], parent[u]
+            else:
+                w, v = weight[v], parent[v]
+            cut = w if cut is None else min(cut, w)
+        return int(cut)
+
+    # Routers in the subtree below tree edge vertex -- parent[vertex]; cutting
+    # that edge's min cut separates exactly these from the rest
+    def cut_side(self, vertex):
+        inside = np.zeros(len(self.parent), dtype=bool)
+        inside[vertex] = True
+        for v in self.order:
+            if v != vertex and v != 0 and inside[self.parent[v]]:
+                inside[v] = True
+        return np.flatnonzero(inside)
+
+    # The `count` cheapest cuts in the network as (u, v, value, side) tuples,
+    # where side is the set of routers the cut separates from v
+    def weakest_cuts(self, count):
+        order = np.argsort(self.weight[1:], kind="stable")[:count] + 1
+        return [(int(u), int(self.parent[u]), int(self.weight[u]), self.cut_side(u)) for u in order]
+
+    # Same layout as GomoryHuTree.toBytes: [vertex_count, parent..., weight...]
+    def to_bytes(self):
+        words = np.concatenate([[len(self.parent)], self.parent, self.weight])
+        return words.astype(TREE_DTYPE).tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        words = np.frombuffer(payload, dtype=TREE_DTYPE).astype(np.int64)
+        vertex_count = int(words[0])
+        return cls(words[1:1 + vertex_count], words[1 + vertex_count:1 + 2 * vertex_count])
+
+
+# Gusfield's algorithm, mirroring GomoryHuTree.build: V - 1 Dinic solves on an
+# undirected copy of the links, resetting flows instead of rebuilding the graph
+def gomory_hu_tree(vertex_count, edges):
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+    both = np.empty((2 * len(edges), 3), dtype=np.int64)
+    both[0::2] = edges
+    both[1::2] = edges[:, [1, 0, 2]]
+    graph = CSRGraph.from_edges(vertex_count, both)
+
+    parent = np.zeros(vertex_count, dtype=np.int64)
+    weight = np.zeros(vertex_count, dtype=np.int64)
+    for s in range(1, vertex_count):
+        t = parent[s]
+        graph.reset_flows()
+        cut = dinic_max_flow(graph, s, int(t))
+        weight[s] = cut
+        source_side = np.zeros(vertex_count, dtype=bool)
+        source_side[graph.min_cut_source_side(s)] = True
+        moved = source_side & (parent == t)
+        moved[s] = False
+        parent[moved] = s
+        # If t's parent landed on s's side, s takes t's place in the tree
+        if source_side[parent[t]]:
+            parent[s], parent[t] = parent[t], s
+            weight[s], weight[t] = weight[t], cut
+    if vertex_count > 0:
+        parent[0] = -1
+    return GomoryHuTree(parent, weight)
@@ -0,0 +1,90 @@
+import heapq
+import time
+
+INF = float("inf")
+
+
+# Dijkstra over residual arcs with reduced costs cost + potential[u] - potential[v]
+def _shortest_paths(offsets, targets, residual, costs, potential, dist, parent_arc, source, stats):
+    for i in range(len(dist)):
+        dist[i] = INF
+        parent_arc[i] = -1
+    dist[source] = 0.0
+
+    # Stale heap entries are skipped when popped
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for arc in range(offsets[u], offsets[u + 1]):
+            if residual[arc] > 0:
+                v = targets[arc]
+                # Rounding can leave a reduced cost a hair below zero
+                candidate = d + max(0.0, costs[arc] + potential[u] - potential[v])
+                if candidate < dist[v]:
+                    dist[v] = candidate
+                    parent_arc[v] = arc
+                    heapq.heappush(heap, (candidate, v))
+        if stats is not None:
+            stats.edges_scanned += offsets[u + 1] - offsets[u]
+
+
+# Min-cost max flow by successive shortest paths: every phase augments along
+# the cheapest residual source -> sink path. Costs start non-negative, so zero
+# potentials are valid at first, and adding each phase's distances keeps every
+# reduced cost non-negative for the next Dijkstra. Uses graph.costs; a graph
+# without costs is solved as if every link were free.
+def min_cost_max_flow(graph, source, sink, paths=None, stats=None):
+    if source == sink:
+        return 0
+
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    reverse = graph.reverse.tolist()
+    residual = graph.residual().tolist()
+    costs = graph.costs.tolist() if graph.costs is not None else [0.0] * len(targets)
+    potential = [0.0] * graph.vertex_count
+    dist = [INF] * graph.vertex_count
+    parent_arc = [-1] * graph.vertex_count
+
+    max_flow = 0
+    phase_started = time.perf_counter_ns()
+    while True:
+        _shortest_paths(offsets, targets, residual, costs, potential, dist, parent_arc, source, stats)
+        if dist[sink] == INF:
+            break
+        for v in range(graph.vertex_count):
+            if dist[v] < INF:
+                potential[v] += dist[v]
+
+        path_flow = None
+        v = sink
+        while v != source:
+            arc = parent_arc[v]
+            if path_flow is None or residual[arc] < path_flow:
+                path_flow = residual[arc]
+            v = targets[reverse[arc]]
+
+        v = sink
+        while v != source:
+            arc = parent_arc[v]
+            residual[arc] -= path_flow
+            residual[reverse[arc]] += path_flow
+            v = targets[reverse[arc]]
+
+        if paths is not None:
+            vertices = [sink]
+            while vertices[-1] != source:
+                vertices.append(targets[reverse[parent_arc[vertices[-1]]]])
+            paths.append((len(paths), path_flow, vertices[::-1]))
+
+        max_flow += path_flow
+        if stats is not None:
+            stats.augmenting_paths += 1
+            stats.phase_done(phase_started)
+            phase_started = time.perf_counter_ns()
+
+    graph.set_residual(residual)
+    return max_flow
+
@@ -0,0 +1,59 @@
+import numpy as np
+
+# Wire format shared with FlowAlgorithmEntryPoint.addEdgesPacked: (u, v, capacity)
+# triples of big-endian int32, which is what java.nio.ByteBuffer reads by default.
+EDGE_DTYPE = np.dtype(">i4")
+
+# Capacities past int32 (link speeds in bits per second) go over the 64-bit
+# path instead: FlowAlgorithmEntryPoint.createGraphLong reads big-endian int64
+LONG_EDGE_DTYPE = np.dtype(">i8")
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+# Per-edge costs for min-cost solves: one big-endian float64 per edge, read by
+# FlowAlgorithmEntryPoint.setEdgeCosts
+COST_DTYPE = np.dtype(">f8")
+
+
+def fits_int32(values):
+    values = np.asarray(values)
+    return not values.size or (values.min() >= INT32_MIN and values.max() <= INT32_MAX)
+
+
+def pack_edges(edges):
+    # Builds the payload straight in the wire dtype, so the only copy made is
+    # the final buffer handed to py4j as a single byte[] argument. Values that
+    # do not fit would wrap silently, so they are refused instead.
+    edges = np.asarray(edges)
+    if not fits_int32(edges):
+        raise OverflowError("Capacities exceed int32; use pack_edges_long and the 64-bit path")
+    return np.ascontiguousarray(edges, dtype=EDGE_DTYPE).reshape(-1, 3).tobytes()
+
+
+def unpack_edges(payload):
+    return np.frombuffer(payload, dtype=EDGE_DTYPE).reshape(-1, 3)
+
+
+def pack_edges_long(edges):
+    return np.ascontiguousarray(edges, dtype=LONG_EDGE_DTYPE).reshape(-1, 3).tobytes()
+
+
+def unpack_edges_long(payload):
+    return np.frombuffer(payload, dtype=LONG_EDGE_DTYPE).reshape(-1, 3)
+
+
+def pack_costs(costs):
+    return np.ascontiguousarray(costs, dtype=COST_DTYPE).ravel().tobytes()
+
+
+def unpack_costs(payload):
+    return np.frombuffer(payload, dtype=COST_DTYPE)
+
+
+# Flat int32 lists (vertex ids, (source, sink) pairs, per-pair flows) use the
+# same big-endian wire dtype
+def pack_ints(values):
+    return np.ascontiguousarray(values, dtype=EDGE_DTYPE).ravel().tobytes()
+
+
+def unpack_ints(payload):
+    return np.frombuffer(payload, dtype=EDGE_DTYPE)
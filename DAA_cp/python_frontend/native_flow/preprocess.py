@@ -0,0 +1,187 @@
+import numpy as np
+
+from .csr_graph import CSRGraph
+
+# Every reduced edge is a tree over input edges: a single input edge, a series
+# chain (flow passes through every part) or a parallel bundle (flow is split)
+EDGE = 0
+SERIES = 1
+PARALLEL = 2
+
+
+# Vertices reachable from start along (tails[i] -> heads[i]) edges, one BFS level at a time
+def _reachable(vertex_count, tails, heads, start):
+    order = np.argsort(tails, kind="stable")
+    targets = heads[order]
+    offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tails, minlength=vertex_count), out=offsets[1:])
+
+    seen = np.zeros(vertex_count, dtype=bool)
+    seen[start] = True
+    frontier = np.array([start], dtype=np.int64)
+    while frontier.size:
+        counts = offsets[frontier + 1] - offsets[frontier]
+        arcs = np.repeat(offsets[frontier + 1] - np.cumsum(counts), counts) + np.arange(counts.sum())
+        reached = np.unique(targets[arcs])
+        frontier = reached[~seen[reached]]
+        seen[frontier] = True
+    return seen
+
+
+# Edges that can lie on a simple source -> sink path: positive capacity, no
+# self-loops, nothing into the source or out of the sink, and both endpoints
+# reachable from the source and able to reach the sink
+def _prune(vertex_count, edges, source, sink):
+    keep = ((edges[:, 2] > 0) & (edges[:, 0] != edges[:, 1])
+            & (edges[:, 1] != source) & (edges[:, 0] != sink))
+    tails, heads = edges[keep, 0], edges[keep, 1]
+    useful = (_reachable(vertex_count, tails, heads, source)
+              & _reachable(vertex_count, heads, tails, sink))
+    return np.flatnonzero(keep)[useful[tails] & useful[heads]]
+
+
+class TopologyReduction:
+    # A smaller graph with the same source -> sink max flow, plus the
+    # composition of every reduced edge so its flow can be expanded back onto
+    # the input edges for visualization
+    def __init__(self, vertex_count, edges, source, sink):
+        self.original_vertex_count = vertex_count
+        self.original_edges = edges
+        self.original_source = source
+        self.original_sink = sink
+
+        self.kinds = []
+        self.capacities = []
+        self.parts = []
+        self.out_edges = {}
+        self.in_edges = {}
+
+    def _node(self, kind, capacity, parts):
+        self.kinds.append(kind)
+        self.capacities.append(capacity)
+        self.parts.append(parts)
+        return len(self.kinds) - 1
+
+    def _flatten(self, kind, node):
+        return self.parts[node] if self.kinds[node] == kind else [node]
+
+    def _add(self, u, v, node):
+        if v == self.original_source or u == self.original_sink:
+            return
+        existing = self.out_edges.setdefault(u, {}).get(v)
+        if existing is not None:
+            # Parallel links merge into one with the summed capacity
+            node = self._node(PARALLEL, self.capacities[existing] + self.capacities[node],
+                              self._flatten(PARALLEL, existing) + self._flatten(PARALLEL, node))
+        self.out_edges[u][v] = node
+        self.in_edges.setdefault(v, {})[u] = node
+
+    def _detach(self, v):
+        for w in self.out_edges.pop(v, {}):
+            del self.in_edges[w][v]
+        for u in self.in_edges.pop(v, {}):
+            del self.out_edges[u][v]
+
+    # Transit routers linked to exactly two neighbours a and b carry a -> v -> b
+    # and b -> v -> a independently, so each direction becomes one series edge
+    # with the smaller capacity. Routers left with a single neighbour are dead ends.
+    def _contract(self):
+        pending = [v for v in set(self.out_edges) | set(self.in_edges)
+                   if v != self.original_source and v != self.original_sink]
+        while pending:
+            v = pending.pop()
+            if v == self.original_source or v == self.original_sink:
+                continue
+            incoming = self.in_edges.get(v, {})
+            outgoing = self.out_edges.get(v, {})
+            neighbours = set(incoming) | set(outgoing)
+            if len(neighbours) > 2:
+                continue
+
+            chains = []
+            if len(neighbours) == 2:
+                a, b = neighbours
+                for x, y in ((a, b), (b, a)):
+                    if x in incoming and y in outgoing:
+                        first, second = incoming[x], outgoing[y]
+                        chains.append((x, y, self._node(
+                            SERIES, min(self.capacities[first], self.capacities[second]),
+                            self._flatten(SERIES, first) + self._flatten(SERIES, second))))
+            self._detach(v)
+            for x, y, node in chains:
+                self._add(x, y, node)
+            pending.extend(neighbours)
+
+    # Per-input-edge flows from the flows on the reduced edges. Series parts all
+    # carry the full flow; parallel parts are filled in order up to their capacity.
+    def expand_flows(self, reduced_flows):
+        flows = np.zeros(len(self.original_edges), dtype=np.int64)
+        stack = [(int(node), int(flow)) for node, flow in zip(self.edge_nodes, reduced_flows) if flow]
+        while stack:
+            node, flow = stack.pop()
+            kind = self.kinds[node]
+            if kind == EDGE:
+                flows[self.parts[node]] += flow
+            elif kind == SERIES:
+                stack.extend((part, flow) for part in self.parts[node])
+            else:
+                for part in self.parts[node]:
+                    share = min(flow, self.capacities[part])
+                    if share:
+                        stack.append((part, share))
+                    flow -= share
+                    if not flow:
+                        break
+        return flows
+
+    # Source side of the min cut in the input graph for an expanded max flow
+    def min_cut_source_side(self, edge_flows):
+        graph = CSRGraph.from_edges(self.original_vertex_count, self.original_edges)
+        graph.flows[graph.edge_arcs] = edge_flows
+        graph.flows[graph.reverse[graph.edge_arcs]] = -np.asarray(edge_flows, dtype=np.int64)
+        return graph.min_cut_source_side(self.original_source)
+
+
+# Shrinks a topology before a source -> sink solve: prunes routers and links on
+# no source -> sink path, contracts chains of transit routers and merges
+# parallel links. Returns a TopologyReduction whose vertex_count, edges, source
+# and sink describe the graph to solve; vertices[i] is the input id of reduced
+# vertex i and edge_nodes[j] the composition behind reduced edge j.
+def reduce_topology(vertex_count, edges, source, sink):
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+    reduction = TopologyReduction(vertex_count, edges, source, sink)
+    if source == sink:
+        kept = np.empty(0, dtype=np.int64)
+    else:
+        kept = _prune(vertex_count, edges, source, sink)
+
+    for edge in kept.tolist():
+        u, v, capacity = edges[edge].tolist()
+        reduction._add(u, v, reduction._node(EDGE, capacity, edge))
+    reduction._contract()
+
+    # Contraction can strand links, so prune once more on the reduced edge list
+    triples = [(u, v, node) for u, targets in reduction.out_edges.items() for v, node in targets.items()]
+    triples.sort()
+    reduced = np.asarray([(u, v, reduction.capacities[node]) for u, v, node in triples],
+                         dtype=np.int64).reshape(-1, 3)
+    nodes = np.asarray([node for _, _, node in triples], dtype=np.int64)
+    if len(reduced):
+        useful = _prune(vertex_count, reduced, source, sink)
+        reduced, nodes = reduced[useful], nodes[useful]
+
+    # Merged capacities can outgrow int32 although the flow cannot exceed what
+    # leaves the source or enters the sink, so capacities are capped at that bound
+    bound = min(edges[edges[:, 0] == source, 2].sum(), edges[edges[:, 1] == sink, 2].sum())
+    reduced[:, 2] = np.minimum(reduced[:, 2], bound)
+
+    vertices = np.union1d(reduced[:, :2].ravel(), [source, sink])
+    relabel = np.full(vertex_count, -1, dtype=np.int64)
+    relabel[vertices] = np.arange(len(vertices))
+    reduction.vertices = vertices
+    reduction.vertex_count = len(vertices)
+    reduction.edges = np.column_stack([relabel[reduced[:, 0]], relabel[reduced[:, 1]], reduced[:, 2]])
+    reduction.source = int(relabel[source])
+    reduction.sink = int(relabel[sink])
+    reduction.edge_nodes = nodes
+    return reduction
@@ -0,0 +1,172 @@
+import time
+from collections import deque
+
+
+class _PushRelabel:
+    # Highest-label push-relabel with the gap and global relabeling heuristics.
+    # Mirrors FlowAlgorithm.pushRelabelMaxFlow on the Java side.
+    def __init__(self, graph, source, sink, stats=None):
+        self.stats = stats
+        self.n = graph.vertex_count
+        self.source = source
+        self.sink = sink
+        self.offsets = graph.offsets.tolist()
+        self.targets = graph.targets.tolist()
+        self.reverse = graph.reverse.tolist()
+        self.residual = graph.residual().tolist()
+
+        limit = 2 * self.n
+        self.height = [limit] * self.n
+        self.excess = [0] * self.n
+        self.current = self.offsets[:-1]
+        self.count = [0] * (limit + 1)
+        self.buckets = [[] for _ in range(limit)]
+        self.active = [False] * self.n
+        self.highest = -1
+        self.work = 0
+        self.relabel_period = 6 * self.n + len(self.targets) // 2
+
+    # Exact heights from a reverse BFS: distance to the sink, or n plus the
+    # distance back to the source for vertices that can no longer reach the sink
+    def global_relabel(self):
+        n, offsets, targets, reverse, residual = self.n, self.offsets, self.targets, self.reverse, self.residual
+        height = self.height
+        for v in range(n):
+            height[v] = 2 * n
+
+        # The source BFS only labels vertices the sink BFS could not reach
+        height[self.sink] = 0
+        height[self.source] = n
+        for root in (self.sink, self.source):
+            queue = deque([root])
+            while queue:
+                u = queue.popleft()
+                for arc in range(offsets[u], offsets[u + 1]):
+                    v = targets[arc]
+                    if height[v] == 2 * n and residual[reverse[arc]] > 0:
+                        height[v] = height[u] + 1
+                        queue.append(v)
+
+        self.count = [0] * (2 * n + 1)
+        for v in range(n):
+            self.count[height[v]] += 1
+        for bucket in self.buckets:
+            bucket.clear()
+        self.active = [False] * n
+        self.highest = -1
+        self.current = offsets[:-1]
+        for v in range(n):
+            self.activate(v)
+        self.work = 0
+
+    def activate(self, v):
+        if (self.excess[v] > 0 and not self.active[v] and v != self.source
+                and v != self.sink and self.height[v] < 2 * self.n):
+            self.active[v] = True
+            self.buckets[self.height[v]].append(v)
+            self.highest = max(self.highest, self.height[v])
+
+    # Gap heuristic: nothing is left at height h, so every vertex between h
+    # and n is cut off from the sink and can be lifted straight above n
+    def gap(self, h):
+        n, height, count = self.n, self.height, self.count
+        for v in range(n):
+            if h < height[v] < n:
+                count[height[v]] -= 1
+                height[v] = n + 1
+                count[n + 1] += 1
+                self.current[v] = self.offsets[v]
+
+    def relabel(self, v):
+        offsets, targets, residual, height = self.offsets, self.targets, self.residual, self.height
+        old_height = height[v]
+        new_height = 2 * self.n
+        for arc in range(offsets[v], offsets[v + 1]):
+            if residual[arc] > 0:
+                new_height = min(new_height, height[targets[arc]] + 1)
+        self.work += offsets[v + 1] - offsets[v] + 12
+        if self.stats is not None:
+            self.stats.relabels += 1
+            self.stats.edges_scanned += offsets[v + 1] - offsets[v]
+
+        self.count[old_height] -= 1
+        height[v] = new_height
+        self.count[new_height] += 1
+        self.current[v] = offsets[v]
+        if self.count[old_height] == 0 and old_height < self.n:
+            self.gap(old_height)
+
+    def discharge(self, v):
+        offsets, targets, reverse, residual = self.offsets, self.targets, self.reverse, self.residual
+        height, excess = self.height, self.excess
+        while excess[v] > 0 and height[v] < 2 * self.n:
+            arc = self.current[v]
+            if arc == offsets[v + 1]:
+                self.relabel(v)
+                continue
+            w = targets[arc]
+            if self.stats is not None:
+                self.stats.edges_scanned += 1
+            if residual[arc] > 0 and height[v] == height[w] + 1:
+                if self.stats is not None:
+                    self.stats.pushes += 1
+                amount = min(excess[v], residual[arc])
+                residual[arc] -= amount
+                residual[reverse[arc]] += amount
+                excess[v] -= amount
+                excess[w] += amount
+                self.activate(w)
+            else:
+                self.current[v] = arc + 1
+
+    def run(self):
+        source = self.source
+        for arc in range(self.offsets[source], self.offsets[source + 1]):
+            amount = self.residual[arc]
+            if amount > 0:
+                w = self.targets[arc]
+                self.residual[arc] = 0
+                self.residual[self.reverse[arc]] += amount
+                self.excess[w] += amount
+                self.excess[source] -= amount
+        # Label after the source edges are saturated so every vertex holding
+        # excess already has a residual route back to the source
+        self.global_relabel()
+
+        # With stats on, each stretch between global relabels counts as a phase
+        phase_started = time.perf_counter_ns()
+        while self.highest >= 0:
+            bucket = self.buckets[self.highest]
+            if not bucket:
+                self.highest -= 1
+                continue
+            v = bucket.pop()
+            self.active[v] = False
+            if self.height[v] != self.highest:
+                # Lifted by a gap while queued; requeue at its new height
+                self.activate(v)
+                continue
+
+            self.discharge(v)
+            self.activate(v)
+            if self.work > self.relabel_period:
+                self.global_relabel()
+                if self.stats is not None:
+                    self.stats.phase_done(phase_started)
+                    phase_started = time.perf_counter_ns()
+        if self.stats is not None:
+            self.stats.phase_done(phase_started)
+
+        return self.excess[self.sink]
+
+
+# Push-relabel max flow method
+def push_relabel_max_flow(graph, source, sink, paths=None, stats=None):
+    # There are no augmenting paths to trace, so paths is left untouched
+    if source == sink:
+        return 0
+
+    solver = _PushRelabel(graph, source, sink, stats)
+    max_flow = solver.run()
+    graph.set_residual(solver.residual)
+    return max_flow
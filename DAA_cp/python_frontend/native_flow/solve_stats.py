@@ -0,0 +1,35 @@
+import time
+
+
+class SolveStats:
+    # Python side of SolveStats.java. The solvers only touch it when one is
+    # passed in, so plain solves pay nothing for the counters.
+    def __init__(self):
+        self.phases = 0
+        self.augmenting_paths = 0
+        self.edges_scanned = 0
+        self.dead_ends = 0
+        self.pushes = 0
+        self.relabels = 0
+        self.solve_ns = 0
+        self.phase_ns = []
+
+    # Close one phase that started at the given time.perf_counter_ns()
+    def phase_done(self, started):
+        self.phases += 1
+        self.phase_ns.append(time.perf_counter_ns() - started)
+
+    # Same word order as SolveStats.toLongs:
+    # [phases, augmenting_paths, edges_scanned, dead_ends, pushes, relabels,
+    #  solve_ns, phase_count, phase_ns...]
+    def to_words(self):
+        return [self.phases, self.augmenting_paths, self.edges_scanned, self.dead_ends,
+                self.pushes, self.relabels, self.solve_ns, len(self.phase_ns)] + list(self.phase_ns)
+
+    @classmethod
+    def from_words(cls, words):
+        stats = cls()
+        (stats.phases, stats.augmenting_paths, stats.edges_scanned, stats.dead_ends,
+         stats.pushes, stats.relabels, stats.solve_ns, phase_count) = words[:8]
+        stats.phase_ns = list(words[8:8 + phase_count])
+        return stats
@@ -0,0 +1,137 @@
+import json
+import queue
+import threading
+
+# Event kinds. Every event is a flat tuple so a trace can be streamed as
+# JSON lines and consumed one event at a time:
+#   (PHASE, phase)                       a new BFS round starts
+#   (LEVEL, vertex, level)               BFS reached vertex at that distance
+#   (PATH, phase, bottleneck, vertices)  an augmenting path was found
+#   (FLOW, edge_id, delta)               flow on input edge edge_id changed
+#   (DONE, max_flow)                     the solver finished
+PHASE = "phase"
+LEVEL = "level"
+PATH = "path"
+FLOW = "flow"
+DONE = "done"
+
+
+# A solve streams its events through a queue of at most QUEUE_CHUNKS chunks,
+# so it runs at most that far ahead of whoever consumes the trace
+QUEUE_CHUNKS = 4
+MAX_CHUNK = 1024
+
+_END = object()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class _EventQueue:
+    # events hook that hands the solver's events to solver_events in chunks.
+    # The first chunk is a single event and each later one doubles up to
+    # MAX_CHUNK, so the first event goes out at once and the rest in batches.
+    def __init__(self):
+        self.queue = queue.Queue(QUEUE_CHUNKS)
+        self.chunk = []
+        self.limit = 1
+        self.cancelled = threading.Event()
+
+    def append(self, event):
+        self.chunk.append(event)
+        if len(self.chunk) >= self.limit:
+            self.put(self.chunk)
+            self.chunk = []
+            self.limit = min(2 * self.limit, MAX_CHUNK)
+
+    # Blocks while the consumer is behind; raises _Cancelled once it is gone
+    def put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise _Cancelled
+
+
+# Runs solver on a background thread and yields its trace events as they
+# happen, so the first event arrives while the solve is still running and
+# the trace is never held whole. Closing the generator early stops the solve
+# at its next event. Solver errors are re-raised here.
+def solver_events(solver, graph, source, sink):
+    events = _EventQueue()
+
+    def solve():
+        try:
+            solver(graph, source, sink, events=events)
+            if events.chunk:
+                events.put(events.chunk)
+            events.put(_END)
+        except _Cancelled:
+            pass
+        except Exception as error:
+            try:
+                events.put(error)
+            except _Cancelled:
+                pass
+
+    thread = threading.Thread(target=solve, name="solver-events", daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = events.queue.get()
+            if chunk is _END:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield from chunk
+    finally:
+        events.cancelled.set()
+        thread.join()
+
+
+class EventWriter:
+    # events hook for the solvers that writes JSON lines chunk_size at a time,
+    # so a solve can stream its trace to disk without holding it
+    def __init__(self, path, chunk_size=4096):
+        self.file = open(path, "w")
+        self.chunk_size = chunk_size
+        self.chunk = []
+        self.count = 0
+
+    def append(self, event):
+        self.chunk.append(json.dumps(event, separators=(",", ":")))
+        if len(self.chunk) == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.chunk:
+            self.file.write("\n".join(self.chunk) + "\n")
+            self.count += len(self.chunk)
+            self.chunk.clear()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Writes an event iterable to a JSON-lines file; returns the event count
+def write_events(events, path, chunk_size=4096):
+    with EventWriter(path, chunk_size) as writer:
+        for event in events:
+            writer.append(event)
+    return writer.count
+
+
+def read_events(path):
+    with open(path) as f:
+        for line in f:
+            yield tuple(json.loads(line))
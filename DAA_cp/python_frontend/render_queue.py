@@ -0,0 +1,79 @@
+import glob
+import os
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+TERMINAL_STATES = ("done", "failed")
+
+# Finished jobs nobody polled (e.g. the session went away) are dropped once
+# this many newer ones have finished
+FINISHED_JOB_LIMIT = 256
+
+
+class RenderJob:
+    def __init__(self, job_id, output_pattern):
+        self.job_id = job_id
+        self.output_pattern = output_pattern
+        self.output_path = None
+        self.state = "queued"
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+
+
+class RenderQueue:
+    # Background manim renders. Each worker thread drives one manim
+    # subprocess, so at most max_workers renders (one per CPU by default) run
+    # at once and the rest wait in the queue. Callers get a job id back
+    # immediately and poll status() instead of blocking their request. A job
+    # is forgotten once status() has reported it finished, so the queue does
+    # not grow for the life of the server.
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="manim")
+        self.jobs = {}
+        self.finished = deque()
+        self.lock = threading.Lock()
+
+    # output_pattern is a glob for the file manim writes, since some of its
+    # output names (e.g. still images) embed the manim version
+    def submit(self, command, output_pattern, on_done=None):
+        job = RenderJob(uuid.uuid4().hex, output_pattern)
+        with self.lock:
+            self.jobs[job.job_id] = job
+        self.executor.submit(self._run, job, command, on_done)
+        return job.job_id
+
+    def status(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None and job.state in TERMINAL_STATES:
+                del self.jobs[job_id]
+            return job
+
+    def _run(self, job, command, on_done):
+        job.state = "running"
+        job.started_at = time.perf_counter()
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True)
+            outputs = glob.glob(job.output_pattern)
+            if completed.returncode != 0 or not outputs:
+                raise RuntimeError(completed.stderr.strip().splitlines()[-1]
+                                   if completed.stderr.strip() else "Animation generation failed")
+            job.output_path = outputs[0]
+            if on_done is not None:
+                job.output_path = on_done(job.output_path) or job.output_path
+            job.finished_at = time.perf_counter()
+            job.state = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.finished_at = time.perf_counter()
+            job.state = "failed"
+        with self.lock:
+            self.finished.append(job.job_id)
+            while len(self.finished) > FINISHED_JOB_LIMIT:
+                self.jobs.pop(self.finished.popleft(), None)
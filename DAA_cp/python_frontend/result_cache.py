@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+CACHE_DIR = os.environ.get(
+    "PACKET_FLOW_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".flow_cache")
+)
+CACHE_MAX_BYTES = int(os.environ.get("PACKET_FLOW_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+
+def canonical_edges(edges):
+    # Sorts the edge list so that the same topology typed in a different order
+    # hashes the same. rank[i] is where input edge i landed, so per-edge
+    # results computed on the canonical list map back with values[rank].
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+    order = np.lexsort((edges[:, 2], edges[:, 1], edges[:, 0]))
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return edges[order], rank
+
+
+def topology_key(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray) and part.dtype.kind == "f":
+            digest.update(np.ascontiguousarray(part, dtype="<f8").tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(np.ascontiguousarray(part, dtype="<i8").tobytes())
+        else:
+            digest.update(json.dumps(part, separators=(",", ":")).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    # Content-addressed on-disk cache of solve payloads and rendered videos.
+    # Entries are files named by key; a hit bumps the file's mtime, and the
+    # least recently used files are evicted once the directory exceeds max_bytes.
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def _hit(self, path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_result(self, key):
+        path = self._hit(self._path(key, ".result"))
+        if path is None:
+            return None
+        # A concurrent put may evict the entry between the hit and the read
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put_result(self, key, payload):
+        path = self._path(key, ".result")
+        with self.lock:
+            with open(path + ".tmp", "wb") as f:
+                f.write(payload)
+            os.replace(path + ".tmp", path)
+            self._evict()
+
+    # Rendered output (video or still image); the file extension is kept. The
+    # returned path can be evicted at any time, so readers must handle it
+    # disappearing.
+    def get_video(self, key, extension=".mp4"):
+        return self._hit(self._path(key, extension))
+
+    def put_video(self, key, video_path):
+        path = self._path(key, os.path.splitext(video_path)[1])
+        with self.lock:
+            shutil.copyfile(video_path, path + ".tmp")
+            os.replace(path + ".tmp", path)
+            self._evict()
+        return path
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
@@ -0,0 +1,69 @@
+import io
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+# Vertex ids are only drawn while they stay readable
+LABEL_LIMIT = 60
+
+# Above this many links antialiasing costs more than it adds to the picture
+ANTIALIAS_LIMIT = 5000
+
+
+def render_flow_network(routers, edges, edge_flows, source, sink, min_cut=None, undirected_cut=False, dpi=100):
+    # Draws the whole network with one line collection for the links (colored
+    # and sized by utilization = flow / capacity), one for the min-cut overlay
+    # and one scatter for the routers, so the cost stays a few draw calls
+    # however large the topology is. Returns the image as PNG bytes.
+    coords = np.asarray(routers, dtype=float).reshape(-1, 2)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+    flows = np.asarray(edge_flows, dtype=float)
+    capacities = edges[:, 2].astype(float)
+    utilization = np.divide(flows, capacities, out=np.zeros_like(flows), where=capacities > 0)
+    segments = coords[edges[:, :2]]
+    antialiased = len(edges) <= ANTIALIAS_LIMIT
+
+    figure = Figure(figsize=(8, 6), dpi=dpi)
+    ax = figure.add_subplot()
+    ax.set_facecolor("black")
+
+    links = LineCollection(segments, array=utilization, cmap="plasma", clim=(0, 1),
+                           linewidths=0.5 + 2.0 * utilization, antialiaseds=antialiased)
+    ax.add_collection(links)
+
+    # Links leaving the source side of the min cut (or crossing it either way
+    # for an undirected cut), drawn as a dashed overlay
+    if min_cut is not None:
+        source_side = np.zeros(len(coords), dtype=bool)
+        source_side[np.asarray(min_cut, dtype=np.int64)] = True
+        if undirected_cut:
+            crossing = source_side[edges[:, 0]] != source_side[edges[:, 1]]
+        else:
+            crossing = source_side[edges[:, 0]] & ~source_side[edges[:, 1]]
+        ax.add_collection(LineCollection(segments[crossing], colors="#00FF00", linewidths=2.5,
+                                         linestyles="dashed", antialiaseds=antialiased))
+
+    marker_size = max(4.0, 200.0 / np.sqrt(max(len(coords), 1)))
+    ax.scatter(coords[:, 0], coords[:, 1], s=marker_size, c="#6495ED", zorder=3)
+    ax.scatter(coords[[source, sink], 0], coords[[source, sink], 1], s=marker_size * 3,
+               c="#FF0000", zorder=4)
+    if len(coords) <= LABEL_LIMIT:
+        for i, (x, y) in enumerate(coords):
+            ax.annotate(str(i), (x, y), textcoords="offset points", xytext=(0, 6),
+                        ha="center", color="white", fontsize=8)
+
+    # Limits straight from the coordinates instead of walking every segment
+    low = coords.min(axis=0) if len(coords) else np.zeros(2)
+    high = coords.max(axis=0) if len(coords) else np.ones(2)
+    pad = np.maximum((high - low) * 0.05, 0.5)
+    ax.set_xlim(low[0] - pad[0], high[0] + pad[0])
+    ax.set_ylim(low[1] - pad[1], high[1] + pad[1])
+    ax.set_aspect("equal")
+    ax.set_xticks([])
+    ax.set_yticks([])
+    figure.colorbar(links, ax=ax, label="Link utilization")
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    return buffer.getvalue()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The tests import native_flow the way app.py does, from python_frontend
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
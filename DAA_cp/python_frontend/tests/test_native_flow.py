@@ -0,0 +1,117 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from native_flow import SOLVERS, CSRGraph, dinic_max_flow, gomory_hu_tree, reduce_topology
+
+
+# Random multigraph with self-loops and parallel links, as (u, v, capacity) rows
+def random_edges(rng, vertex_count, edge_count, max_capacity=10):
+    return np.column_stack([rng.integers(0, vertex_count, edge_count),
+                            rng.integers(0, vertex_count, edge_count),
+                            rng.integers(0, max_capacity + 1, edge_count)])
+
+
+def dinic_value(vertex_count, edges, source, sink):
+    return dinic_max_flow(CSRGraph.from_edges(vertex_count, edges), source, sink)
+
+
+# Net flow into every vertex for per-edge flows
+def net_inflow(vertex_count, edges, flows):
+    return (np.bincount(edges[:, 1], weights=flows, minlength=vertex_count)
+            - np.bincount(edges[:, 0], weights=flows, minlength=vertex_count))
+
+
+def assert_feasible(vertex_count, edges, flows, source, sink, value):
+    assert ((flows >= 0) & (flows <= edges[:, 2])).all()
+    net = net_inflow(vertex_count, edges, flows)
+    inner = np.ones(vertex_count, dtype=bool)
+    inner[[source, sink]] = False
+    assert (net[inner] == 0).all()
+    assert net[sink] == value
+
+
+@pytest.mark.parametrize("algorithm", sorted(SOLVERS))
+@pytest.mark.parametrize("seed", range(20))
+def test_solver_matches_dinic_and_is_feasible(algorithm, seed):
+    rng = np.random.default_rng(seed)
+    vertex_count = int(rng.integers(2, 40))
+    edges = random_edges(rng, vertex_count, int(rng.integers(0, 6 * vertex_count)))
+    source, sink = 0, vertex_count - 1
+    graph = CSRGraph.from_edges(vertex_count, edges)
+    if algorithm == "Min-Cost Max-Flow":
+        graph.set_costs(rng.integers(0, 20, len(edges)))
+
+    value = SOLVERS[algorithm](graph, source, sink)
+    assert value == dinic_value(vertex_count, edges, source, sink)
+    assert_feasible(vertex_count, edges, graph.edge_flows(), source, sink, value)
+
+
+# Cheapest cost over every integral max flow, by enumerating all flow vectors
+def brute_force_min_cost(vertex_count, edges, costs, source, sink, value):
+    best = None
+    for flows in itertools.product(*(range(capacity + 1) for capacity in edges[:, 2])):
+        flows = np.asarray(flows, dtype=np.int64)
+        net = net_inflow(vertex_count, edges, flows)
+        if net[sink] != value:
+            continue
+        net[[source, sink]] = 0
+        if net.any():
+            continue
+        cost = float(flows @ costs)
+        best = cost if best is None else min(best, cost)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_min_cost_flow_is_cheapest_max_flow(seed):
+    rng = np.random.default_rng(seed)
+    vertex_count = int(rng.integers(2, 6))
+    edges = random_edges(rng, vertex_count, int(rng.integers(1, 7)), max_capacity=3)
+    costs = rng.integers(0, 10, len(edges)).astype(np.float64)
+    source, sink = 0, vertex_count - 1
+    graph = CSRGraph.from_edges(vertex_count, edges)
+    graph.set_costs(costs)
+
+    value = SOLVERS["Min-Cost Max-Flow"](graph, source, sink)
+    cost = float(graph.edge_flows() @ costs)
+    assert cost == pytest.approx(brute_force_min_cost(vertex_count, edges, costs, source, sink, value))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_gomory_hu_tree_matches_all_pairs_min_cut(seed):
+    rng = np.random.default_rng(seed)
+    vertex_count = int(rng.integers(2, 12))
+    edges = random_edges(rng, vertex_count, int(rng.integers(0, 4 * vertex_count)))
+    tree = gomory_hu_tree(vertex_count, edges)
+
+    # The tree counts every link in both directions
+    both = np.concatenate([edges, edges[:, [1, 0, 2]]])
+    for u, v in itertools.combinations(range(vertex_count), 2):
+        assert tree.min_cut(u, v) == dinic_value(vertex_count, both, u, v)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_reduce_topology_round_trips_flows(seed):
+    rng = np.random.default_rng(seed)
+    vertex_count = int(rng.integers(2, 40))
+    edges = random_edges(rng, vertex_count, int(rng.integers(0, 4 * vertex_count)))
+    # Transit chains are what contraction merges, so thread a few through
+    chain = rng.permutation(vertex_count)
+    edges = np.concatenate([edges, np.column_stack([chain[:-1], chain[1:],
+                                                    rng.integers(1, 10, vertex_count - 1)])])
+    source, sink = 0, vertex_count - 1
+
+    reduction = reduce_topology(vertex_count, edges, source, sink)
+    graph = CSRGraph.from_edges(reduction.vertex_count, reduction.edges)
+    value = dinic_max_flow(graph, reduction.source, reduction.sink)
+    assert value == dinic_value(vertex_count, edges, source, sink)
+
+    flows = reduction.expand_flows(graph.edge_flows())
+    assert_feasible(vertex_count, edges, flows, source, sink, value)
+    side = np.zeros(vertex_count, dtype=bool)
+    side[reduction.min_cut_source_side(flows)] = True
+    crossing = side[edges[:, 0]] & ~side[edges[:, 1]]
+    assert side[source] and not side[sink]
+    assert edges[crossing, 2].sum() == value
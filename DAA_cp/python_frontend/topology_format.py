@@ -0,0 +1,269 @@
+import argparse
+import itertools
+import json
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+# Binary topology file (.ftop), all big-endian so an int32 edge section is
+# byte for byte the payload FlowAlgorithmEntryPoint.addEdgesPacked reads:
+#
+#   0   magic b"FTOP"
+#   4   version (uint16), index width in bytes (uint8: 4 or 8), flags (uint8)
+#   8   vertex_count (uint64)
+#   16  edge_count (uint64)
+#   24  reserved, pads the header to 32 bytes
+#   32  edges: edge_count (u, v, capacity) rows of int32 or int64
+#   ..  coordinates when FLAG_COORDINATES is set: vertex_count (x, y) float64 rows
+#   ..  costs when FLAG_COSTS is set: edge_count float64 per-link costs
+MAGIC = b"FTOP"
+VERSION = 1
+HEADER = struct.Struct(">4sHBBQQ8x")
+FLAG_COORDINATES = 1
+FLAG_COSTS = 2
+COORDINATE_DTYPE = np.dtype(">f8")
+COST_DTYPE = np.dtype(">f8")
+INT32_MAX = np.iinfo(np.int32).max
+
+# Text converters parse this many lines at a time
+CHUNK_LINES = 1 << 18
+
+TOPOLOGY_FILE_TYPES = ["ftop", "json", "csv", "txt", "edges", "edgelist"]
+
+
+def _edge_dtype(index_width):
+    if index_width not in (4, 8):
+        raise ValueError(f"Index width must be 4 or 8 bytes, got {index_width}")
+    return np.dtype(">i4") if index_width == 4 else np.dtype(">i8")
+
+
+class Topology:
+    # A loaded topology. edges, routers and costs are read-only memory maps
+    # over the file, so nothing is parsed or copied until a solver touches them.
+    def __init__(self, vertex_count, edges, routers=None, costs=None):
+        self.vertex_count = vertex_count
+        self.edges = edges
+        self.routers = routers
+        self.costs = costs
+
+
+class TopologyWriter:
+    # Streams edge blocks into a topology file; the counts go into the header
+    # on finish, so the edge count does not have to be known up front. Costs
+    # come after the coordinates in the file, so they are spooled to a
+    # temporary file and copied over on finish.
+    def __init__(self, path, index_width=4):
+        self.path = path
+        self.index_width = index_width
+        self.dtype = _edge_dtype(index_width)
+        self.edge_count = 0
+        self.cost_count = 0
+        self.max_vertex = -1
+        self.file = open(path, "wb")
+        self.file.write(bytes(HEADER.size))
+        self.cost_file = tempfile.TemporaryFile()
+
+    def write_edges(self, edges, costs=None):
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+        if not len(edges):
+            return
+        if costs is not None:
+            costs = np.asarray(costs, dtype=np.float64).reshape(-1)
+            if len(costs) != len(edges):
+                raise ValueError(f"Got {len(costs)} link costs for {len(edges)} edges")
+        if self.edge_count and (costs is not None) != (self.cost_count > 0):
+            raise ValueError("Either every link has a cost or none does")
+        if edges[:, :2].min() < 0 or edges[:, 2].min() < 0:
+            raise ValueError("Router ids and capacities must be non-negative")
+        if self.index_width == 4 and edges.max() > INT32_MAX:
+            raise ValueError("Values exceed int32; write the topology with index_width=8")
+        self.file.write(edges.astype(self.dtype).tobytes())
+        if costs is not None:
+            self.cost_file.write(costs.astype(COST_DTYPE).tobytes())
+            self.cost_count += len(costs)
+        self.edge_count += len(edges)
+        self.max_vertex = max(self.max_vertex, int(edges[:, :2].max()))
+
+    def finish(self, vertex_count=None, routers=None):
+        if vertex_count is None:
+            vertex_count = self.max_vertex + 1
+        if self.max_vertex >= vertex_count:
+            raise ValueError(f"Edge endpoint {self.max_vertex} out of range for {vertex_count} routers")
+
+        flags = 0
+        if routers is not None:
+            routers = np.asarray(routers, dtype=float).reshape(-1, 2)
+            if len(routers) != vertex_count:
+                raise ValueError(f"Got {len(routers)} router coordinates for {vertex_count} routers")
+            self.file.write(routers.astype(COORDINATE_DTYPE).tobytes())
+            flags |= FLAG_COORDINATES
+        if self.cost_count:
+            self.cost_file.seek(0)
+            shutil.copyfileobj(self.cost_file, self.file)
+            flags |= FLAG_COSTS
+
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.index_width, flags, vertex_count, self.edge_count))
+        self.close()
+
+    def close(self):
+        self.file.close()
+        self.cost_file.close()
+
+
+def write_topology(path, vertex_count, edges, routers=None, costs=None):
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+    index_width = 8 if vertex_count > INT32_MAX or (len(edges) and edges.max() > INT32_MAX) else 4
+    writer = TopologyWriter(path, index_width)
+    writer.write_edges(edges, costs)
+    writer.finish(vertex_count, routers)
+
+
+def load_topology(path):
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is too short to be a topology file")
+    magic, version, index_width, flags, vertex_count, edge_count = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a topology file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported topology file version {version}")
+
+    dtype = _edge_dtype(index_width)
+    edges = np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(edge_count, 3)) \
+        if edge_count else np.empty((0, 3), dtype=dtype)
+    offset = HEADER.size + edges.nbytes
+    routers = None
+    if flags & FLAG_COORDINATES:
+        routers = np.memmap(path, dtype=COORDINATE_DTYPE, mode="r", offset=offset, shape=(vertex_count, 2))
+        offset += routers.nbytes
+    costs = None
+    if flags & FLAG_COSTS and edge_count:
+        costs = np.memmap(path, dtype=COST_DTYPE, mode="r", offset=offset, shape=(edge_count,))
+    return Topology(vertex_count, edges, routers, costs)
+
+
+# JSON as the app takes it: {"routers": [[x, y], ...], "edges": [[u, v, capacity], ...]}
+# with optional "vertex_count" and per-edge "costs", or a bare list of edges
+def convert_json(source_path, target_path):
+    with open(source_path) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {"edges": data}
+    edges = np.asarray(data.get("edges", []), dtype=np.int64).reshape(-1, 3)
+    routers = data.get("routers")
+    vertex_count = data.get("vertex_count")
+    if vertex_count is None:
+        vertex_count = len(routers) if routers else int(edges[:, :2].max()) + 1 if len(edges) else 0
+    write_topology(target_path, vertex_count, edges, routers, data.get("costs"))
+
+
+def _is_number(token):
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+# One chunk of text rows as (int64 id and capacity columns, float64 costs or
+# None). Integer files parse exactly; rows with float columns
+# (networkx.write_weighted_edgelist writes "0 1 10.0") or a cost column parse
+# as float64, and the ids and capacities must still be whole, finite numbers
+# that fit in int64.
+def _parse_rows(lines, delimiter):
+    try:
+        rows = np.loadtxt(lines, dtype=np.int64, delimiter=delimiter, comments=("#", "%"), ndmin=2)
+    except ValueError:
+        try:
+            rows = np.loadtxt(lines, dtype=np.float64, delimiter=delimiter, comments=("#", "%"), ndmin=2)
+        except ValueError:
+            raise ValueError("Every row must be \"from to [capacity [cost]]\" with numeric values")
+    costs = rows[:, 3].astype(np.float64) if rows.shape[1] > 3 else None
+    rows = rows[:, :3]
+    if rows.dtype.kind == "f":
+        if not np.isfinite(rows).all() or (np.abs(rows) >= 2.0 ** 63).any():
+            raise ValueError("Router ids and capacities must be finite and fit in 64 bits")
+        if (rows != np.floor(rows)).any():
+            raise ValueError("Router ids and capacities must be whole numbers")
+        rows = rows.astype(np.int64)
+    return rows, costs
+
+
+# Delimited text, one "u v [capacity [cost]]" row per line, parsed CHUNK_LINES
+# at a time so the whole file never sits in memory. Lines starting with # or %
+# are comments; a non-numeric first row is taken as a column header.
+def _convert_text(source_path, target_path, delimiter, vertex_count, default_capacity, index_width):
+    writer = TopologyWriter(target_path, index_width)
+    try:
+        with open(source_path) as f:
+            first = True
+            while True:
+                lines = list(itertools.islice(f, CHUNK_LINES))
+                if not lines:
+                    break
+                if first:
+                    first = False
+                    data_lines = [line for line in lines if line.strip() and line.lstrip()[0] not in "#%"]
+                    if data_lines and not _is_number(data_lines[0].replace(delimiter or " ", " ").split()[0]):
+                        lines.remove(data_lines[0])
+                rows, costs = _parse_rows(lines, delimiter)
+                if rows.shape[1] == 2:
+                    rows = np.column_stack([rows, np.full(len(rows), default_capacity, dtype=np.int64)])
+                writer.write_edges(rows, costs)
+    except Exception:
+        writer.close()
+        os.remove(target_path)
+        raise
+    writer.finish(vertex_count)
+
+
+def convert_csv(source_path, target_path, vertex_count=None, default_capacity=1, index_width=4):
+    _convert_text(source_path, target_path, ",", vertex_count, default_capacity, index_width)
+
+
+# Whitespace-separated edge lists, as SNAP datasets and networkx.write_edgelist produce
+def convert_edge_list(source_path, target_path, vertex_count=None, default_capacity=1, index_width=4):
+    _convert_text(source_path, target_path, None, vertex_count, default_capacity, index_width)
+
+
+def convert_topology(source_path, target_path, **options):
+    extension = os.path.splitext(source_path)[1].lower()
+    if extension == ".json":
+        convert_json(source_path, target_path)
+    elif extension == ".csv":
+        convert_csv(source_path, target_path, **options)
+    else:
+        convert_edge_list(source_path, target_path, **options)
+
+
+# Routers evenly spaced on a circle, for topologies that come without coordinates
+def circle_layout(vertex_count, radius=3.0):
+    angles = np.linspace(0, 2 * np.pi, vertex_count, endpoint=False)
+    return np.column_stack([radius * np.cos(angles), radius * np.sin(angles)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a JSON, CSV or edge-list topology to a .ftop file")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    parser.add_argument("--vertices", type=int, help="router count (default: highest id + 1)")
+    parser.add_argument("--capacity", type=int, default=1, help="capacity for rows without one")
+    parser.add_argument("--wide", action="store_true", help="store int64 ids and capacities")
+    args = parser.parse_args()
+
+    if args.source.lower().endswith(".json"):
+        convert_json(args.source, args.target)
+    else:
+        convert_topology(args.source, args.target, vertex_count=args.vertices,
+                         default_capacity=args.capacity, index_width=8 if args.wide else 4)
+    topology = load_topology(args.target)
+    print(f"Wrote {topology.vertex_count} routers and {len(topology.edges)} edges to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import numbers
+
+import numpy as np
+
+from native_flow import fits_int32
+
+
+# 1-based list of the first few offending rows, for error messages
+def _rows(mask, limit=5):
+    rows = np.flatnonzero(mask)[:limit] + 1
+    listed = ", ".join(map(str, rows.tolist()))
+    return listed + (", ..." if np.count_nonzero(mask) > limit else "")
+
+
+# Integer (u, v, capacity) rows from JSON lists, a memory-mapped topology or
+# any array-like; memory-mapped integer edges are checked in place, not copied
+def _edge_array(edges):
+    try:
+        edges = np.asarray(edges)
+    except ValueError:
+        raise ValueError("Every connection must be a [from, to, capacity] triple")
+    if edges.size == 0:
+        return np.empty((0, 3), dtype=np.int64)
+    if edges.ndim != 2 or edges.shape[1] != 3:
+        raise ValueError("Every connection must be a [from, to, capacity] triple")
+    if edges.dtype.kind == "O":
+        # Python ints beyond 64 bits stay objects; checked below as floats
+        if not all(isinstance(value, numbers.Real) for value in edges.flat):
+            raise ValueError("Router ids and capacities must be numbers")
+        edges = edges.astype(np.float64)
+    if edges.dtype.kind == "f":
+        # Checked before the int64 cast, which would wrap these around
+        too_large = ~np.isfinite(edges) | (np.abs(edges) >= 2.0 ** 63)
+        if too_large.any():
+            raise ValueError(f"Connection {_rows(too_large.any(axis=1))} has a router id or capacity "
+                             "that is not finite or too large for 64 bits")
+        fractional = edges != np.floor(edges)
+        if fractional.any():
+            raise ValueError(f"Connection {_rows(fractional.any(axis=1))} has a fractional router id "
+                             "or capacity")
+        edges = edges.astype(np.int64)
+    elif edges.dtype.kind == "u" and edges.dtype.itemsize == 8:
+        too_large = edges > np.iinfo(np.int64).max
+        if too_large.any():
+            raise ValueError(f"Connection {_rows(too_large.any(axis=1))} has a router id or capacity "
+                             "that is not finite or too large for 64 bits")
+    elif edges.dtype.kind not in "iu":
+        raise ValueError("Router ids and capacities must be numbers")
+    return edges
+
+
+def _router_array(routers, router_count):
+    try:
+        routers = np.asarray(routers, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("Every router coordinate must be an [x, y] pair")
+    if routers.ndim != 2 or routers.shape[1] != 2:
+        raise ValueError("Every router coordinate must be an [x, y] pair")
+    if len(routers) != router_count:
+        raise ValueError(f"Got {len(routers)} router coordinates for {router_count} routers")
+    if not np.isfinite(routers).all():
+        raise ValueError("Router coordinates must be finite numbers")
+    return routers
+
+
+def _cost_array(costs, edge_count):
+    try:
+        costs = np.asarray(costs, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("Link costs must be numbers")
+    if costs.shape != (edge_count,):
+        raise ValueError(f"Got {costs.size} link costs for {edge_count} connections")
+    invalid = ~np.isfinite(costs) | (costs < 0)
+    if invalid.any():
+        raise ValueError(f"Connection {_rows(invalid)} has a negative or non-finite cost")
+    return costs
+
+
+# Checks a topology before anything is sent to a backend, so bad input fails
+# here with a readable message instead of deep inside a solver. Every check is
+# one vectorized pass over the edge array. Returns (routers, edges, costs,
+# warnings): routers as an (n, 2) float array, edges as integer (u, v, capacity)
+# rows with self-loops dropped, the matching per-edge costs (None when none
+# were given) and notes about what was dropped or will be merged.
+def normalize_topology(router_count, routers, edges, source, sink, costs=None):
+    router_count = int(router_count)
+    routers = _router_array(routers, router_count)
+    edges = _edge_array(edges)
+    if costs is not None:
+        costs = _cost_array(costs, len(edges))
+
+    if not 0 <= source < router_count or not 0 <= sink < router_count:
+        raise ValueError(f"Source and sink must be routers 0 to {router_count - 1}")
+    if source == sink:
+        raise ValueError("Source and sink must be different routers")
+
+    endpoints = edges[:, :2]
+    out_of_range = ((endpoints < 0) | (endpoints >= router_count)).any(axis=1)
+    if out_of_range.any():
+        raise ValueError(f"Connection {_rows(out_of_range)} references a router outside 0 to {router_count - 1}")
+    negative = edges[:, 2] < 0
+    if negative.any():
+        raise ValueError(f"Connection {_rows(negative)} has a negative capacity")
+    if not fits_int32(endpoints):
+        raise ValueError("Router ids must fit in 32 bits")
+
+    warnings = []
+    loops = edges[:, 0] == edges[:, 1]
+    if loops.any():
+        warnings.append(f"Dropped {np.count_nonzero(loops)} self-loop connection(s) (connection {_rows(loops)})")
+        edges = edges[~loops]
+        if costs is not None:
+            costs = costs[~loops]
+
+    # Repeated links are legal and act as one link with the summed capacity
+    keys = np.sort(edges[:, 0].astype(np.int64) * router_count + edges[:, 1])
+    duplicates = np.count_nonzero(keys[1:] == keys[:-1])
+    if duplicates:
+        warnings.append(f"{duplicates} connection(s) repeat an earlier router pair; "
+                        "their capacities add up")
+    return routers, edges, costs, warnings
+
+
+# Euclidean length of every link from the router coordinates, the default
+# per-edge cost for min-cost solves
+def link_lengths(routers, edges):
+    routers = np.asarray(routers, dtype=np.float64)
+    edges = np.asarray(edges)
+    return np.hypot(*(routers[edges[:, 1]] - routers[edges[:, 0]]).T)
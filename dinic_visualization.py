@@ -1,5 +1,10 @@
 from manim import *
 from collections import deque
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "DAA_cp", "python_frontend"))
+from native_flow import CSRGraph, DONE, FLOW, LEVEL, PATH, PHASE, dinic_events
 
 class DinicVisualization(Scene):
     def construct(self):
@@ -149,73 +154,81 @@ class DinicVisualization(Scene):
                           color=BFS_COLOR).scale(0.6).to_edge(DOWN)
         self.play(Write(status_text))
 
-        level_order = [
-            ['s'],
-            ['b', 'c'],
-            ['d', 'e'],
-            ['t']
-        ]
-
-        for level in level_order:
-            self.play(
-                *[vertex_objects[v].animate.set_color(BFS_COLOR) for v in level],
-                run_time=0.8
-            )
-            self.wait(0.3)
-
-        augmenting_paths = [
-            [('s', 'b'), ('b', 'd'), ('d', 't')],
-            [('s', 'c'), ('c', 'e'), ('e', 't')],
-            [('s', 'b'), ('b', 'e'), ('e', 't')]
-        ]
-
-        flow_updates = {
-            0: {'s-b': 4, 'b-d': 4, 'd-t': 4},
-            1: {'s-c': 9, 'c-e': 9, 'e-t': 9},
-            2: {'s-b': 6, 'b-e': 6, 'e-t': 10}
-        }
-
-        self.play(
-            Transform(
-                status_text,
-                Text("Finding Augmenting Paths", 
-                     font="Arial",
-                     color=PATH_COLOR).scale(0.6).to_edge(DOWN)
-            )
-        )
-
-        for path_idx, path in enumerate(augmenting_paths):
-            path_edges = VGroup(*[edge_objects[e] for e in path])
-            
-            self.play(
-                path_edges.animate.set_color(PATH_COLOR),
-                Transform(
-                    status_text,
-                    Text(f"Augmenting Path {path_idx + 1}", 
-                         font="Arial",
-                         color=PATH_COLOR).scale(0.6).to_edge(DOWN)
-                ),
-                run_time=1
-            )
+        # Replay the events dinic_max_flow emitted while solving this graph
+        names = list(vertices)
+        index = {v: i for i, v in enumerate(names)}
+        graph = CSRGraph.from_edges(len(names), [(index[u], index[v], cap) for u, v, cap in edges])
+        flows = [0] * len(edges)
+        level_group = []
+        group_level = 0
+        path_edges = None
+        path_count = 0
+        max_flow = 0
 
-            for u, v in path:
-                edge_key = f"{u}-{v}"
-                if edge_key in flow_updates[path_idx]:
-                    new_flow = flow_updates[path_idx][edge_key]
-                    self.play(
-                        Transform(
-                            flow_labels[(u,v)],
-                            Text(str(new_flow), 
-                                 font="Arial",
-                                 color=FLOW_COLOR).scale(0.4).next_to(capacity_labels[(u,v)], LEFT)
-                        ),
-                        run_time=0.5
-                    )
+        for event in dinic_events(graph, index['s'], index['t']):
+            kind = event[0]
+            if level_group and (kind != LEVEL or event[2] != group_level):
+                self.play(
+                    *[vertex_objects[v].animate.set_color(BFS_COLOR) for v in level_group],
+                    run_time=0.8
+                )
+                self.wait(0.3)
+                level_group = []
+            if path_edges is not None and kind != FLOW:
+                self.wait(0.5)
+                self.play(path_edges.animate.set_color(EDGE_COLOR))
+                path_edges = None
 
-            self.wait(0.5)
-            self.play(path_edges.animate.set_color(EDGE_COLOR))
+            if kind == PHASE:
+                self.play(
+                    *[vertex_objects[v].animate.set_color(VERTEX_COLOR) for v in vertices.keys()],
+                    Transform(
+                        status_text,
+                        Text(f"Phase {event[1] + 1}: Creating Level Graph", 
+                             font="Arial",
+                             color=BFS_COLOR).scale(0.6).to_edge(DOWN)
+                    ),
+                    run_time=0.8
+                )
+            elif kind == LEVEL:
+                group_level = event[2]
+                level_group.append(names[event[1]])
+            elif kind == PATH:
+                _, phase, bottleneck, path = event
+                path_count += 1
+                # A path may cancel flow by walking an edge backwards
+                path_edges = VGroup(*[
+                    edge_objects[(names[u], names[v])] if (names[u], names[v]) in edge_objects
+                    else edge_objects[(names[v], names[u])]
+                    for u, v in zip(path, path[1:])
+                ])
+                self.play(
+                    path_edges.animate.set_color(PATH_COLOR),
+                    Transform(
+                        status_text,
+                        Text(f"Augmenting Path {path_count} (+{bottleneck})", 
+                             font="Arial",
+                             color=PATH_COLOR).scale(0.6).to_edge(DOWN)
+                    ),
+                    run_time=1
+                )
+            elif kind == FLOW:
+                _, edge, delta = event
+                flows[edge] += delta
+                key = (edges[edge][0], edges[edge][1])
+                self.play(
+                    Transform(
+                        flow_labels[key],
+                        Text(str(flows[edge]), 
+                             font="Arial",
+                             color=FLOW_COLOR).scale(0.4).next_to(capacity_labels[key], LEFT)
+                    ),
+                    run_time=0.5
+                )
+            elif kind == DONE:
+                max_flow = event[1]
 
-        final_text = Text("Maximum Flow: 19", 
+        final_text = Text(f"Maximum Flow: {max_flow}", 
                          font="Arial",
                          color="#98FB98").scale(0.7).to_edge(DOWN)
         